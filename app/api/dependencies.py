@@ -1,3 +1,5 @@
+from threading import Lock
+from typing import Optional
 from app.services.frame_analyzer import FrameAnalyzer
 from app.services.session_manager import SessionManager
 from app.storage.memory import InMemoryStorage
@@ -5,12 +7,18 @@ from app.storage.memory import InMemoryStorage
 # Singleton instances
 _storage = InMemoryStorage()
 _session_manager = SessionManager(_storage)
-_frame_analyzer = FrameAnalyzer(_session_manager)
+# Created on first use so importing the API doesn't load the pose model
+_frame_analyzer: Optional[FrameAnalyzer] = None
+_frame_analyzer_lock = Lock()
 
 def get_frame_analyzer() -> FrameAnalyzer:
     """Dependency for frame analyzer"""
-    return _frame_analyzer
+    global _frame_analyzer
+    with _frame_analyzer_lock:
+        if _frame_analyzer is None:
+            _frame_analyzer = FrameAnalyzer(_session_manager)
+        return _frame_analyzer
 
 def get_session_manager() -> SessionManager:
     """Dependency for session manager"""
-    return _session_manager
\ No newline at end of file
+    return _session_manager
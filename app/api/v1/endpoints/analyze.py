@@ -1,16 +1,35 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
-from app.models.requests import FrameAnalysisRequest
+from app.models.requests import FrameAnalysisRequest, KeypointAnalysisRequest
 from app.services.frame_analyzer import FrameAnalyzer
 from app.api.dependencies import get_frame_analyzer
+from app.utils.exceptions import AnalysisError, InferenceQueueFullError, InvalidFrameError
+from app.utils.serialization import AnalysisJSONResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/analyze", response_class=JSONResponse)
+def requested_movements(
+    request: Union[FrameAnalysisRequest, KeypointAnalysisRequest]
+) -> Optional[List[Tuple[str, str]]]:
+    """
+    (body_part, movement_type) pairs of a multi-movement request, or None for a single movement
+    
+    Raises:
+        HTTPException: 400 if the request names neither movements nor body_part and movement_type
+    """
+    if request.movements:
+        return [(movement.body_part, movement.movement_type) for movement in request.movements]
+    if not request.body_part or not request.movement_type:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="body_part and movement_type, or movements, are required"
+        )
+    return None
+
+@router.post("/analyze", response_class=AnalysisJSONResponse)
 async def analyze_frame(
     request: FrameAnalysisRequest,
     analyzer: FrameAnalyzer = Depends(get_frame_analyzer)
@@ -18,7 +37,10 @@ async def analyze_frame(
     """Analyze a single frame for ROM"""
     try:
         logger.info(f"Received analysis request for session {request.session_id}")
-        logger.debug(f"Request details: body_part={request.body_part}, movement_type={request.movement_type}")
+        logger.debug(
+            f"Request details: body_part={request.body_part}, movement_type={request.movement_type}, "
+            f"movements={request.movements}"
+        )
         
         # Validate request
         if not request.frame_base64:
@@ -27,18 +49,34 @@ async def analyze_frame(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="frame_base64 cannot be empty"
             )
+        movements = requested_movements(request)
         
         logger.info("Starting frame analysis...")
         
         # Perform analysis
-        result = await analyzer.analyze(
-            frame_base64=request.frame_base64,
-            session_id=request.session_id,
-            body_part=request.body_part,
-            movement_type=request.movement_type,
-            include_keypoints=request.include_keypoints,
-            include_visualization=request.include_visualization
-        )
+        if movements is not None:
+            # One decode and pose detection for all movements
+            result = await analyzer.analyze_movements(
+                request.frame_base64,
+                session_id=request.session_id,
+                movements=movements,
+                include_keypoints=request.include_keypoints,
+                pose_model=request.pose_model,
+                pose_mode=request.pose_mode,
+                bilateral=request.bilateral
+            )
+        else:
+            result = await analyzer.analyze(
+                frame_base64=request.frame_base64,
+                session_id=request.session_id,
+                body_part=request.body_part,
+                movement_type=request.movement_type,
+                include_keypoints=request.include_keypoints,
+                include_visualization=request.include_visualization,
+                pose_model=request.pose_model,
+                pose_mode=request.pose_mode,
+                bilateral=request.bilateral
+            )
         
         logger.info(f"Analysis completed for session {request.session_id}")
         logger.debug(f"Result type: {type(result)}, Result: {result}")
@@ -51,12 +89,16 @@ async def analyze_frame(
                 detail="Analysis returned no result"
             )
         
-        # Return the result directly
-        return result
+        # Return the result directly (serialized without jsonable_encoder)
+        return AnalysisJSONResponse(result)
         
     except HTTPException:
         raise
-    except ValueError as e:
+    except InferenceQueueFullError as e:
+        logger.warning(f"Rejecting frame for session {request.session_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except (AnalysisError, ValueError) as e:
+        # Unsupported movements or an unknown pose_model/pose_mode
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -69,4 +111,44 @@ async def analyze_frame(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Analysis failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/keypoints", response_class=AnalysisJSONResponse)
+async def analyze_keypoints(
+    request: KeypointAnalysisRequest,
+    analyzer: FrameAnalyzer = Depends(get_frame_analyzer)
+) -> Dict[str, Any]:
+    """Analyze keypoints estimated on the client (no image decode or pose inference)"""
+    try:
+        movements = requested_movements(request)
+        if movements is not None:
+            result = await analyzer.analyze_keypoint_movements(
+                keypoints=request.keypoints,
+                scores=request.scores,
+                session_id=request.session_id,
+                movements=movements,
+                include_keypoints=request.include_keypoints,
+                bilateral=request.bilateral
+            )
+        else:
+            result = await analyzer.analyze_keypoints(
+                keypoints=request.keypoints,
+                scores=request.scores,
+                session_id=request.session_id,
+                body_part=request.body_part,
+                movement_type=request.movement_type,
+                include_keypoints=request.include_keypoints,
+                bilateral=request.bilateral
+            )
+        return AnalysisJSONResponse(result)
+    except HTTPException:
+        raise
+    except (InvalidFrameError, AnalysisError, ValueError) as e:
+        # Malformed keypoints, unsupported movements or an unknown pose model
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Keypoint analysis failed: {type(e).__name__}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Analysis failed: {str(e)}"
+        )
@@ -1,52 +1,64 @@
 # app/api/v1/endpoints/analyze_optimized.py
 from fastapi import APIRouter, File, Form, UploadFile, Depends
 from fastapi.responses import JSONResponse
-import cv2
-import numpy as np
-import base64  # Add this import!
+from typing import Optional
 from app.services.frame_analyzer import FrameAnalyzer
 from app.api.dependencies import get_frame_analyzer
+from app.utils.exceptions import AnalysisError, InferenceQueueFullError, InvalidFrameError
+from app.utils.serialization import AnalysisJSONResponse
 
 router = APIRouter()
 
-@router.post("/frame")
+@router.post("/frame", response_class=AnalysisJSONResponse)
 async def analyze_frame_optimized(
     file: UploadFile = File(...),
     session_id: str = Form(...),
     body_part: str = Form(...),
     movement_type: str = Form(...),
     include_keypoints: bool = Form(False),
+    pose_model: Optional[str] = Form(None),
+    pose_mode: Optional[str] = Form(None),
     analyzer: FrameAnalyzer = Depends(get_frame_analyzer)
 ):
-    """Analyze frame from file upload (no base64 encoding)"""
+    """
+    Analyze frame from file upload (no base64 encoding)
+    
+    The file is a JPEG/PNG image or a raw pixel frame (header + BGR, RGB,
+    BGRA, RGBA, GRAY or NV12 pixels, see app/utils/frame_protocol.py).
+    """
     
     try:
-        # Read file directly
+        # Read file directly; the bytes are decoded once, on the inference executor
         contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if frame is None:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Invalid image file"}
-            )
-        
-        # Convert frame to base64 for existing analyzer
-        _, buffer = cv2.imencode('.jpg', frame)
-        frame_base64 = base64.b64encode(buffer).decode('utf-8')
         
         # Process frame
-        result = await analyzer.analyze(
-            frame_base64=frame_base64,
+        result = await analyzer.analyze_frame(
+            contents,
             session_id=session_id,
             body_part=body_part,
             movement_type=movement_type,
-            include_keypoints=include_keypoints
+            include_keypoints=include_keypoints,
+            pose_model=pose_model,
+            pose_mode=pose_mode
         )
         
-        return result
-        
+        return AnalysisJSONResponse(result)
+    
+    except InvalidFrameError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid image file", "detail": str(e)}
+        )
+    except InferenceQueueFullError as e:
+        return JSONResponse(
+            status_code=503,
+            content={"error": str(e)}
+        )
+    except (AnalysisError, ValueError) as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(e)}
+        )
     except Exception as e:
         return JSONResponse(
             status_code=500,
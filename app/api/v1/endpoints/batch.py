@@ -1,7 +1,9 @@
 # app/api/v1/endpoints/batch.py
 from fastapi import APIRouter, BackgroundTasks, HTTPException
-from typing import List, Dict
+from typing import List, Dict, Optional
 import uuid
+from app.api.dependencies import get_frame_analyzer
+from app.utils.serialization import AnalysisJSONResponse
 
 router = APIRouter()
 
@@ -14,9 +16,11 @@ async def submit_batch(
     session_id: str,
     body_part: str,
     movement_type: str,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    pose_model: Optional[str] = None,
+    pose_mode: Optional[str] = None
 ):
-    """Submit batch of frames for processing"""
+    """Submit batch of frames for processing (offline jobs may pick a larger pose_mode)"""
     job_id = str(uuid.uuid4())
     
     # Store job info
@@ -30,25 +34,28 @@ async def submit_batch(
     # Process in background
     background_tasks.add_task(
         process_batch_frames,
-        job_id, frames, session_id, body_part, movement_type
+        job_id, frames, session_id, body_part, movement_type, pose_model, pose_mode
     )
     
     return {"job_id": job_id, "status": "accepted"}
 
-@router.get("/batch/status/{job_id}")
+@router.get("/batch/status/{job_id}", response_class=AnalysisJSONResponse)
 async def get_batch_status(job_id: str):
     """Get batch processing status"""
     if job_id not in processing_jobs:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return processing_jobs[job_id]
+    # Results hold KeypointSets, which only the analysis serializers write
+    return AnalysisJSONResponse(processing_jobs[job_id])
 
 async def process_batch_frames(
     job_id: str,
     frames: List[str],
     session_id: str,
     body_part: str,
-    movement_type: str
+    movement_type: str,
+    pose_model: Optional[str] = None,
+    pose_mode: Optional[str] = None
 ):
     """Process frames in background"""
     analyzer = get_frame_analyzer()
@@ -56,12 +63,14 @@ async def process_batch_frames(
     
     for i, frame_base64 in enumerate(frames):
         try:
-            result = await analyzer.analyze(
-                frame_base64=frame_base64,
+            result = await analyzer.analyze_frame(
+                frame_base64,
                 session_id=session_id,
                 body_part=body_part,
                 movement_type=movement_type,
-                include_keypoints=True
+                include_keypoints=True,
+                pose_model=pose_model,
+                pose_mode=pose_mode
             )
             
             processing_jobs[job_id]["results"].append(result)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
 
 router = APIRouter()
@@ -14,12 +15,58 @@ async def health_check():
 
 @router.get("/ready")
 async def readiness_check():
-    """Readiness check - verify model is loaded"""
+    """Readiness check - verify model is loaded and warmed up"""
     from app.core.pose.model_manager import ModelManager
     
-    model_ready = ModelManager.is_initialized()
+    ready = ModelManager.is_ready()
+    content = {
+        "status": "ready" if ready else "not_ready",
+        "model_loaded": ModelManager.is_initialized(),
+        "warmed_up": ready,
+        "warmup": ModelManager.get_warmup_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    # 503 keeps load balancers from routing to a cold worker
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@router.get("/device")
+async def device_info():
+    """Configured and auto-detected inference device"""
+    from app.config import settings
+    from app.core.pose.device import get_device_info
+    
+    return {
+        **get_device_info(settings.DEVICE, settings.BACKEND, settings.INFERENCE_PROFILE),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@router.get("/models")
+async def model_stats():
+    """Loaded pose models with memory accounting"""
+    from app.core.pose.processor import PoseProcessor
+    
+    return {
+        **PoseProcessor().get_model_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@router.get("/inference")
+async def inference_stats():
+    """Inference executor queue depth and wait times"""
+    from app.core.pose.executor import get_inference_executor
+    from app.core.pose.batcher import get_pose_batcher
+    from app.core.pose.processor import PoseProcessor
+    from app.core.pose.qos import get_qos_controller
+    
+    batcher = get_pose_batcher()
+    processor = PoseProcessor()
+    qos = get_qos_controller()
     return {
-        "status": "ready" if model_ready else "not_ready",
-        "model_loaded": model_ready,
+        "executor": get_inference_executor().get_stats(),
+        "batcher": batcher.get_stats() if batcher is not None else None,
+        "tracking": processor.get_tracking_stats(),
+        "frame_cache": processor.get_cache_stats(),
+        "worker_pool": processor.get_worker_pool_stats(),
+        "qos": qos.get_stats() if qos is not None else None,
         "timestamp": datetime.utcnow().isoformat()
     }
\ No newline at end of file
@@ -0,0 +1,149 @@
+# app/api/v1/endpoints/video.py
+from fastapi import APIRouter, File, Form, UploadFile, Depends
+from fastapi.responses import JSONResponse
+from typing import Optional
+import logging
+import os
+import tempfile
+import uuid
+from app.config import settings
+from app.services.frame_analyzer import FrameAnalyzer
+from app.services.video_analyzer import ANALYSIS_MODES, VideoAnalyzer
+from app.services.video_processor import VIDEO_SUFFIXES
+from app.api.dependencies import get_frame_analyzer
+from app.utils.exceptions import AnalysisError, InferenceQueueFullError, InvalidFrameError
+from app.utils.serialization import AnalysisJSONResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+class UploadTooLargeError(Exception):
+    """Upload exceeds VIDEO_MAX_UPLOAD_MB"""
+    pass
+
+def resolve_local_path(path: str) -> str:
+    """
+    Resolve a server-local video path inside VIDEO_LOCAL_DIR
+
+    Raises:
+        PermissionError: if local paths are disabled or the path leaves the directory
+        FileNotFoundError: if the file doesn't exist
+    """
+    if not settings.VIDEO_LOCAL_DIR:
+        raise PermissionError("Server-local video paths are disabled (set VIDEO_LOCAL_DIR)")
+    root = os.path.realpath(settings.VIDEO_LOCAL_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise PermissionError("Video path must be inside VIDEO_LOCAL_DIR")
+    if not os.path.isfile(resolved):
+        raise FileNotFoundError(f"Video not found: {path}")
+    return resolved
+
+async def save_upload(file: UploadFile) -> str:
+    """Stream an upload to a temporary file in chunks (never the whole video in memory)"""
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    if suffix not in VIDEO_SUFFIXES:
+        suffix = ".mp4"
+    max_bytes = settings.VIDEO_MAX_UPLOAD_MB * 1024 * 1024
+    written = 0
+
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        try:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLargeError(f"Video exceeds {settings.VIDEO_MAX_UPLOAD_MB} MB")
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    return tmp.name
+
+@router.post("/video", response_class=AnalysisJSONResponse)
+async def analyze_video(
+    body_part: str = Form(...),
+    movement_type: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    path: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
+    sample_fps: float = Form(settings.VIDEO_SAMPLE_FPS),
+    max_frames: Optional[int] = Form(None),
+    pose_model: Optional[str] = Form(None),
+    pose_mode: Optional[str] = Form(None),
+    mode: str = Form(settings.VIDEO_ANALYSIS_MODE),
+    coarse_step: int = Form(settings.VIDEO_COARSE_STEP),
+    analyzer: FrameAnalyzer = Depends(get_frame_analyzer)
+):
+    """
+    Analyze a recorded video (MP4/MOV upload, or a path inside VIDEO_LOCAL_DIR)
+
+    Frames are sampled at sample_fps and analyzed in order within one session;
+    the response holds a per-frame angle timeline and the final ROM. With
+    mode=coarse_to_fine only the frames around the extremes of the primary
+    angle are analyzed.
+    """
+    if (file is None) == (path is None):
+        return JSONResponse(status_code=400, content={"error": "Provide either a video file or a path"})
+    if sample_fps < 0:
+        return JSONResponse(status_code=400, content={"error": "sample_fps must be >= 0"})
+    if mode not in ANALYSIS_MODES:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unsupported mode: {mode} (available: {', '.join(ANALYSIS_MODES)})"}
+        )
+
+    max_frames = min(max_frames or settings.VIDEO_MAX_FRAMES, settings.VIDEO_MAX_FRAMES)
+    session_id = session_id or f"video_{uuid.uuid4().hex[:8]}"
+    temp_path = None
+
+    try:
+        # Reject unsupported movements and pose models before copying the upload
+        analyzer.primary_angle_key(body_part, movement_type)
+        analyzer.pose_processor.model_key(pose_model, pose_mode)
+
+        if file is not None:
+            temp_path = await save_upload(file)
+            video_path = temp_path
+        else:
+            video_path = resolve_local_path(path)
+
+        result = await VideoAnalyzer(analyzer).analyze(
+            video_path,
+            session_id=session_id,
+            body_part=body_part,
+            movement_type=movement_type,
+            sample_fps=sample_fps,
+            max_frames=max_frames,
+            pose_model=pose_model,
+            pose_mode=pose_mode,
+            mode=mode,
+            coarse_step=coarse_step,
+            refine_margin=settings.VIDEO_REFINE_MARGIN_DEG
+        )
+        return AnalysisJSONResponse(result)
+
+    except UploadTooLargeError as e:
+        return JSONResponse(status_code=413, content={"error": str(e)})
+    except PermissionError as e:
+        return JSONResponse(status_code=403, content={"error": str(e)})
+    except FileNotFoundError as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+    except InvalidFrameError as e:
+        return JSONResponse(status_code=400, content={"error": "Invalid video file", "detail": str(e)})
+    except (AnalysisError, ValueError) as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    except InferenceQueueFullError as e:
+        return JSONResponse(status_code=503, content={"error": str(e)})
+    except Exception as e:
+        logger.error(f"Video analysis failed: {type(e).__name__}: {e}")
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
+    finally:
+        if temp_path is not None:
+            os.unlink(temp_path)
@@ -1,12 +1,19 @@
 # app/api/v1/endpoints/websocket.py
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-from app.models.requests import FrameAnalysisRequest
-from app.services.frame_analyzer import FrameAnalyzer
+from app.models.requests import FrameAnalysisRequest, MovementSelection
+from app.services.frame_analyzer import SKELETON_CONNECTIONS, FrameAnalyzer
 from app.services.session_manager import SessionManager
 from app.storage.memory import InMemoryStorage
+from app.utils.exceptions import AnalysisError, InvalidFrameError
+from app.utils.serialization import RESULT_FRAMES, ResultEncoder, send_json_message
+from app.utils.result_delta import RESULT_MODES, ResultDelta
+from physiotrack_core.pose_detection import keypoint_names_for
+from app.utils.frame_protocol import (
+    FLAG_INCLUDE_KEYPOINTS, FRAME_FORMATS, describe_binary_frame, parse_binary_frame
+)
 import json
 import logging
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import asyncio
 
 logger = logging.getLogger(__name__)
@@ -31,21 +38,49 @@ class ConnectionManager:
     async def send_json(self, session_id: str, data: dict):
         if session_id in self.active_connections:
             websocket = self.active_connections[session_id]
-            await websocket.send_json(data)
+            await send_json_message(websocket, data)
 
 manager = ConnectionManager()
 
-# Create analyzer instance (singleton pattern already handled in FrameAnalyzer)
+def message_movements(data: Dict[str, Any]) -> Optional[List[Tuple[str, str]]]:
+    """
+    (body_part, movement_type) pairs of a message's "movements" list, or None if it has none
+    
+    Raises:
+        ValueError: if movements isn't a non-empty list of {body_part, movement_type} objects
+    """
+    movements = data.get("movements")
+    if movements is None:
+        return None
+    if not isinstance(movements, list) or not movements:
+        raise ValueError("movements must be a non-empty list of {body_part, movement_type} objects")
+    selections = [MovementSelection.model_validate(movement) for movement in movements]
+    return [(selection.body_part, selection.movement_type) for selection in selections]
+
+# Analyzer instance is created on first connection (pose model loading stays out of import time)
 _storage = InMemoryStorage()
 _session_manager = SessionManager(_storage)
-_frame_analyzer = FrameAnalyzer(_session_manager)
+_frame_analyzer: Optional[FrameAnalyzer] = None
+
+def get_ws_frame_analyzer() -> FrameAnalyzer:
+    """Get the WebSocket frame analyzer, creating it on first use"""
+    global _frame_analyzer
+    if _frame_analyzer is None:
+        _frame_analyzer = FrameAnalyzer(_session_manager)
+    return _frame_analyzer
 
 @router.websocket("/ws/{session_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
-    session_id: str
+    session_id: str,
+    result_encoding: str = Query("json")
 ):
-    """WebSocket endpoint for real-time ROM analysis"""
+    """
+    WebSocket endpoint for real-time ROM analysis
+    
+    ?result_encoding=msgpack or packed sends results as binary frames (see
+    app/utils/serialization.py); error messages stay JSON text.
+    """
     logger.info(f"WebSocket connection attempt for session {session_id}")
     
     # Accept the connection
@@ -59,6 +94,17 @@ async def websocket_endpoint(
     # Add to connection manager (don't accept again)
     await manager.connect(websocket, session_id)
     
+    # One encoder per pose model (packed results list keypoints in model order)
+    encoders: Dict[str, ResultEncoder] = {}
+    
+    try:
+        ResultEncoder(result_encoding)
+    except ValueError as e:
+        await websocket.send_json({"error": str(e), "status": "error"})
+        manager.disconnect(session_id)
+        await websocket.close()
+        return
+    
     try:
         while True:
             try:
@@ -73,28 +119,50 @@ async def websocket_endpoint(
                     })
                     continue
                 
-                if "body_part" not in data or "movement_type" not in data:
+                try:
+                    movements = message_movements(data)
+                except ValueError as e:
+                    await websocket.send_json({"error": str(e), "status": "error"})
+                    continue
+                
+                if movements is None and ("body_part" not in data or "movement_type" not in data):
                     await websocket.send_json({
-                        "error": "body_part and movement_type are required",
+                        "error": "body_part and movement_type, or movements, are required",
                         "status": "error"
                     })
                     continue
                 
                 try:
-                    # Analyze frame
-                    result = await _frame_analyzer.analyze(
-                        frame_base64=data["frame_base64"],
-                        session_id=session_id,
-                        body_part=data["body_part"],
-                        movement_type=data["movement_type"],
-                        include_keypoints=data.get("include_keypoints", False),
-                        include_visualization=False
-                    )
+                    # Analyze frame (all movements on one pose detection)
+                    if movements is not None:
+                        result = await get_ws_frame_analyzer().analyze_movements(
+                            data["frame_base64"],
+                            session_id=session_id,
+                            movements=movements,
+                            include_keypoints=data.get("include_keypoints", False),
+                            pose_model=data.get("pose_model"),
+                            pose_mode=data.get("pose_mode"),
+                            bilateral=bool(data.get("bilateral", False))
+                        )
+                    else:
+                        result = await get_ws_frame_analyzer().analyze_frame(
+                            data["frame_base64"],
+                            session_id=session_id,
+                            body_part=data["body_part"],
+                            movement_type=data["movement_type"],
+                            include_keypoints=data.get("include_keypoints", False),
+                            pose_model=data.get("pose_model"),
+                            pose_mode=data.get("pose_mode"),
+                            bilateral=bool(data.get("bilateral", False))
+                        )
                     
                     # Ensure result is a dict
                     if isinstance(result, dict):
                         result["status"] = "success"
-                        await websocket.send_json(result)
+                        model = get_ws_frame_analyzer().pose_processor.model_key(data.get("pose_model")).model
+                        if model not in encoders:
+                            encoders[model] = ResultEncoder(result_encoding, keypoint_names=keypoint_names_for(model))
+                        await encoders[model].send(websocket, result)
                     else:
                         logger.error(f"Result is not a dict: {type(result)}")
                         await websocket.send_json({
@@ -125,6 +193,7 @@ async def websocket_endpoint(
         logger.error(f"WebSocket error for session {session_id}: {e}")
     finally:
         manager.disconnect(session_id)
+        get_ws_frame_analyzer().release_session(session_id)
 
 @router.websocket("/ws/stream/{session_id}")
 async def websocket_stream_endpoint(
@@ -134,6 +203,16 @@ async def websocket_stream_endpoint(
     """
     WebSocket endpoint for continuous streaming analysis
     Expects a stream of frames and continuously analyzes them
+    
+    The config names one body_part and movement_type, or a "movements" list
+    of them; each frame's pose is then detected once and every movement
+    evaluated on it, in one combined result per frame. "bilateral": true
+    measures limb movements on both sides (left, right and symmetry).
+    
+    Frames are base64 text messages by default. A config message with
+    "frame_format": "binary" also enables binary messages: a fixed header
+    (sequence number, client timestamp, flags) followed by the JPEG/PNG bytes,
+    see app/utils/frame_protocol.py.
     """
     logger.info(f"WebSocket stream connection attempt for session {session_id}")
     
@@ -151,7 +230,13 @@ async def websocket_stream_endpoint(
     # Configuration for the stream
     body_part = None
     movement_type = None
+    movements = None
+    bilateral = False
     include_keypoints = False
+    pose_model = None
+    pose_mode = None
+    frame_format = "base64"
+    frame_count = 0
     
     try:
         # First message should be configuration (with timeout)
@@ -160,22 +245,99 @@ async def websocket_stream_endpoint(
             body_part = config_data.get("body_part")
             movement_type = config_data.get("movement_type")
             include_keypoints = config_data.get("include_keypoints", False)
+            bilateral = bool(config_data.get("bilateral", False))
             
-            if not body_part or not movement_type:
+            try:
+                movements = message_movements(config_data)
+                # Unsupported movements are rejected before the first frame
+                context = get_ws_frame_analyzer().movements_context(movements, bilateral) if movements else None
+            except (ValueError, AnalysisError) as e:
+                await websocket.send_json({"error": str(e), "status": "error"})
+                return
+            
+            if movements is None and (not body_part or not movement_type):
                 await websocket.send_json({
-                    "error": "First message must include body_part and movement_type",
+                    "error": "First message must include body_part and movement_type, or movements",
                     "status": "error"
                 })
                 return
             
-            await websocket.send_json({
+            # Optional model choice, e.g. lightweight for mobile streams
+            try:
+                model_key = get_ws_frame_analyzer().pose_processor.model_key(
+                    config_data.get("pose_model"), config_data.get("pose_mode")
+                )
+            except ValueError as e:
+                await websocket.send_json({"error": str(e), "status": "error"})
+                return
+            pose_model, pose_mode = model_key.model, model_key.mode
+            
+            frame_format = config_data.get("frame_format", "base64")
+            if frame_format not in FRAME_FORMATS:
+                await websocket.send_json({
+                    "error": f"Unsupported frame_format: {frame_format} (available: {', '.join(FRAME_FORMATS)})",
+                    "status": "error"
+                })
+                return
+            
+            # Results go out as text frames unless the client asks for binary ones
+            result_frame = config_data.get("result_frame", "text")
+            if result_frame not in RESULT_FRAMES:
+                await websocket.send_json({
+                    "error": f"Unsupported result_frame: {result_frame} (available: {', '.join(RESULT_FRAMES)})",
+                    "status": "error"
+                })
+                return
+            
+            try:
+                result_encoder = ResultEncoder(
+                    config_data.get("result_encoding", "json"),
+                    binary_frames=result_frame == "binary",
+                    keypoint_names=keypoint_names_for(pose_model)
+                )
+            except ValueError as e:
+                await websocket.send_json({"error": str(e), "status": "error"})
+                return
+            
+            # Delta mode sends the static context once and then only what changed
+            result_mode = config_data.get("result_mode", "full")
+            if result_mode not in RESULT_MODES:
+                await websocket.send_json({
+                    "error": f"Unsupported result_mode: {result_mode} (available: {', '.join(RESULT_MODES)})",
+                    "status": "error"
+                })
+                return
+            result_delta = ResultDelta(
+                context or get_ws_frame_analyzer().result_context(body_part, movement_type, bilateral)
+            ) if result_mode == "delta" else None
+            
+            ready_config = {
+                "body_part": body_part,
+                "movement_type": movement_type,
+                "bilateral": bilateral,
+                "include_keypoints": include_keypoints,
+                "pose_model": pose_model,
+                "pose_mode": pose_mode,
+                "frame_format": frame_format,
+                "result_frame": result_frame,
+                "result_encoding": result_encoder.describe(SKELETON_CONNECTIONS),
+                "result_mode": result_mode
+            }
+            if movements is not None:
+                ready_config["movements"] = [
+                    {"body_part": part, "movement_type": movement} for part, movement in movements
+                ]
+            if result_delta is not None:
+                ready_config["context"] = result_delta.context
+                ready_config["skeleton_connections"] = SKELETON_CONNECTIONS
+            if frame_format == "binary":
+                ready_config["binary_frame"] = describe_binary_frame()
+            
+            # Always JSON so the client can read the result layout before decoding results
+            await send_json_message(websocket, {
                 "status": "ready",
-                "config": {
-                    "body_part": body_part,
-                    "movement_type": movement_type,
-                    "include_keypoints": include_keypoints
-                }
-            })
+                "config": ready_config
+            }, result_frame == "binary")
             
         except asyncio.TimeoutError:
             await websocket.send_json({
@@ -185,11 +347,23 @@ async def websocket_stream_endpoint(
             return
         
         # Process incoming frames
-        frame_count = 0
         while True:
             try:
-                # Receive frame with timeout
-                frame_data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
+                # Receive frame with timeout (text or binary message)
+                message = await asyncio.wait_for(websocket.receive(), timeout=30.0)
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                
+                frame_data = message.get("text")
+                frame_bytes = message.get("bytes")
+                header = None
+                
+                if frame_bytes is not None and frame_format != "binary":
+                    await result_encoder.send(websocket, {
+                        "error": "Binary frames require \"frame_format\": \"binary\" in the config message",
+                        "status": "error"
+                    })
+                    continue
                 
                 # Handle control messages
                 if frame_data == "ping":
@@ -197,53 +371,83 @@ async def websocket_stream_endpoint(
                     continue
                 
                 try:
+                    if frame_bytes is not None:
+                        # Header + encoded image; decoded straight from the message buffer
+                        header, frame = parse_binary_frame(frame_bytes)
                     # Parse frame data if it's JSON
-                    if frame_data.startswith("{"):
+                    elif frame_data.startswith("{"):
                         data = json.loads(frame_data)
-                        frame_base64 = data.get("frame", data.get("frame_base64"))
+                        frame = data.get("frame", data.get("frame_base64"))
                     else:
                         # Assume it's just the base64 frame
-                        frame_base64 = frame_data
+                        frame = frame_data
                     
-                    if not frame_base64:
-                        await websocket.send_json({
+                    if not frame:
+                        await result_encoder.send(websocket, {
                             "error": "No frame data provided",
                             "status": "error"
                         })
                         continue
                     
                     # Analyze frame
-                    result = await _frame_analyzer.analyze(
-                        frame_base64=frame_base64,
-                        session_id=session_id,
-                        body_part=body_part,
-                        movement_type=movement_type,
-                        include_keypoints=include_keypoints,
-                        include_visualization=False
+                    frame_keypoints = include_keypoints or (
+                        header is not None and bool(header.flags & FLAG_INCLUDE_KEYPOINTS)
                     )
+                    if movements is not None:
+                        result = await get_ws_frame_analyzer().analyze_movements(
+                            frame,
+                            session_id=session_id,
+                            movements=movements,
+                            include_keypoints=frame_keypoints,
+                            pose_model=pose_model,
+                            pose_mode=pose_mode,
+                            bilateral=bilateral
+                        )
+                    else:
+                        result = await get_ws_frame_analyzer().analyze_frame(
+                            frame,
+                            session_id=session_id,
+                            body_part=body_part,
+                            movement_type=movement_type,
+                            include_keypoints=frame_keypoints,
+                            pose_model=pose_model,
+                            pose_mode=pose_mode,
+                            bilateral=bilateral
+                        )
                     
                     # Add frame number and status
                     if isinstance(result, dict):
                         result["frame_number"] = frame_count
                         result["status"] = "success"
+                        if header is not None:
+                            # Lets the client match results to frames and measure round trips
+                            result["seq"] = header.seq
+                            result["client_ts"] = header.client_ts
                         frame_count += 1
                         
                         # Send result
-                        await websocket.send_json(result)
+                        if result_delta is not None:
+                            result = result_delta.encode(result)
+                        await result_encoder.send(websocket, result)
                     else:
-                        await websocket.send_json({
+                        await result_encoder.send(websocket, {
                             "error": "Invalid result format",
                             "status": "error"
                         })
                     
                 except json.JSONDecodeError:
-                    await websocket.send_json({
+                    await result_encoder.send(websocket, {
                         "error": "Invalid JSON format",
                         "status": "error"
                     })
+                except InvalidFrameError as e:
+                    await result_encoder.send(websocket, {
+                        "error": str(e),
+                        "status": "error"
+                    })
                 except Exception as e:
                     logger.error(f"Error in stream analysis: {e}")
-                    await websocket.send_json({
+                    await result_encoder.send(websocket, {
                         "error": f"Analysis failed: {str(e)}",
                         "status": "error"
                     })
@@ -252,7 +456,7 @@ async def websocket_stream_endpoint(
                 logger.warning(f"Stream timeout for session {session_id}")
                 # Send ping to check if connection is alive
                 try:
-                    await websocket.send_json({"type": "ping"})
+                    await result_encoder.send(websocket, {"type": "ping"})
                 except:
                     break
                     
@@ -263,4 +467,187 @@ async def websocket_stream_endpoint(
         import traceback
         logger.error(traceback.format_exc())
     finally:
-        manager.disconnect(session_id)
\ No newline at end of file
+        manager.disconnect(session_id)
+        get_ws_frame_analyzer().release_session(session_id)
+
+@router.websocket("/ws/keypoints/{session_id}")
+async def websocket_keypoints_endpoint(
+    websocket: WebSocket,
+    session_id: str
+):
+    """
+    WebSocket endpoint for clients that run pose estimation on-device
+    
+    Same config/ready handshake as /ws/stream, then each message is a JSON
+    object with "keypoints" (26 HALPE_26 [x, y] pairs) and "scores" (26
+    values). No image is decoded and no pose model runs for these frames.
+    Optional "seq" and "client_ts" fields are echoed in the result. As with
+    /ws/stream, the config may name a "movements" list instead of one movement.
+    """
+    logger.info(f"WebSocket keypoints connection attempt for session {session_id}")
+    
+    try:
+        await websocket.accept()
+    except Exception as e:
+        logger.error(f"Failed to accept WebSocket keypoints stream: {e}")
+        return
+    
+    await manager.connect(websocket, session_id)
+    
+    frame_count = 0
+    
+    try:
+        try:
+            config_data = await asyncio.wait_for(websocket.receive_json(), timeout=10.0)
+        except asyncio.TimeoutError:
+            await websocket.send_json({
+                "error": "Timeout waiting for configuration",
+                "status": "error"
+            })
+            return
+        
+        body_part = config_data.get("body_part")
+        movement_type = config_data.get("movement_type")
+        include_keypoints = config_data.get("include_keypoints", False)
+        bilateral = bool(config_data.get("bilateral", False))
+        
+        try:
+            movements = message_movements(config_data)
+            context = get_ws_frame_analyzer().movements_context(movements, bilateral) if movements else None
+        except (ValueError, AnalysisError) as e:
+            await websocket.send_json({"error": str(e), "status": "error"})
+            return
+        
+        if movements is None and (not body_part or not movement_type):
+            await websocket.send_json({
+                "error": "First message must include body_part and movement_type, or movements",
+                "status": "error"
+            })
+            return
+        
+        result_frame = config_data.get("result_frame", "text")
+        if result_frame not in RESULT_FRAMES:
+            await websocket.send_json({
+                "error": f"Unsupported result_frame: {result_frame} (available: {', '.join(RESULT_FRAMES)})",
+                "status": "error"
+            })
+            return
+        try:
+            result_encoder = ResultEncoder(
+                config_data.get("result_encoding", "json"),
+                binary_frames=result_frame == "binary",
+                keypoint_names=keypoint_names_for("body_with_feet")
+            )
+        except ValueError as e:
+            await websocket.send_json({"error": str(e), "status": "error"})
+            return
+        
+        result_mode = config_data.get("result_mode", "full")
+        if result_mode not in RESULT_MODES:
+            await websocket.send_json({
+                "error": f"Unsupported result_mode: {result_mode} (available: {', '.join(RESULT_MODES)})",
+                "status": "error"
+            })
+            return
+        result_delta = ResultDelta(
+            context or get_ws_frame_analyzer().result_context(body_part, movement_type, bilateral)
+        ) if result_mode == "delta" else None
+        
+        ready_config = {
+            "body_part": body_part,
+            "movement_type": movement_type,
+            "bilateral": bilateral,
+            "include_keypoints": include_keypoints,
+            "keypoint_format": "halpe_26",
+            "result_frame": result_frame,
+            "result_encoding": result_encoder.describe(SKELETON_CONNECTIONS),
+            "result_mode": result_mode
+        }
+        if movements is not None:
+            ready_config["movements"] = [
+                {"body_part": part, "movement_type": movement} for part, movement in movements
+            ]
+        if result_delta is not None:
+            ready_config["context"] = result_delta.context
+            ready_config["skeleton_connections"] = SKELETON_CONNECTIONS
+        
+        await send_json_message(websocket, {
+            "status": "ready",
+            "config": ready_config
+        }, result_frame == "binary")
+        
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
+            except asyncio.TimeoutError:
+                logger.warning(f"Keypoints stream timeout for session {session_id}")
+                await result_encoder.send(websocket, {"type": "ping"})
+                continue
+            
+            if message == "ping":
+                await websocket.send_text("pong")
+                continue
+            
+            try:
+                data = json.loads(message)
+                if "keypoints" not in data or "scores" not in data:
+                    await result_encoder.send(websocket, {
+                        "error": "Message must include keypoints and scores",
+                        "status": "error"
+                    })
+                    continue
+                
+                if movements is not None:
+                    result = await get_ws_frame_analyzer().analyze_keypoint_movements(
+                        data["keypoints"],
+                        data["scores"],
+                        session_id=session_id,
+                        movements=movements,
+                        include_keypoints=data.get("include_keypoints", include_keypoints),
+                        bilateral=bilateral
+                    )
+                else:
+                    result = await get_ws_frame_analyzer().analyze_keypoints(
+                        data["keypoints"],
+                        data["scores"],
+                        session_id=session_id,
+                        body_part=body_part,
+                        movement_type=movement_type,
+                        include_keypoints=data.get("include_keypoints", include_keypoints),
+                        bilateral=bilateral
+                    )
+                
+                result["frame_number"] = frame_count
+                result["status"] = "success"
+                for field in ("seq", "client_ts"):
+                    if field in data:
+                        result[field] = data[field]
+                frame_count += 1
+                if result_delta is not None:
+                    result = result_delta.encode(result)
+                await result_encoder.send(websocket, result)
+            
+            except json.JSONDecodeError:
+                await result_encoder.send(websocket, {
+                    "error": "Invalid JSON format",
+                    "status": "error"
+                })
+            except InvalidFrameError as e:
+                await result_encoder.send(websocket, {
+                    "error": str(e),
+                    "status": "error"
+                })
+            except Exception as e:
+                logger.error(f"Error in keypoint analysis: {e}")
+                await result_encoder.send(websocket, {
+                    "error": f"Analysis failed: {str(e)}",
+                    "status": "error"
+                })
+    
+    except WebSocketDisconnect:
+        logger.info(f"Keypoints stream ended for session {session_id} after {frame_count} frames")
+    except Exception as e:
+        logger.error(f"WebSocket keypoints error for session {session_id}: {e}")
+    finally:
+        manager.disconnect(session_id)
+        get_ws_frame_analyzer().release_session(session_id)
\ No newline at end of file
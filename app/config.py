@@ -1,6 +1,5 @@
 from typing import List
 from pydantic_settings import BaseSettings
-import torch
 
 class Settings(BaseSettings):
     # API Settings
@@ -12,14 +11,72 @@ class Settings(BaseSettings):
     # Model Settings - Using best/performance model
     POSE_MODEL: str = "body_with_feet"
     POSE_MODE: str = "performance"  # Changed from lightweight to performance
-    DEVICE: str = "cuda" if torch.cuda.is_available() else "cpu"  # Auto-detect GPU
-    BACKEND: str = "onnxruntime"  # Best backend for performance
+    DEVICE: str = "auto"  # "auto" picks the best ONNX Runtime / OpenVINO device on first model load
+    BACKEND: str = "onnxruntime"  # Best backend for performance ("auto" also supported)
+    INFERENCE_PROFILE: str = ""  # cpu-latency, cpu-throughput, openvino-latency, openvino-throughput, openvino-int8 (overrides BACKEND)
+    INT8_MODEL_DIR: str = "models/int8"  # Output of scripts/quantize_models.py
+    POSE_MAX_LOADED_MODELS: int = 2  # Models requests may select are loaded lazily; LRU ones unloaded beyond this
+    
+    # Frame decoding
+    DECODE_REDUCED: bool = True  # Decode large JPEGs at 1/2, 1/4 or 1/8 size (keypoints are scaled back)
+    DECODE_MIN_SIDE: int = 0  # Long side a reduced decode must keep (0 = the model's largest input size)
     
     # Processing Settings
     CONFIDENCE_THRESHOLD: float = 0.3
     MIN_KEYPOINTS_RATIO: float = 0.5
     ANGLE_SMOOTHING_WINDOW: int = 5
     
+    # Inference Executor Settings
+    INFERENCE_WORKERS: int = 2  # Threads running decode + pose inference
+    INFERENCE_QUEUE_SIZE: int = 16  # Max frames waiting for a worker before rejecting
+    
+    # Multi-process inference (0 = in-process, -1 = autosize from available CPUs)
+    INFERENCE_PROCESSES: int = 0
+    INFERENCE_PROCESS_THREADS: int = 2  # ONNX Runtime intra-op threads per worker process
+    INFERENCE_PROCESS_SLOTS: int = 2  # Shared-memory frame slots per worker process
+    INFERENCE_PROCESS_MAX_FRAME_PIXELS: int = 1920 * 1080  # Larger frames are downscaled before handoff
+    INFERENCE_PROCESS_TIMEOUT: float = 30.0
+    
+    # Model warm-up (readiness stays false until it completes)
+    WARMUP_ENABLED: bool = True
+    WARMUP_FRAMES: int = 3  # Synthetic frames per resolution
+    WARMUP_RESOLUTIONS: str = "640x480,1280x720"  # Comma separated WIDTHxHEIGHT
+    
+    # Cross-session micro-batching
+    POSE_BATCHING_ENABLED: bool = False
+    POSE_BATCH_MAX_SIZE: int = 8  # Flush as soon as this many frames are waiting
+    POSE_BATCH_WINDOW_MS: float = 10.0  # Max time the first frame of a batch waits
+    
+    # Per-session pose tracking
+    POSE_DET_FREQUENCY: int = 5  # Run the person detector every N frames of a session (1 = every frame)
+    POSE_TRACKING_MIN_CONFIDENCE: float = 0.5  # Re-detect when mean keypoint confidence drops below this
+    POSE_TRACKING_MAX_SESSIONS: int = 1024
+    POSE_TRACKING_TTL: int = 300  # Seconds before an idle session's tracking state is dropped
+    
+    # Pose results of byte-identical frames (retries, reconnects, one frame analyzed for several movements)
+    POSE_CACHE_MAX_ENTRIES: int = 256  # 0 disables the cache
+    POSE_CACHE_TTL: float = 30.0  # Seconds a cached pose estimate is reused
+    
+    # Adaptive quality of service (lower fidelity instead of growing latency under load)
+    QOS_ENABLED: bool = False
+    QOS_POLICY: str = "detector,resolution,model,fps"  # Degradation order, one step per level
+    QOS_DEGRADE_WAIT_MS: float = 100.0  # Step down when the smoothed inference queue wait exceeds this
+    QOS_RECOVER_WAIT_MS: float = 20.0  # Step back up once it falls below this
+    QOS_HOLD_S: float = 2.0  # Minimum time between level changes
+    QOS_DET_FREQUENCY: int = 15  # "detector": run the person detector every N frames
+    QOS_MAX_SIDE: int = 480  # "resolution": downscale inputs to this long side
+    QOS_POSE_MODE: str = "lightweight"  # "model": switch to this RTMLib mode
+    QOS_MAX_FPS: float = 5.0  # "fps": analyze at most this many frames per second per session
+    
+    # Video analysis (/api/v1/analyze/video)
+    VIDEO_SAMPLE_FPS: float = 10.0  # Frames analyzed per second of video (0 = every frame)
+    VIDEO_MAX_FRAMES: int = 3000  # Max frames analyzed per video
+    VIDEO_MAX_UPLOAD_MB: int = 500
+    VIDEO_LOCAL_DIR: str = ""  # Server-local videos must be inside this directory ("" = local paths disabled)
+    VIDEO_ANALYSIS_MODE: str = "exhaustive"  # exhaustive or coarse_to_fine
+    VIDEO_COARSE_STEP: int = 8  # coarse_to_fine: analyze every Nth sampled frame before refining
+    VIDEO_REFINE_MARGIN_DEG: float = 5.0  # coarse_to_fine: also refine local extremes within this of the min/max
+    
     # Storage Settings
     USE_REDIS: bool = False
     REDIS_URL: str = "redis://localhost:6379"
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 
+from physiotrack_core.keypoint_set import KeypointSet
+
 class Movement(ABC):
     """Abstract base class for all movements"""
     
@@ -30,12 +32,12 @@ class Movement(ABC):
         pass
     
     @abstractmethod
-    def calculate_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+    def calculate_angles(self, keypoints: KeypointSet) -> Dict[str, float]:
         """Calculate all angles for this movement"""
         pass
     
     @abstractmethod
-    def validate_position(self, keypoints: Dict[str, np.ndarray]) -> Tuple[bool, str]:
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
         """Validate if the position is correct for this movement"""
         pass
     
@@ -1,18 +1,27 @@
 import numpy as np
 from typing import Dict, List, Tuple
 from app.core.body_parts.base import Movement
-from physiotrack_core.angle_computation import compute_angle, add_virtual_keypoints
+from physiotrack_core.keypoint_set import KeypointSet
+from physiotrack_core.angle_computation import compute_angle, add_virtual_keypoints, has_keypoints
 
 class ElbowFlexion(Movement):
     """Elbow flexion movement analyzer"""
     
+    def __init__(self, side: str = "right"):
+        """
+        Args:
+            side: Arm to measure ("left" or "right")
+        """
+        self.side = side
+        self._prefix = side[0].upper()
+    
     @property
     def name(self) -> str:
         return "elbow_flexion"
     
     @property
     def required_keypoints(self) -> List[str]:
-        return ["RShoulder", "RElbow", "RWrist"]
+        return [f"{self._prefix}Shoulder", f"{self._prefix}Elbow", f"{self._prefix}Wrist"]
     
     @property
     def primary_angle(self) -> str:
@@ -22,7 +31,7 @@ class ElbowFlexion(Movement):
     def normal_range(self) -> Tuple[float, float]:
         return (0, 145)  # Normal flexion range
     
-    def calculate_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+    def calculate_angles(self, keypoints: KeypointSet) -> Dict[str, float]:
         """Calculate elbow flexion angle"""
         angles = {}
         
@@ -30,11 +39,11 @@ class ElbowFlexion(Movement):
         keypoints = add_virtual_keypoints(keypoints)
         
         # Check if all required keypoints are present
-        if not all(kp in keypoints for kp in self.required_keypoints):
+        if not has_keypoints(keypoints, self.required_keypoints):
             return angles
         
         # Calculate elbow angle using  method
-        elbow_angle_raw = compute_angle('right elbow', keypoints, flip_left_right=False)
+        elbow_angle_raw = compute_angle(f'{self.side} elbow', keypoints, flip_left_right=False)
         
         if not np.isnan(elbow_angle_raw):
             # Convert to flexion angle (0° = full extension, 145° = full flexion)
@@ -44,20 +53,21 @@ class ElbowFlexion(Movement):
             
         # Additional context angles
         # Shoulder angle to understand arm position
-        if all(k in keypoints for k in ["RElbow", "RShoulder", "Hip", "Neck"]):
-            shoulder_angle = compute_angle('right shoulder', keypoints, flip_left_right=False)
+        p = self._prefix
+        if has_keypoints(keypoints, [f"{p}Elbow", f"{p}Shoulder", "Hip", "Neck"]):
+            shoulder_angle = compute_angle(f'{self.side} shoulder', keypoints, flip_left_right=False)
             if not np.isnan(shoulder_angle):
                 angles["shoulder"] = shoulder_angle
         
         # Forearm rotation indicator (if hand keypoints available)
-        if all(k in keypoints for k in ["RWrist", "RElbow", "RIndex"]):
-            wrist_angle = compute_angle('right wrist', keypoints, flip_left_right=False)
+        if has_keypoints(keypoints, [f"{p}Wrist", f"{p}Elbow", f"{p}Index"]):
+            wrist_angle = compute_angle(f'{self.side} wrist', keypoints, flip_left_right=False)
             if not np.isnan(wrist_angle):
                 angles["wrist"] = wrist_angle
                 
         return angles
     
-    def validate_position(self, keypoints: Dict[str, np.ndarray]) -> Tuple[bool, str]:
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
         """Validate if person is in correct position for elbow flexion measurement"""
         # Add virtual keypoints
         keypoints = add_virtual_keypoints(keypoints)
@@ -68,11 +78,12 @@ class ElbowFlexion(Movement):
             return False, f"Cannot detect: {', '.join(missing)}"
         
         # Check if arm is properly visible
+        p = self._prefix
         shoulder_elbow_dist = np.linalg.norm(
-            keypoints["RElbow"] - keypoints["RShoulder"]
+            keypoints[f"{p}Elbow"] - keypoints[f"{p}Shoulder"]
         )
         elbow_wrist_dist = np.linalg.norm(
-            keypoints["RWrist"] - keypoints["RElbow"]
+            keypoints[f"{p}Wrist"] - keypoints[f"{p}Elbow"]
         )
         
         # Check if segments are too short (arm might be pointing toward/away from camera)
@@ -83,7 +94,7 @@ class ElbowFlexion(Movement):
             return False, "Forearm is not clearly visible. Please position your arm parallel to the camera."
         
         # Check arm position relative to body
-        if "LShoulder" in keypoints:
+        if has_keypoints(keypoints, ["LShoulder", "RShoulder"]):
             shoulder_width = np.linalg.norm(
                 keypoints["LShoulder"] - keypoints["RShoulder"]
             )
@@ -113,13 +124,21 @@ class ElbowFlexion(Movement):
 class ElbowExtension(Movement):
     """Elbow extension movement analyzer (reverse of flexion)"""
     
+    def __init__(self, side: str = "right"):
+        """
+        Args:
+            side: Arm to measure ("left" or "right")
+        """
+        self.side = side
+        self._prefix = side[0].upper()
+    
     @property
     def name(self) -> str:
         return "elbow_extension"
     
     @property
     def required_keypoints(self) -> List[str]:
-        return ["RShoulder", "RElbow", "RWrist"]
+        return [f"{self._prefix}Shoulder", f"{self._prefix}Elbow", f"{self._prefix}Wrist"]
     
     @property
     def primary_angle(self) -> str:
@@ -129,12 +148,12 @@ class ElbowExtension(Movement):
     def normal_range(self) -> Tuple[float, float]:
         return (0, 10)  # Normal hyperextension range
     
-    def calculate_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+    def calculate_angles(self, keypoints: KeypointSet) -> Dict[str, float]:
         """Calculate elbow extension angle"""
         angles = {}
         
         # Use the same calculation as flexion
-        flexion_calc = ElbowFlexion()
+        flexion_calc = ElbowFlexion(self.side)
         flexion_angles = flexion_calc.calculate_angles(keypoints)
         
         if "elbow" in flexion_angles:
@@ -151,9 +170,9 @@ class ElbowExtension(Movement):
                 
         return angles
     
-    def validate_position(self, keypoints: Dict[str, np.ndarray]) -> Tuple[bool, str]:
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
         """Same validation as flexion"""
-        return ElbowFlexion().validate_position(keypoints)
+        return ElbowFlexion(self.side).validate_position(keypoints)
     
     def get_movement_phase(self, angle: float) -> str:
         """Determine movement phase based on extension angle"""
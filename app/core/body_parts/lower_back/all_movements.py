@@ -2,7 +2,8 @@
 import numpy as np
 from typing import Dict, List, Tuple
 from app.core.body_parts.base import Movement
-from physiotrack_core.angle_computation import calculate_all_angles
+from physiotrack_core.keypoint_set import KeypointSet
+from physiotrack_core.angle_computation import calculate_all_angles, has_keypoints
 from physiotrack_core.rom_calculations import ROMCalculator
 
 class LowerBackFlexion(Movement):
@@ -24,20 +25,21 @@ class LowerBackFlexion(Movement):
     def normal_range(self) -> Tuple[float, float]:
         return (0, 60)
     
-    def calculate_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+    def calculate_angles(self, keypoints: KeypointSet) -> Dict[str, float]:
         """Calculate angles using ROMCalculator"""
         return ROMCalculator.calculate_movement_angles(
             keypoints, "lower_back", "flexion"
         )
     
-    def validate_position(self, keypoints: Dict[str, np.ndarray]) -> Tuple[bool, str]:
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
         """Validate if person is in correct position"""
-        missing = [k for k in self.required_keypoints if k not in keypoints]
-        if missing:
+        required = self.required_keypoints
+        if not has_keypoints(keypoints, required):
+            missing = [k for k in required if k not in keypoints]
             return False, f"Cannot detect: {', '.join(missing)}"
         
         # Check if person is facing camera
-        if all(k in keypoints for k in ["LShoulder", "RShoulder"]):
+        if has_keypoints(keypoints, ["LShoulder", "RShoulder"]):
             shoulder_width = np.linalg.norm(
                 keypoints["LShoulder"] - keypoints["RShoulder"]
             )
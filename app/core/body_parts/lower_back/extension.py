@@ -2,7 +2,8 @@
 import numpy as np
 from typing import Dict, List, Tuple
 from app.core.body_parts.base import Movement
-from physiotrack_core.angle_computation import add_virtual_keypoints
+from physiotrack_core.keypoint_set import KeypointSet
+from physiotrack_core.angle_computation import add_virtual_keypoints, has_keypoints
 from physiotrack_core.rom_calculations import calculate_lower_back_extension as calc_extension
 
 class LowerBackExtension(Movement):
@@ -26,20 +27,21 @@ class LowerBackExtension(Movement):
     def normal_range(self) -> Tuple[float, float]:
         return (-30, 0)  # Normal extension range (negative values)
     
-    def calculate_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+    def calculate_angles(self, keypoints: KeypointSet) -> Dict[str, float]:
         """Calculate trunk and pelvis angles for extension"""
         keypoints = add_virtual_keypoints(keypoints)
         return calc_extension(keypoints)
     
-    def validate_position(self, keypoints: Dict[str, np.ndarray]) -> Tuple[bool, str]:
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
         """Validate position for extension measurement"""
         # Basic validation
-        missing = [k for k in self.required_keypoints if k not in keypoints]
-        if missing:
+        required = self.required_keypoints
+        if not has_keypoints(keypoints, required):
+            missing = [k for k in required if k not in keypoints]
             return False, f"Cannot detect: {', '.join(missing)}"
         
         # Check if person is facing camera
-        if all(k in keypoints for k in ["LShoulder", "RShoulder"]):
+        if has_keypoints(keypoints, ["LShoulder", "RShoulder"]):
             shoulder_width = np.linalg.norm(
                 keypoints["LShoulder"] - keypoints["RShoulder"]
             )
@@ -2,7 +2,8 @@
 import numpy as np
 from typing import Dict, List, Tuple
 from app.core.body_parts.base import Movement
-from physiotrack_core.angle_computation import calculate_angle_between_points, add_virtual_keypoints
+from physiotrack_core.keypoint_set import KeypointSet
+from physiotrack_core.angle_computation import calculate_angle_between_points, add_virtual_keypoints, has_keypoints
 from physiotrack_core.rom_calculations import calculate_lower_back_flexion as calc_flexion
 
 class LowerBackFlexion(Movement):
@@ -28,7 +29,7 @@ class LowerBackFlexion(Movement):
     def normal_range(self) -> Tuple[float, float]:
         return (0, 60)  # Normal flexion range
     
-    def calculate_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+    def calculate_angles(self, keypoints: KeypointSet) -> Dict[str, float]:
         """Calculate trunk and pelvis angles for flexion"""
         # Add virtual keypoints if needed
         keypoints = add_virtual_keypoints(keypoints)
@@ -36,15 +37,16 @@ class LowerBackFlexion(Movement):
         # Use the centralized calculation function
         return calc_flexion(keypoints)
     
-    def validate_position(self, keypoints: Dict[str, np.ndarray]) -> Tuple[bool, str]:
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
         """Validate if person is in correct position for flexion measurement"""
         # Check if all required keypoints are present
-        missing = [k for k in self.required_keypoints if k not in keypoints]
-        if missing:
+        required = self.required_keypoints
+        if not has_keypoints(keypoints, required):
+            missing = [k for k in required if k not in keypoints]
             return False, f"Cannot detect: {', '.join(missing)}"
         
         # Check if person is facing camera (frontal plane)
-        if all(k in keypoints for k in ["LShoulder", "RShoulder"]):
+        if has_keypoints(keypoints, ["LShoulder", "RShoulder"]):
             shoulder_width = np.linalg.norm(
                 keypoints["LShoulder"] - keypoints["RShoulder"]
             )
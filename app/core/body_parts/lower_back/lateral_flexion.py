@@ -2,7 +2,8 @@
 import numpy as np
 from typing import Dict, List, Tuple
 from app.core.body_parts.base import Movement
-from physiotrack_core.angle_computation import add_virtual_keypoints
+from physiotrack_core.keypoint_set import KeypointSet
+from physiotrack_core.angle_computation import add_virtual_keypoints, has_keypoints
 from physiotrack_core.rom_calculations import calculate_lower_back_lateral_flexion as calc_lateral
 
 class LowerBackLateralFlexion(Movement):
@@ -24,20 +25,21 @@ class LowerBackLateralFlexion(Movement):
     def normal_range(self) -> Tuple[float, float]:
         return (-30, 30)  # Negative for left, positive for right
     
-    def calculate_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+    def calculate_angles(self, keypoints: KeypointSet) -> Dict[str, float]:
         """Calculate lateral flexion angle"""
         keypoints = add_virtual_keypoints(keypoints)
         return calc_lateral(keypoints)
     
-    def validate_position(self, keypoints: Dict[str, np.ndarray]) -> Tuple[bool, str]:
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
         """Validate position for lateral flexion"""
         # Check basic requirements
-        missing = [k for k in self.required_keypoints if k not in keypoints]
-        if missing:
+        required = self.required_keypoints
+        if not has_keypoints(keypoints, required):
+            missing = [k for k in required if k not in keypoints]
             return False, f"Cannot detect: {', '.join(missing)}"
         
         # Person should be facing camera
-        if all(k in keypoints for k in ["LShoulder", "RShoulder"]):
+        if has_keypoints(keypoints, ["LShoulder", "RShoulder"]):
             shoulder_width = np.linalg.norm(
                 keypoints["LShoulder"] - keypoints["RShoulder"]
             )
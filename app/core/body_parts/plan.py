@@ -0,0 +1,170 @@
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from app.core.body_parts.base import Movement
+from physiotrack_core.angle_computation import add_virtual_keypoints
+from physiotrack_core.angle_engine import AngleEngine
+from physiotrack_core.keypoint_set import KeypointSet, layout_for_model
+from physiotrack_core.rom_calculations import SIDES, ROMCalculator, validate_angle_range
+
+# Layout the required-keypoint bitmasks are compiled for (the default pose model)
+MASK_LAYOUT = layout_for_model("body_with_feet")
+
+@lru_cache(maxsize=None)
+def bilateral_engine(joint: str) -> AngleEngine:
+    """Angle engine for the left and right angle of a joint (in SIDES order)"""
+    return AngleEngine(angle_names=[f"{side} {joint}" for side in SIDES])
+
+@dataclass(frozen=True)
+class MovementPlan:
+    """
+    Everything per-frame analysis needs about one (body_part, movement_type), compiled once
+
+    Registered movements share one Movement instance (movements are stateless);
+    the others use ROMCalculator's angle function for the movement. Ranges and
+    the primary angle come from ROMCalculator.MOVEMENT_ANGLES as in validate_rom,
+    falling back to the movement's normal range. Limb movements also keep the
+    joint measured on each side and its transform, for bilateral analysis.
+    required_mask is the MASK_LAYOUT bitmask of the required keypoints.
+    """
+    body_part: str
+    movement_type: str
+    primary_angle: str
+    normal_range: Tuple[float, float]
+    max_range: Tuple[float, float]
+    required_keypoints: Tuple[str, ...]
+    required_mask: int
+    calculate: Callable[[KeypointSet], Dict[str, float]]
+    validate: Optional[Callable[[KeypointSet], Tuple[bool, str]]] = None
+    movement: Optional[Movement] = None
+    joint: Optional[str] = None
+    transform: Optional[Callable[[float], float]] = None
+
+    @classmethod
+    def compile(
+        cls,
+        body_part: str,
+        movement_type: str,
+        movement_class: Optional[Type[Movement]] = None
+    ) -> "MovementPlan":
+        """
+        Build the plan of a registered movement class, or of a ROMCalculator movement if None
+
+        Raises:
+            ValueError: if ROMCalculator doesn't know an unregistered movement
+        """
+        config = ROMCalculator.MOVEMENT_ANGLES.get(body_part, {}).get(movement_type)
+        if movement_class is not None:
+            movement = movement_class()
+            normal_range = tuple(config['normal_range']) if config else tuple(movement.normal_range)
+            required = tuple(movement.required_keypoints)
+            plan = cls(
+                body_part=body_part,
+                movement_type=movement_type,
+                primary_angle=movement.primary_angle,
+                normal_range=normal_range,
+                max_range=tuple(config['max_range']) if config else normal_range,
+                required_keypoints=required,
+                required_mask=MASK_LAYOUT.mask(required),
+                calculate=movement.calculate_angles,
+                validate=movement.validate_position,
+                movement=movement
+            )
+        elif config is not None:
+            required = tuple(ROMCalculator.get_movement_requirements(body_part, movement_type))
+            plan = cls(
+                body_part=body_part,
+                movement_type=movement_type,
+                primary_angle=config.get('primary', 'trunk'),
+                normal_range=tuple(config['normal_range']),
+                max_range=tuple(config['max_range']),
+                required_keypoints=required,
+                required_mask=MASK_LAYOUT.mask(required),
+                calculate=config['calculate'],
+                joint=config.get('joint'),
+                transform=config.get('transform')
+            )
+        else:
+            raise ValueError(f"Unknown movement for {body_part}: {movement_type}")
+
+        if plan.joint is not None:
+            bilateral_engine(plan.joint)
+        return plan
+
+    @property
+    def sided(self) -> bool:
+        """Whether the movement is measured on a left and a right side"""
+        return self.joint is not None
+
+    def side_angle(self, side: str) -> str:
+        """Primary angle of one side of a limb movement"""
+        return f"{side} {self.joint}"
+
+    def has_required(self, keypoints: KeypointSet) -> bool:
+        """Whether every required keypoint was detected (one bitmask test for MASK_LAYOUT sets)"""
+        if keypoints.layout is MASK_LAYOUT:
+            return keypoints.has_mask(self.required_mask)
+        return keypoints.has_all(self.required_keypoints)
+
+    def missing_keypoints(self, keypoints: KeypointSet) -> List[str]:
+        """Required keypoints that are neither detected nor computable as virtual points"""
+        if self.has_required(keypoints):
+            return []
+        keypoints = add_virtual_keypoints(keypoints)
+        return [name for name in self.required_keypoints if name not in keypoints]
+
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
+        """Required-keypoint check, then the movement-specific position check (ROMCalculator movements have none)"""
+        if self.validate is None:
+            return True, "Position is correct"
+        missing = self.missing_keypoints(keypoints)
+        if missing:
+            return False, f"Cannot detect: {', '.join(missing)}"
+        return self.validate(keypoints)
+
+    def angles(self, keypoints: KeypointSet) -> Dict[str, float]:
+        """All angles of the movement"""
+        if self.movement is not None:
+            return self.calculate(keypoints)
+        return self.calculate(add_virtual_keypoints(keypoints))
+
+    def bilateral_angles(self, keypoints: KeypointSet) -> Dict[str, Dict[str, float]]:
+        """
+        Angles of both sides of a limb movement, from one vectorized evaluation
+        
+        Each side's dict is what ROMCalculator.calculate_movement_angles returns
+        for that side: its side_angle, or nothing if the side isn't detected.
+        """
+        raw = bilateral_engine(self.joint).evaluate_set(keypoints).tolist()
+        angles = {}
+        for side, value in zip(SIDES, raw):
+            if math.isnan(value):
+                angles[side] = {}
+            else:
+                angles[side] = {self.side_angle(side): self.transform(value) if self.transform else value}
+        return angles
+
+    def validate_rom(self, angle_value: float) -> Dict[str, Any]:
+        """Same result as ROMCalculator.validate_rom without the per-call lookups"""
+        return validate_angle_range(angle_value, self.normal_range, self.max_range)
+
+    def context(self, bilateral: bool = False) -> Dict[str, Any]:
+        """Static fields of the movement's results (sent once to delta streams)"""
+        validation = {
+            "normal_range": list(self.normal_range),
+            "max_range": list(self.max_range)
+        }
+        if bilateral and self.sided:
+            return {
+                "body_part": self.body_part,
+                "movement_type": self.movement_type,
+                "bilateral": True,
+                "sides": {side: {"validation": dict(validation)} for side in SIDES}
+            }
+        return {
+            "body_part": self.body_part,
+            "movement_type": self.movement_type,
+            "validation": validation
+        }
@@ -1,5 +1,7 @@
-from typing import Dict, Type
+from typing import Dict, Optional, Tuple, Type
 from app.core.body_parts.base import Movement
+from app.core.body_parts.plan import MovementPlan
+from physiotrack_core.rom_calculations import ROMCalculator
 
 # Import all movements
 from app.core.body_parts.lower_back.flexion import LowerBackFlexion
@@ -8,16 +10,36 @@ from app.core.body_parts.lower_back.lateral_flexion import LowerBackLateralFlexi
 from app.core.body_parts.lower_back.rotation import LowerBackRotation
 
 class MovementRegistry:
-    """Registry for all body part movements"""
+    """
+    Registry for all body part movements
+    
+    Every registered movement and every ROMCalculator movement is compiled into a
+    MovementPlan up front, so per-frame dispatch is a single get_plan lookup.
+    """
     
     _movements: Dict[str, Dict[str, Type[Movement]]] = {}
+    _plans: Dict[Tuple[str, str], MovementPlan] = {}
     
     @classmethod
     def register(cls, body_part: str, movement_type: str, movement_class: Type[Movement]):
-        """Register a movement class"""
+        """Register a movement class (and compile its plan)"""
         if body_part not in cls._movements:
             cls._movements[body_part] = {}
         cls._movements[body_part][movement_type] = movement_class
+        cls._plans[(body_part, movement_type)] = MovementPlan.compile(body_part, movement_type, movement_class)
+    
+    @classmethod
+    def compile_plans(cls):
+        """Compile plans for the ROMCalculator movements no class is registered for"""
+        for body_part, movements in ROMCalculator.MOVEMENT_ANGLES.items():
+            for movement_type in movements:
+                if (body_part, movement_type) not in cls._plans:
+                    cls._plans[(body_part, movement_type)] = MovementPlan.compile(body_part, movement_type)
+    
+    @classmethod
+    def get_plan(cls, body_part: str, movement_type: str) -> Optional[MovementPlan]:
+        """Compiled plan of a movement, or None if it isn't supported"""
+        return cls._plans.get((body_part, movement_type))
     
     @classmethod
     def get_movement(cls, body_part: str, movement_type: str) -> Type[Movement]:
@@ -46,6 +68,9 @@ MovementRegistry.register("lower_back", "extension", LowerBackExtension)
 MovementRegistry.register("lower_back", "lateral_flexion", LowerBackLateralFlexion)
 MovementRegistry.register("lower_back", "rotation", LowerBackRotation)
 
+# Movements without a registered class use ROMCalculator's calculations
+MovementRegistry.compile_plans()
+
 # Placeholder registrations for other body parts (to be implemented)
 # These will use the default angle calculations from ROMCalculator
 
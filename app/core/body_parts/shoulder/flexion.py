@@ -1,18 +1,27 @@
 import numpy as np
 from typing import Dict, List, Tuple
 from app.core.body_parts.base import Movement
-from physiotrack_core.angle_computation import calculate_angle_between_points, compute_angle, add_virtual_keypoints
+from physiotrack_core.keypoint_set import KeypointSet
+from physiotrack_core.angle_computation import calculate_angle_between_points, compute_angle, add_virtual_keypoints, has_keypoints
 
 class ShoulderFlexion(Movement):
     """Shoulder flexion movement analyzer"""
     
+    def __init__(self, side: str = "right"):
+        """
+        Args:
+            side: Arm to measure ("left" or "right")
+        """
+        self.side = side
+        self._prefix = side[0].upper()
+    
     @property
     def name(self) -> str:
         return "shoulder_flexion"
     
     @property
     def required_keypoints(self) -> List[str]:
-        return ["RShoulder", "RElbow", "Hip", "Neck"]
+        return [f"{self._prefix}Shoulder", f"{self._prefix}Elbow", "Hip", "Neck"]
     
     @property
     def primary_angle(self) -> str:
@@ -22,7 +31,7 @@ class ShoulderFlexion(Movement):
     def normal_range(self) -> Tuple[float, float]:
         return (0, 180)  # Normal flexion range
     
-    def calculate_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+    def calculate_angles(self, keypoints: KeypointSet) -> Dict[str, float]:
         """Calculate shoulder flexion angle"""
         angles = {}
         
@@ -30,17 +39,17 @@ class ShoulderFlexion(Movement):
         keypoints = add_virtual_keypoints(keypoints)
         
         # Check if all required keypoints are present
-        if not all(kp in keypoints for kp in self.required_keypoints):
+        if not has_keypoints(keypoints, self.required_keypoints):
             return angles
         
         # Calculate shoulder angle using method
-        shoulder_angle = compute_angle('right shoulder', keypoints, flip_left_right=False)
+        shoulder_angle = compute_angle(f'{self.side} shoulder', keypoints, flip_left_right=False)
         if not np.isnan(shoulder_angle):
             angles["shoulder"] = shoulder_angle
         
         # Additional angles for context
         # Trunk angle to understand body position
-        if all(k in keypoints for k in ["Neck", "Hip"]):
+        if has_keypoints(keypoints, ["Neck", "Hip"]):
             trunk_angle = calculate_angle_between_points(
                 keypoints["Hip"], 
                 keypoints["Neck"],
@@ -49,14 +58,15 @@ class ShoulderFlexion(Movement):
             angles["trunk"] = trunk_angle
         
         # Elbow angle for arm position
-        if all(k in keypoints for k in ["RShoulder", "RElbow", "RWrist"]):
-            elbow_angle = compute_angle('right elbow', keypoints, flip_left_right=False)
+        p = self._prefix
+        if has_keypoints(keypoints, [f"{p}Shoulder", f"{p}Elbow", f"{p}Wrist"]):
+            elbow_angle = compute_angle(f'{self.side} elbow', keypoints, flip_left_right=False)
             if not np.isnan(elbow_angle):
                 angles["elbow"] = elbow_angle
         
         return angles
     
-    def validate_position(self, keypoints: Dict[str, np.ndarray]) -> Tuple[bool, str]:
+    def validate_position(self, keypoints: KeypointSet) -> Tuple[bool, str]:
         """Validate if person is in correct position for shoulder flexion measurement"""
         # Add virtual keypoints
         keypoints = add_virtual_keypoints(keypoints)
@@ -67,7 +77,7 @@ class ShoulderFlexion(Movement):
             return False, f"Cannot detect: {', '.join(missing)}"
         
         # Check if person is facing camera (side view is better for shoulder flexion)
-        if all(k in keypoints for k in ["LShoulder", "RShoulder"]):
+        if has_keypoints(keypoints, ["LShoulder", "RShoulder"]):
             shoulder_width = np.linalg.norm(
                 keypoints["LShoulder"] - keypoints["RShoulder"]
             )
@@ -76,10 +86,11 @@ class ShoulderFlexion(Movement):
                 return True, "Good position - facing camera. Side view would be better for shoulder flexion."
         
         # Check if arm is visible
-        if "RWrist" in keypoints:
+        p = self._prefix
+        if f"{p}Wrist" in keypoints:
             # Check if wrist is reasonably positioned
             wrist_shoulder_dist = np.linalg.norm(
-                keypoints["RWrist"] - keypoints["RShoulder"]
+                keypoints[f"{p}Wrist"] - keypoints[f"{p}Shoulder"]
             )
             if wrist_shoulder_dist < 30:  # Too close, arm might be hidden
                 return False, "Please extend your arm away from your body"
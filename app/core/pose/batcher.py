@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
+
+import numpy as np
+
+from app.config import settings
+from app.core.pose.executor import InferenceExecutor, get_inference_executor
+
+logger = logging.getLogger(__name__)
+
+class PoseBatcher:
+    """
+    Micro-batching front end for pose detection
+
+    Frames submitted by concurrent sessions are collected for up to window_ms
+    (or until max_batch_size frames are waiting) and run through the detector
+    as one batched call on the inference executor. Each caller gets back the
+    (keypoints, scores) for its own frame. Frames for different pose models
+    are batched separately.
+    """
+
+    def __init__(
+        self,
+        detect_batch: Callable[..., List[Tuple[np.ndarray, np.ndarray]]],
+        executor: InferenceExecutor,
+        max_batch_size: int = 8,
+        window_ms: float = 10.0,
+        stats_window: int = 256
+    ):
+        self.detect_batch = detect_batch
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_ms = window_ms
+
+        self._pending: Dict[Any, List[Tuple[np.ndarray, Optional[List[np.ndarray]], asyncio.Future]]] = {}
+        self._flush_handles: Dict[Any, asyncio.TimerHandle] = {}
+        # Running batches (the event loop only keeps weak references to tasks)
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Statistics
+        self._batches = 0
+        self._frames = 0
+        self._batch_sizes = deque(maxlen=stats_window)
+        self._batch_times = deque(maxlen=stats_window)
+
+    async def detect(
+        self,
+        frame: np.ndarray,
+        bboxes: Optional[List[np.ndarray]] = None,
+        model_key: Optional[Any] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Queue a frame for the next batch and wait for its detections
+
+        Args:
+            frame: Input image (BGR format)
+            bboxes: Optional tracked person boxes; the frame then skips the detector stage
+            model_key: Pose model to use (default model if None)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(model_key, [])
+        pending.append((frame, bboxes, future))
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(model_key)
+        elif model_key not in self._flush_handles:
+            self._flush_handles[model_key] = loop.call_later(
+                self.window_ms / 1000.0, self._flush, model_key
+            )
+
+        return await future
+
+    def _flush(self, model_key: Optional[Any] = None):
+        """Hand all pending frames for a model to the executor as one batch"""
+        handle = self._flush_handles.pop(model_key, None)
+        if handle is not None:
+            handle.cancel()
+
+        batch = self._pending.pop(model_key, [])
+        # Drop callers that gave up while waiting for the window
+        batch = [item for item in batch if not item[2].cancelled()]
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch, model_key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self,
+        batch: List[Tuple[np.ndarray, Optional[List[np.ndarray]], asyncio.Future]],
+        model_key: Optional[Any] = None
+    ):
+        """Run a batch and scatter the per-frame results back to the waiting callers"""
+        frames = [frame for frame, _, _ in batch]
+        bboxes_list = [bboxes for _, bboxes, _ in batch]
+        start_time = time.perf_counter()
+
+        try:
+            results = await self.executor.run(self.detect_batch, frames, bboxes_list, model_key)
+        except Exception as e:
+            logger.error(f"Batched pose detection failed for {len(frames)} frames: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._frames += len(frames)
+        self._batch_sizes.append(len(frames))
+        self._batch_times.append(time.perf_counter() - start_time)
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self, timeout: float = 5.0):
+        """Fail frames still waiting for a window and wait for (or cancel) running batches"""
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
+
+        for pending in self._pending.values():
+            for _, _, future in pending:
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+
+        if self._tasks:
+            tasks = list(self._tasks)
+            _, running = await asyncio.wait(tasks, timeout=timeout)
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        stats = {
+            "max_batch_size": self.max_batch_size,
+            "window_ms": self.window_ms,
+            "pending": sum(len(pending) for pending in self._pending.values()),
+            "batches": self._batches,
+            "frames": self._frames
+        }
+
+        if self._batch_sizes:
+            stats["mean_batch_size"] = round(float(np.mean(self._batch_sizes)), 2)
+            stats["mean_batch_time_ms"] = round(float(np.mean(self._batch_times)) * 1000, 2)
+        else:
+            stats["mean_batch_size"] = 0.0
+            stats["mean_batch_time_ms"] = 0.0
+
+        return stats
+
+
+_batcher: Optional[PoseBatcher] = None
+_batcher_lock = Lock()
+
+def get_pose_batcher() -> Optional[PoseBatcher]:
+    """Get the process-wide pose batcher, or None if batching is disabled"""
+    global _batcher
+    if not settings.POSE_BATCHING_ENABLED:
+        return None
+
+    with _batcher_lock:
+        if _batcher is None:
+            from app.core.pose.processor import PoseProcessor
+
+            _batcher = PoseBatcher(
+                detect_batch=PoseProcessor().detect_batch,
+                executor=get_inference_executor(),
+                max_batch_size=settings.POSE_BATCH_MAX_SIZE,
+                window_ms=settings.POSE_BATCH_WINDOW_MS
+            )
+            logger.info(
+                f"Pose batching enabled (max batch {settings.POSE_BATCH_MAX_SIZE}, "
+                f"window {settings.POSE_BATCH_WINDOW_MS} ms)"
+            )
+        return _batcher
+
+
+async def shutdown_pose_batcher():
+    """Close the process-wide pose batcher if it was started"""
+    global _batcher
+    with _batcher_lock:
+        batcher, _batcher = _batcher, None
+    if batcher is not None:
+        await batcher.close()
@@ -0,0 +1,91 @@
+import importlib.util
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# ONNX Runtime execution provider -> RTMLib device name, in order of preference
+ONNXRUNTIME_DEVICES = [
+    ("CUDAExecutionProvider", "cuda"),
+    ("ROCMExecutionProvider", "rocm"),
+    ("CPUExecutionProvider", "cpu"),
+]
+
+@lru_cache(maxsize=1)
+def onnxruntime_providers() -> List[str]:
+    """Execution providers of the installed ONNX Runtime build (empty if not installed)"""
+    try:
+        import onnxruntime
+    except ImportError:
+        return []
+    return list(onnxruntime.get_available_providers())
+
+@lru_cache(maxsize=1)
+def openvino_available() -> bool:
+    """Check if OpenVINO is installed without importing it"""
+    return importlib.util.find_spec("openvino") is not None
+
+@lru_cache(maxsize=1)
+def openvino_devices() -> List[str]:
+    """OpenVINO devices (e.g. CPU, GPU, NPU) visible to the runtime"""
+    if not openvino_available():
+        return []
+    try:
+        from openvino import Core
+        return list(Core().available_devices)
+    except Exception as e:
+        logger.warning(f"Could not query OpenVINO devices: {e}")
+        return []
+
+def resolve_backend(backend: str) -> str:
+    """Resolve BACKEND="auto" to onnxruntime, then openvino, then opencv"""
+    if backend != "auto":
+        return backend
+    if onnxruntime_providers():
+        return "onnxruntime"
+    if openvino_available():
+        return "openvino"
+    return "opencv"
+
+def resolve_device(device: str, backend: str) -> str:
+    """
+    Resolve DEVICE="auto" to the best device the backend can use
+
+    Args:
+        device: Configured device ("auto", "cpu", "cuda", ...)
+        backend: Resolved inference backend
+
+    Returns:
+        RTMLib device name
+    """
+    if device != "auto":
+        return device
+
+    if backend == "onnxruntime":
+        providers = onnxruntime_providers()
+        for provider, name in ONNXRUNTIME_DEVICES:
+            if provider in providers:
+                return name
+    elif backend == "openvino":
+        # Keep the CPU plugin unless a GPU is present; NPUs need explicit opt-in
+        return "gpu" if "GPU" in openvino_devices() else "cpu"
+
+    return "cpu"
+
+def get_device_info(device: str, backend: str, profile: str = "") -> Dict[str, Any]:
+    """Describe the configured and resolved inference device"""
+    if profile:
+        from physiotrack_core.inference_profiles import get_profile
+        resolved_backend = get_profile(profile).backend
+    else:
+        resolved_backend = resolve_backend(backend)
+    return {
+        "profile": profile or None,
+        "configured_device": device,
+        "configured_backend": backend,
+        "device": resolve_device(device, resolved_backend),
+        "backend": resolved_backend,
+        "onnxruntime_providers": onnxruntime_providers(),
+        "openvino_available": openvino_available()
+    }
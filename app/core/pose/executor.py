@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.utils.exceptions import InferenceQueueFullError
+
+logger = logging.getLogger(__name__)
+
+class InferenceExecutor:
+    """Bounded thread pool that runs frame decoding and pose inference off the event loop"""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue_size: int = 16,
+        stats_window: int = 256,
+        ewma_alpha: float = 0.2
+    ):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="inference"
+        )
+        self._lock = Lock()
+
+        # Queue accounting
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+        # Recent wait times (seconds spent queued before a worker picked the job up)
+        self._wait_times = deque(maxlen=stats_window)
+        # Exponentially smoothed wait time, the load signal for QoS
+        self._ewma_alpha = ewma_alpha
+        self._wait_ewma = 0.0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking function on the inference pool
+
+        Raises:
+            InferenceQueueFullError: if the number of queued jobs has reached max_queue_size
+        """
+        with self._lock:
+            if self._queued >= self.max_queue_size:
+                self._rejected += 1
+                raise InferenceQueueFullError(
+                    f"Inference queue is full ({self._queued} frames waiting)"
+                )
+            self._queued += 1
+
+        submitted_at = time.perf_counter()
+        try:
+            future = self._pool.submit(self._call, submitted_at, func, args, kwargs)
+        except RuntimeError:
+            # Pool has been shut down
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._on_done)
+
+        return await asyncio.wrap_future(future)
+
+    def _call(self, submitted_at: float, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Worker-side wrapper that records queue wait time"""
+        wait_time = time.perf_counter() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_times.append(wait_time)
+            self._wait_ewma += self._ewma_alpha * (wait_time - self._wait_ewma)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, future: Future):
+        """Update counters once a job has finished or was cancelled before starting"""
+        with self._lock:
+            if future.cancelled():
+                # Never reached _call, so it is still counted as queued
+                self._queued -= 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queued
+
+    @property
+    def wait_time_ewma_ms(self) -> float:
+        """Smoothed time recent jobs spent queued, in milliseconds"""
+        return self._wait_ewma * 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and wait time statistics"""
+        with self._lock:
+            wait_times_ms = np.array(self._wait_times, dtype=np.float64) * 1000
+            stats = {
+                "workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "wait_time_ewma_ms": round(self._wait_ewma * 1000, 2)
+            }
+
+        if len(wait_times_ms) > 0:
+            stats["wait_time_ms"] = {
+                "last": round(float(wait_times_ms[-1]), 2),
+                "mean": round(float(np.mean(wait_times_ms)), 2),
+                "p95": round(float(np.percentile(wait_times_ms, 95)), 2),
+                "max": round(float(np.max(wait_times_ms)), 2)
+            }
+        else:
+            stats["wait_time_ms"] = {"last": 0.0, "mean": 0.0, "p95": 0.0, "max": 0.0}
+
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and release worker threads"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor: Optional[InferenceExecutor] = None
+_executor_lock = Lock()
+
+def get_inference_executor() -> InferenceExecutor:
+    """Get the process-wide inference executor, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from app.core.pose.worker_pool import resolve_process_count
+            
+            # With worker processes the threads mostly wait on results, so keep
+            # enough of them to fill every shared-memory slot
+            max_workers = max(
+                settings.INFERENCE_WORKERS,
+                resolve_process_count() * settings.INFERENCE_PROCESS_SLOTS
+            )
+            _executor = InferenceExecutor(
+                max_workers=max_workers,
+                max_queue_size=settings.INFERENCE_QUEUE_SIZE
+            )
+            logger.info(
+                f"Inference executor started with {max_workers} workers "
+                f"(queue size {settings.INFERENCE_QUEUE_SIZE})"
+            )
+        return _executor
+
+def shutdown_inference_executor():
+    """Shut down the process-wide inference executor if it was started"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
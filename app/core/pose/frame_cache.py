@@ -0,0 +1,102 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from physiotrack_core.keypoint_set import KeypointSet
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+FRAME_HASH = "xxh3_128" if xxhash is not None else "blake2b"
+
+class CachedPose(NamedTuple):
+    """Pose estimate of one frame, in original frame coordinates"""
+    keypoints: np.ndarray  # (n_persons, n_keypoints, 2) detector output
+    scores: np.ndarray  # (n_persons, n_keypoints)
+    keypoint_set: KeypointSet  # First person, confidence-filtered
+    confidence: float
+
+def frame_digest(data: Union[bytes, bytearray, memoryview, str]) -> bytes:
+    """128-bit content hash of an encoded frame (xxh3 if xxhash is installed, else blake2b)"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class PoseResultCache:
+    """
+    Pose estimates of recently seen frames with LRU and age eviction
+
+    Keys combine the content hash of the encoded frame with everything else
+    that changes the estimate (model, inference size, reduced decode size), so
+    a hit is only served for a byte-identical frame analyzed the same way.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[Hashable, tuple[float, CachedPose]]" = OrderedDict()
+        self._lock = Lock()
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expired = 0
+
+    def get(self, key: Hashable) -> Optional[CachedPose]:
+        """Cached pose for a key, or None (counts a hit or a miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self._expired += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, pose: CachedPose):
+        """Store a pose estimate, evicting the least recently used beyond max_entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), pose)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """Drop all cached estimates (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hash": FRAME_HASH,
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expired": self._expired
+            }
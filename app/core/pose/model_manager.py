@@ -1,13 +1,21 @@
 import logging
-from typing import Optional
+import time
+from typing import Optional, Dict, List, Tuple, Any
 from threading import Lock
 
+import cv2
+import numpy as np
+
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 class ModelManager:
     """Singleton manager for pose detection model"""
     
     _initialized: bool = False
+    _warmed_up: bool = False
+    _warmup_stats: Dict[str, Any] = {}
     _lock = Lock()
     
     @classmethod
@@ -33,7 +41,121 @@ class ModelManager:
                     logger.error(f"Failed to initialize pose model: {e}")
                     raise
     
+    @classmethod
+    async def warmup(cls):
+        """
+        Run synthetic frames through the full analysis path before taking traffic
+        
+        The first inferences pay for ONNX Runtime graph optimization, memory arena
+        growth and thread-pool spin-up. Each configured resolution is JPEG encoded
+        and sent through FrameAnalyzer.analyze (decode, detector, pose model, angle
+        and ROM code); the pose model is also run on a full-frame box, since a
+        synthetic frame usually yields no person for it to estimate.
+        """
+        if not settings.WARMUP_ENABLED:
+            cls._warmed_up = True
+            return
+        
+        from app.core.pose.processor import PoseProcessor
+        from app.core.pose.executor import get_inference_executor
+        from app.services.frame_analyzer import FrameAnalyzer
+        from app.services.image_processor import ImageProcessor
+        from app.services.session_manager import SessionManager
+        from app.storage.memory import InMemoryStorage
+        
+        # Private session store so warm-up sessions never show up in the API
+        analyzer = FrameAnalyzer(SessionManager(InMemoryStorage()))
+        processor = PoseProcessor()
+        executor = get_inference_executor()
+        resolutions = parse_resolutions(settings.WARMUP_RESOLUTIONS)
+        # Models QoS switches to under load are loaded now rather than during a load spike
+        degraded_modes = sorted(
+            {level.pose_mode for level in analyzer.qos.levels if level.pose_mode}
+        ) if analyzer.qos is not None else []
+        
+        start_time = time.perf_counter()
+        first_frame_ms = None
+        warm_latencies_ms: List[float] = []
+        
+        try:
+            for width, height in resolutions:
+                session_id = f"warmup_{width}x{height}"
+                
+                for i in range(max(1, settings.WARMUP_FRAMES)):
+                    # A different frame each time so the pose cache can't answer it
+                    frame = synthetic_frame(width, height, seed=i)
+                    frame_base64 = ImageProcessor.encode_base64(frame)
+                    frame_start = time.perf_counter()
+                    await analyzer.analyze(frame_base64, session_id, "lower_back", "flexion")
+                    latency_ms = (time.perf_counter() - frame_start) * 1000
+                    
+                    if first_frame_ms is None:
+                        first_frame_ms = latency_ms
+                    elif i > 0:
+                        # The first frame of each resolution is still cold for that shape
+                        warm_latencies_ms.append(latency_ms)
+                    
+                    # Batched pose-only path (tracked boxes), outside the timed analyze latency
+                    await executor.run(
+                        processor.detect_batch, [frame], [[np.array([0, 0, width, height], dtype=np.float32)]]
+                    )
+                
+                for pose_mode in degraded_modes:
+                    await analyzer.analyze(
+                        frame_base64, session_id, "lower_back", "flexion", pose_mode=pose_mode
+                    )
+                
+                analyzer.release_session(session_id)
+            
+            cls._warmup_stats = {
+                "resolutions": [f"{width}x{height}" for width, height in resolutions],
+                "frames": len(resolutions) * max(1, settings.WARMUP_FRAMES),
+                "first_frame_ms": round(first_frame_ms or 0.0, 2),
+                "duration_s": round(time.perf_counter() - start_time, 2)
+            }
+            if warm_latencies_ms:
+                cls._warmup_stats["warm_latency_ms"] = {
+                    "p50": round(float(np.percentile(warm_latencies_ms, 50)), 2),
+                    "p95": round(float(np.percentile(warm_latencies_ms, 95)), 2),
+                    "max": round(float(np.max(warm_latencies_ms)), 2)
+                }
+            logger.info(f"Model warm-up complete: {cls._warmup_stats}")
+        except Exception as e:
+            # A failed warm-up only means colder first frames - don't keep the worker out of rotation
+            logger.error(f"Model warm-up failed: {e}")
+            cls._warmup_stats = {"error": str(e)}
+        
+        cls._warmed_up = True
+    
     @classmethod
     def is_initialized(cls) -> bool:
         """Check if model is initialized"""
-        return cls._initialized
\ No newline at end of file
+        return cls._initialized
+    
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Check if model is initialized and warmed up"""
+        return cls._initialized and cls._warmed_up
+    
+    @classmethod
+    def get_warmup_stats(cls) -> Dict[str, Any]:
+        """Get warm-up timings (empty until warm-up has finished)"""
+        return cls._warmup_stats
+
+
+def parse_resolutions(value: str) -> List[Tuple[int, int]]:
+    """Parse "640x480,1280x720" into [(640, 480), (1280, 720)]"""
+    resolutions = []
+    for item in value.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        width, height = item.split("x")
+        resolutions.append((int(width), int(height)))
+    return resolutions
+
+def synthetic_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """Textured BGR frame so JPEG decode and the detector do representative work"""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (9, 9), 0)
@@ -0,0 +1,216 @@
+import gc
+import logging
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from app.config import settings
+from app.core.pose.device import resolve_backend, resolve_device
+from physiotrack_core.inference_profiles import get_profile
+from physiotrack_core.pose_detection import PoseDetector
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_MODELS = ("body_with_feet", "body", "whole_body")
+SUPPORTED_MODES = ("lightweight", "balanced", "performance")
+SUPPORTED_BACKENDS = ("onnxruntime", "openvino", "opencv")
+
+class ModelKey(NamedTuple):
+    """Identifies one loaded pose pipeline"""
+    model: str
+    mode: str
+    backend: str
+
+    def __str__(self) -> str:
+        return f"{self.model}:{self.mode}:{self.backend}"
+
+def make_model_key(
+    default: ModelKey,
+    model: Optional[str] = None,
+    mode: Optional[str] = None,
+    backend: Optional[str] = None
+) -> ModelKey:
+    """
+    Build a model key from per-request choices, falling back to the defaults
+
+    Raises:
+        ValueError: if a model, mode or backend is not supported
+    """
+    key = ModelKey(
+        model=(model or default.model).lower(),
+        mode=(mode or default.mode).lower(),
+        backend=(backend or default.backend).lower()
+    )
+    if key.model not in SUPPORTED_MODELS:
+        raise ValueError(f"Unsupported pose model: {key.model} (available: {', '.join(SUPPORTED_MODELS)})")
+    if key.mode not in SUPPORTED_MODES:
+        raise ValueError(f"Unsupported pose mode: {key.mode} (available: {', '.join(SUPPORTED_MODES)})")
+    if key.backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unsupported backend: {key.backend} (available: {', '.join(SUPPORTED_BACKENDS)})")
+    return key
+
+def default_model_key() -> ModelKey:
+    """Model served when a request doesn't choose one (POSE_MODEL, POSE_MODE, BACKEND/profile)"""
+    if settings.INFERENCE_PROFILE:
+        backend = get_profile(settings.INFERENCE_PROFILE).backend
+    else:
+        backend = resolve_backend(settings.BACKEND)
+    return ModelKey(settings.POSE_MODEL.lower(), settings.POSE_MODE.lower(), backend)
+
+def load_detector(key: ModelKey, intra_op_threads: Optional[int] = None) -> PoseDetector:
+    """Construct a PoseDetector for a key using the configured device and profile"""
+    # The profile only applies to models running on its backend
+    profile = settings.INFERENCE_PROFILE or None
+    if profile and get_profile(profile).backend != key.backend:
+        profile = None
+
+    return PoseDetector(
+        model=key.model,
+        mode=key.mode,
+        device=resolve_device(settings.DEVICE, key.backend),
+        backend=key.backend,
+        profile=profile,
+        intra_op_threads=intra_op_threads,
+        int8_model_dir=settings.INT8_MODEL_DIR
+    )
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process (Linux only)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):
+        return None
+
+def model_file_mb(detector: Any) -> float:
+    """Size of the ONNX files behind a detector's models"""
+    total = 0
+    for tool in (detector.tracker.det_model, detector.tracker.pose_model):
+        path = getattr(tool, "onnx_model", None)
+        if path and os.path.exists(path):
+            total += os.path.getsize(path)
+    return total / 1e6
+
+
+class PoseModelRegistry:
+    """
+    Loaded pose detectors keyed by (model, mode, backend)
+
+    Detectors are loaded on first use and the least recently used ones are
+    unloaded once more than max_loaded are resident. The default model is
+    pinned and never unloaded.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[ModelKey], Any],
+        default_key: ModelKey,
+        max_loaded: int = 2
+    ):
+        self.loader = loader
+        self.default_key = default_key
+        self.max_loaded = max(1, max_loaded)
+
+        self._detectors: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._info: Dict[ModelKey, Dict[str, Any]] = {}
+        self._lock = Lock()
+        # One lock per key so a slow load doesn't block requests for other models
+        self._load_locks: Dict[ModelKey, Lock] = {}
+        self._unloads = 0
+
+    def get(self, key: Optional[ModelKey] = None) -> Any:
+        """Get the detector for a key, loading it if needed"""
+        key = key or self.default_key
+
+        with self._lock:
+            detector = self._detectors.get(key)
+            if detector is not None:
+                self._detectors.move_to_end(key)
+                self._info[key]["uses"] += 1
+                self._info[key]["last_used"] = time.time()
+                return detector
+            load_lock = self._load_locks.setdefault(key, Lock())
+
+        with load_lock:
+            # Another thread may have loaded it while we waited
+            with self._lock:
+                if key in self._detectors:
+                    self._detectors.move_to_end(key)
+                    self._info[key]["uses"] += 1
+                    return self._detectors[key]
+
+            rss_before = current_rss_mb()
+            start_time = time.perf_counter()
+            detector = self.loader(key)
+            load_time = time.perf_counter() - start_time
+            rss_after = current_rss_mb()
+
+            with self._lock:
+                self._detectors[key] = detector
+                self._info[key] = {
+                    "loaded_at": time.time(),
+                    "last_used": time.time(),
+                    "uses": 1,
+                    "load_time_s": round(load_time, 2),
+                    "file_mb": round(model_file_mb(detector), 1),
+                    "rss_delta_mb": (
+                        round(rss_after - rss_before, 1)
+                        if rss_before is not None and rss_after is not None else None
+                    )
+                }
+                self._evict()
+
+            logger.info(f"Loaded pose model {key} in {load_time:.2f}s")
+            return detector
+
+    def _evict(self):
+        """Unload least recently used detectors beyond max_loaded (lock must be held)"""
+        evicted = False
+        for key in list(self._detectors):
+            if len(self._detectors) <= self.max_loaded:
+                break
+            if key == self.default_key:
+                continue
+            del self._detectors[key]
+            del self._info[key]
+            self._unloads += 1
+            evicted = True
+            logger.info(f"Unloaded pose model {key} (LRU)")
+
+        if evicted:
+            # Release ONNX Runtime sessions now rather than at the next GC cycle
+            gc.collect()
+
+    def unload(self, key: ModelKey) -> bool:
+        """Unload a detector explicitly (the default model cannot be unloaded)"""
+        if key == self.default_key:
+            return False
+        with self._lock:
+            if self._detectors.pop(key, None) is None:
+                return False
+            del self._info[key]
+            self._unloads += 1
+        gc.collect()
+        return True
+
+    def is_loaded(self, key: Optional[ModelKey] = None) -> bool:
+        """Check if a detector is resident"""
+        return (key or self.default_key) in self._detectors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Loaded models with memory accounting"""
+        with self._lock:
+            models = {
+                str(key): {**info, "default": key == self.default_key}
+                for key, info in self._info.items()
+            }
+        return {
+            "max_loaded": self.max_loaded,
+            "loaded": len(models),
+            "unloads": self._unloads,
+            "process_rss_mb": round(current_rss_mb() or 0.0, 1),
+            "models": models
+        }
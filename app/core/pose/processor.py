@@ -1,7 +1,16 @@
 import numpy as np
-from typing import Dict, Tuple, Optional, List
-from physiotrack_core.pose_detection import PoseDetector
+from typing import Any, Dict, Tuple, Optional, List
+from physiotrack_core.keypoint_set import KeypointSet, layout_for_model
+from physiotrack_core.pose_detection import model_input_sizes
+from app.core.pose.tracking import PoseTrackingRegistry, SessionPoseTrack
+from app.core.pose.frame_cache import CachedPose, PoseResultCache, frame_digest
+from app.core.pose.qos import downscale
+from app.core.pose.worker_pool import InferenceWorkerPool, resolve_process_count
+from app.core.pose.model_registry import (
+    ModelKey, PoseModelRegistry, default_model_key, load_detector, make_model_key
+)
 from app.config import settings
+from app.utils.exceptions import InferenceQueueFullError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,47 +19,306 @@ class PoseProcessor:
     """Process frames for pose detection with singleton pattern"""
     
     _instance = None
-    _detector = None
+    _registry = None
+    _worker_pool = None
+    _default_key = None
+    _tracking = None
+    _frame_cache = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             try:
-                cls._detector = PoseDetector(
-                    model=settings.POSE_MODEL,
-                    mode=settings.POSE_MODE,
-                    device=settings.DEVICE,
-                    backend=settings.BACKEND
+                cls._default_key = default_model_key()
+                num_processes = resolve_process_count()
+                if num_processes > 0:
+                    # Worker processes own the models; tracking stays in this process
+                    cls._worker_pool = InferenceWorkerPool(
+                        num_workers=num_processes,
+                        default_key=cls._default_key,
+                        max_loaded_models=settings.POSE_MAX_LOADED_MODELS,
+                        intra_op_threads=settings.INFERENCE_PROCESS_THREADS,
+                        slots_per_worker=settings.INFERENCE_PROCESS_SLOTS,
+                        max_frame_pixels=settings.INFERENCE_PROCESS_MAX_FRAME_PIXELS,
+                        timeout=settings.INFERENCE_PROCESS_TIMEOUT
+                    )
+                    cls._worker_pool.start()
+                else:
+                    cls._registry = PoseModelRegistry(
+                        loader=load_detector,
+                        default_key=cls._default_key,
+                        max_loaded=settings.POSE_MAX_LOADED_MODELS
+                    )
+                    # Load the default model now; others load on first request
+                    cls._registry.get()
+                cls._tracking = PoseTrackingRegistry(
+                    det_frequency=settings.POSE_DET_FREQUENCY,
+                    min_confidence=settings.POSE_TRACKING_MIN_CONFIDENCE,
+                    keypoint_threshold=settings.CONFIDENCE_THRESHOLD,
+                    max_sessions=settings.POSE_TRACKING_MAX_SESSIONS,
+                    ttl=settings.POSE_TRACKING_TTL
                 )
-                logger.info(f"PoseProcessor initialized with {settings.POSE_MODEL} model")
+                if settings.POSE_CACHE_MAX_ENTRIES > 0:
+                    cls._frame_cache = PoseResultCache(
+                        max_entries=settings.POSE_CACHE_MAX_ENTRIES,
+                        ttl=settings.POSE_CACHE_TTL
+                    )
+                logger.info(f"PoseProcessor initialized with default model {cls._default_key}")
             except Exception as e:
                 logger.error(f"Failed to initialize PoseDetector: {e}")
+                cls._instance = None
                 raise
         return cls._instance
     
-    def process_frame(self, frame: np.ndarray) -> Tuple[Dict[str, np.ndarray], float]:
+    def model_key(
+        self,
+        model: Optional[str] = None,
+        mode: Optional[str] = None,
+        backend: Optional[str] = None
+    ) -> ModelKey:
+        """
+        Resolve a per-request model choice (unset parts use the defaults)
+        
+        Raises:
+            ValueError: if the model, mode or backend is not supported
+        """
+        return make_model_key(self._default_key, model, mode, backend)
+    
+    def decode_min_side(self, model_key: Optional[ModelKey] = None) -> int:
+        """Long side a frame can be reduced to when decoding without dropping below the model input size"""
+        if settings.DECODE_MIN_SIDE > 0:
+            return settings.DECODE_MIN_SIDE
+        key = model_key or self._default_key
+        det_input_size, pose_input_size = model_input_sizes(key.model, key.mode)
+        return max(*det_input_size, *pose_input_size)
+    
+    def empty_keypoints(self, model_key: Optional[ModelKey] = None) -> KeypointSet:
+        """Keypoint set with no valid points in the layout of a model (default model if None)"""
+        return KeypointSet.empty(layout_for_model((model_key or self._default_key).model))
+    
+    def detect(
+        self,
+        frame: np.ndarray,
+        bboxes: Optional[List[np.ndarray]] = None,
+        model_key: Optional[ModelKey] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Run raw pose detection with the selected model"""
+        if self._worker_pool is not None:
+            return self._worker_pool.detect(frame, bboxes, model_key)
+        return self._registry.get(model_key).detect(frame, bboxes=bboxes)
+    
+    def process_frame(
+        self,
+        frame: np.ndarray,
+        session_id: Optional[str] = None,
+        model_key: Optional[ModelKey] = None,
+        max_side: Optional[int] = None,
+        det_frequency: Optional[int] = None,
+        input_scale: float = 1.0,
+        cache_key: Optional[Tuple] = None
+    ) -> Tuple[KeypointSet, float]:
         """
         Process a single frame and return keypoints
         
         Args:
             frame: Input image as numpy array (BGR format)
+            session_id: Stream the frame belongs to; enables per-session detector skipping
+            model_key: Pose model to use (default model if None)
+            max_side: Run inference on a frame downscaled to this long side (QoS);
+                keypoints are still returned in original frame coordinates
+            det_frequency: Run the person detector at most every N frames of the session (QoS)
+            input_scale: Scale the frame was already decoded at relative to the original image
+            cache_key: Store the estimate under this frame_cache_key
             
         Returns:
-            Tuple of (keypoints_dict, confidence_score)
+            Tuple of (keypoint_set, confidence_score)
         """
-        if self._detector is None:
+        if not self.is_initialized:
             logger.error("PoseDetector not initialized")
-            return {}, 0.0
+            return self.empty_keypoints(model_key), 0.0
+        
+        track = self.get_track(session_id, det_frequency)
+        frame, scale = downscale(frame, max_side)
+        scale *= input_scale
         
         # Detect pose
         try:
-            keypoints, scores = self._detector.detect(frame)
+            bbox_hint = track.bbox_hint(det_frequency) if track is not None else None
+            keypoints, scores = self.detect(frame, scale_boxes(bbox_hint, scale), model_key)
+            detected = bbox_hint is None
+            
+            if not detected and not track.is_confident(scores):
+                # Confidence dropped inside the reused box - rerun the detector on this frame
+                keypoints, scores = self.detect(frame, None, model_key)
+                detected = True
+        except InferenceQueueFullError:
+            # Overload is reported to the caller, not as a frame without a person
+            raise
         except Exception as e:
             logger.error(f"Pose detection failed: {e}")
-            return {}, 0.0
+            return self.empty_keypoints(model_key), 0.0
+        
+        # Tracking and angles work in original frame coordinates
+        if scale != 1.0 and len(keypoints) > 0:
+            keypoints = keypoints / scale
         
+        if track is not None:
+            self.update_track(track, keypoints, scores, detected)
+        
+        return self.extract_keypoints(keypoints, scores, model_key, cache_key)
+    
+    def frame_cache_key(
+        self,
+        frame: Any,
+        model_key: Optional[ModelKey] = None,
+        max_side: Optional[int] = None,
+        min_side: Optional[int] = None
+    ) -> Optional[Tuple]:
+        """
+        Cache key of an encoded frame (bytes or base64), or None if it can't be cached
+        
+        Decoded ndarrays are not cached: hashing every pixel of frames that are
+        rarely repeated (video) costs more than it saves.
+        """
+        if self._frame_cache is None or isinstance(frame, np.ndarray):
+            return None
+        return (frame_digest(frame), model_key or self._default_key, max_side, min_side)
+    
+    def cached_pose(self, cache_key: Optional[Tuple]) -> Optional[Tuple[KeypointSet, float]]:
+        """
+        Keypoints and confidence of an already analyzed byte-identical frame, or None
+        
+        A hit skips decoding and inference; the session's tracking state is left as is.
+        The cached KeypointSet is immutable and returned without copying.
+        """
+        if cache_key is None:
+            return None
+        pose = self._frame_cache.get(cache_key)
+        if pose is None:
+            return None
+        return pose.keypoint_set, pose.confidence
+    
+    def get_cache_stats(self) -> Optional[Dict]:
+        """Get frame cache hit rates, or None when the cache is disabled"""
+        return self._frame_cache.get_stats() if self._frame_cache is not None else None
+    
+    def get_track(
+        self,
+        session_id: Optional[str],
+        det_frequency: Optional[int] = None
+    ) -> Optional[SessionPoseTrack]:
+        """
+        Get the tracking state for a session, or None if tracking is disabled
+        
+        A det_frequency above 1 (QoS detector skipping) tracks the session even
+        when POSE_DET_FREQUENCY runs the detector on every frame.
+        """
+        if session_id is None or self._tracking is None:
+            return None
+        if not self._tracking.enabled and (det_frequency or 1) <= 1:
+            return None
+        return self._tracking.get(session_id)
+    
+    def update_track(
+        self,
+        track: SessionPoseTrack,
+        keypoints: np.ndarray,
+        scores: np.ndarray,
+        detected: bool
+    ):
+        """Feed a pose estimate back into a session's tracking state"""
+        track.update(keypoints, scores, detected)
+        self._tracking.record(detected)
+    
+    def release_track(self, session_id: str):
+        """Drop the tracking state of a finished session"""
+        if self._tracking is not None:
+            self._tracking.remove(session_id)
+    
+    def get_tracking_stats(self) -> Dict:
+        """Get detector skipping statistics"""
+        return self._tracking.get_stats() if self._tracking is not None else {}
+    
+    def get_worker_pool_stats(self) -> Optional[Dict]:
+        """Get worker process statistics, or None when inference runs in-process"""
+        if self._worker_pool is not None:
+            return self._worker_pool.get_stats()
+        return None
+    
+    def get_model_stats(self) -> Dict:
+        """Get loaded models with memory accounting"""
+        if self._worker_pool is not None:
+            return {
+                "default": str(self._default_key),
+                "workers": self._worker_pool.get_stats()["worker_models"]
+            }
+        return {"default": str(self._default_key), **self._registry.get_stats()}
+    
+    @classmethod
+    def shutdown(cls):
+        """Stop inference worker processes if they were started"""
+        if cls._worker_pool is not None:
+            cls._worker_pool.shutdown()
+    
+    def detect_batch(
+        self,
+        frames: List[np.ndarray],
+        bboxes_list: Optional[List[Optional[List[np.ndarray]]]] = None,
+        model_key: Optional[ModelKey] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Run raw pose detection on several frames in one batched detector call
+        
+        Args:
+            frames: Input images as numpy arrays (BGR format)
+            bboxes_list: Optional per-frame person boxes from session tracking
+            model_key: Pose model to use (default model if None)
+            
+        Returns:
+            List of (keypoints, scores) arrays per frame, to be passed to extract_keypoints
+        """
+        if not self.is_initialized:
+            logger.error("PoseDetector not initialized")
+            return [(np.array([]), np.array([])) for _ in frames]
+        
+        if self._worker_pool is not None:
+            return self._worker_pool.detect_batch(frames, bboxes_list, model_key)
+        return self._registry.get(model_key).detect_batch(frames, bboxes_list)
+    
+    def extract_keypoints(
+        self,
+        keypoints: np.ndarray,
+        scores: np.ndarray,
+        model_key: Optional[ModelKey] = None,
+        cache_key: Optional[Tuple] = None
+    ) -> Tuple[KeypointSet, float]:
+        """
+        Select the first detected person and convert to a confidence-filtered KeypointSet
+        
+        Args:
+            keypoints: Detector output of shape (n_persons, n_keypoints, 2)
+            scores: Detector output of shape (n_persons, n_keypoints)
+            model_key: Model that produced the keypoints (decides keypoint names)
+            cache_key: Store the estimate under this frame_cache_key
+            
+        Returns:
+            Tuple of (keypoint_set, confidence_score)
+        """
+        keypoint_set, confidence = self._extract_keypoints(keypoints, scores, model_key)
+        if cache_key is not None:
+            self._frame_cache.put(cache_key, CachedPose(keypoints, scores, keypoint_set, confidence))
+        return keypoint_set, confidence
+    
+    def _extract_keypoints(
+        self,
+        keypoints: np.ndarray,
+        scores: np.ndarray,
+        model_key: Optional[ModelKey] = None
+    ) -> Tuple[KeypointSet, float]:
+        """First person's confidence-filtered keypoints and mean confidence"""
+        layout = layout_for_model((model_key or self._default_key).model)
         if len(keypoints) == 0:
-            return {}, 0.0
+            return KeypointSet.empty(layout), 0.0
         
         # Take first person detected
         person_keypoints = keypoints[0]
@@ -62,11 +330,11 @@ class PoseProcessor:
         # Check if enough keypoints are detected
         valid_ratio = np.sum(valid_mask) / len(person_scores)
         if valid_ratio < settings.MIN_KEYPOINTS_RATIO:
-            return {}, valid_ratio
+            return KeypointSet.empty(layout), valid_ratio
         
-        # Convert to dictionary
-        keypoint_dict = self._detector.keypoints_to_dict(
-            person_keypoints, 
+        keypoint_set = KeypointSet.from_arrays(
+            layout,
+            person_keypoints,
             person_scores,
             confidence_threshold=settings.CONFIDENCE_THRESHOLD
         )
@@ -74,18 +342,18 @@ class PoseProcessor:
         # Calculate average confidence
         avg_confidence = np.mean(person_scores[valid_mask]) if np.sum(valid_mask) > 0 else 0.0
         
-        return keypoint_dict, float(avg_confidence)
+        return keypoint_set, float(avg_confidence)
     
     def validate_keypoints_for_movement(
         self, 
-        keypoints: Dict[str, np.ndarray], 
+        keypoints: KeypointSet, 
         required_keypoints: List[str]
     ) -> Tuple[bool, str]:
         """
         Validate if all required keypoints are present for a movement
         
         Args:
-            keypoints: Dictionary of detected keypoints
+            keypoints: Detected keypoints
             required_keypoints: List of required keypoint names
             
         Returns:
@@ -101,4 +369,13 @@ class PoseProcessor:
     @property
     def is_initialized(self) -> bool:
         """Check if pose processor is properly initialized"""
-        return self._detector is not None and self._detector.is_initialized
\ No newline at end of file
+        if self._worker_pool is not None:
+            return self._worker_pool.is_initialized
+        return self._registry is not None and self._registry.is_loaded()
+
+
+def scale_boxes(bboxes: Optional[List[np.ndarray]], scale: float) -> Optional[List[np.ndarray]]:
+    """Map person boxes into a resized frame"""
+    if bboxes is None or scale == 1.0:
+        return bboxes
+    return [np.asarray(bbox) * scale for bbox in bboxes]
@@ -0,0 +1,246 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Degradation steps a QoS policy can be built from
+QOS_STEPS = ("resolution", "model", "detector", "fps")
+
+@dataclass(frozen=True)
+class QoSLevel:
+    """Fidelity settings applied to a frame at one QoS level (None = not degraded)"""
+    level: int = 0
+    steps: Tuple[str, ...] = ()
+    max_side: Optional[int] = None
+    pose_mode: Optional[str] = None
+    det_frequency: Optional[int] = None
+    max_fps: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return "+".join(self.steps) if self.steps else "full"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Description reported in frame_metrics
+
+        Steps the level doesn't degrade are left out rather than sent as null,
+        so results stay valid JSON Merge Patch targets (see result_delta).
+        """
+        description = {"level": self.level, "name": self.name}
+        for key in ("max_side", "pose_mode", "det_frequency", "max_fps"):
+            value = getattr(self, key)
+            if value is not None:
+                description[key] = value
+        return description
+
+FULL_QUALITY = QoSLevel()
+
+def build_levels(
+    policy: str,
+    max_side: int = 480,
+    pose_mode: str = "lightweight",
+    det_frequency: int = 15,
+    max_fps: float = 5.0
+) -> List[QoSLevel]:
+    """
+    Build QoS levels from a policy such as "detector,resolution,model,fps"
+
+    Level 0 is full quality; every following level adds the next step of the
+    policy on top of the previous ones.
+
+    Raises:
+        ValueError: if the policy names an unknown step
+    """
+    steps = [step.strip().lower() for step in policy.split(",") if step.strip()]
+    unknown = [step for step in steps if step not in QOS_STEPS]
+    if unknown:
+        raise ValueError(f"Unknown QoS steps: {', '.join(unknown)} (available: {', '.join(QOS_STEPS)})")
+
+    levels = [FULL_QUALITY]
+    for step in steps:
+        previous = levels[-1]
+        levels.append(QoSLevel(
+            level=previous.level + 1,
+            steps=previous.steps + (step,),
+            max_side=max_side if step == "resolution" else previous.max_side,
+            pose_mode=pose_mode if step == "model" else previous.pose_mode,
+            det_frequency=det_frequency if step == "detector" else previous.det_frequency,
+            max_fps=max_fps if step == "fps" else previous.max_fps
+        ))
+    return levels
+
+def downscale(frame: np.ndarray, max_side: Optional[int]) -> Tuple[np.ndarray, float]:
+    """
+    Shrink a frame so its long side is at most max_side
+
+    Returns:
+        Tuple of (frame, scale); divide keypoints by scale to map them back
+    """
+    long_side = max(frame.shape[:2])
+    if not max_side or long_side <= max_side:
+        return frame, 1.0
+    scale = max_side / long_side
+    frame = cv2.resize(
+        frame,
+        (max(1, int(frame.shape[1] * scale)), max(1, int(frame.shape[0] * scale))),
+        interpolation=cv2.INTER_AREA
+    )
+    return frame, scale
+
+
+class QoSController:
+    """
+    Steps analysis fidelity down while inference falls behind and back up once it recovers
+
+    The load signal is the smoothed time frames spend queued for an inference
+    worker. Above degrade_ms the controller moves one level down, below
+    recover_ms one level up; it waits hold_s between changes so a single slow
+    frame doesn't make the level oscillate.
+    """
+
+    def __init__(
+        self,
+        levels: List[QoSLevel],
+        latency_source: Callable[[], float],
+        degrade_ms: float = 100.0,
+        recover_ms: float = 20.0,
+        hold_s: float = 2.0,
+        max_sessions: int = 1024
+    ):
+        self.levels = levels
+        self.latency_source = latency_source
+        self.degrade_ms = degrade_ms
+        self.recover_ms = recover_ms
+        self.hold_s = hold_s
+        self.max_sessions = max_sessions
+
+        self._index = 0
+        self._last_change = time.monotonic()
+        self._lock = Lock()
+
+        # session_id -> (time of the last analyzed frame, its request signature, its response) for the fps step
+        self._sessions: "OrderedDict[str, Tuple[float, Hashable, Dict]]" = OrderedDict()
+
+        # Statistics
+        self._level_changes = 0
+        self._time_at_level = [0.0] * len(levels)
+        self._skipped_frames = 0
+
+    def current_level(self) -> QoSLevel:
+        """Re-evaluate the load and get the level to apply to the next frame"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_change >= self.hold_s:
+                latency_ms = self.latency_source()
+                if latency_ms > self.degrade_ms and self._index < len(self.levels) - 1:
+                    self._change_level(self._index + 1, now, latency_ms)
+                elif latency_ms < self.recover_ms and self._index > 0:
+                    self._change_level(self._index - 1, now, latency_ms)
+            return self.levels[self._index]
+
+    def _change_level(self, index: int, now: float, latency_ms: float):
+        """Switch to another level (lock must be held)"""
+        self._time_at_level[self._index] += now - self._last_change
+        logger.info(
+            f"QoS level {self.levels[self._index].name} -> {self.levels[index].name} "
+            f"(queue wait {latency_ms:.1f} ms)"
+        )
+        self._index = index
+        self._last_change = now
+        self._level_changes += 1
+
+    def throttled_response(self, session_id: str, level: QoSLevel, signature: Hashable = None) -> Optional[Dict]:
+        """
+        Get the session's last response if this frame exceeds the level's frame rate
+
+        Args:
+            session_id: Session the frame belongs to
+            level: Level applied to the frame
+            signature: What the frame asks for (e.g. movements and options); a response
+                is only replayed for a frame with the same signature
+
+        Returns:
+            The previous response to reuse, or None if the frame should be analyzed
+        """
+        if level.max_fps is None:
+            return None
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry[1] != signature or time.monotonic() - entry[0] >= 1.0 / level.max_fps:
+                return None
+            self._skipped_frames += 1
+            return entry[2]
+
+    def record_response(self, session_id: str, response: Dict, signature: Hashable = None):
+        """Remember an analyzed frame's response (and what it was asked for) for frame rate limiting"""
+        with self._lock:
+            self._sessions[session_id] = (time.monotonic(), signature, response)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def release_session(self, session_id: str):
+        """Forget a finished session"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current level and time spent at each level"""
+        now = time.monotonic()
+        with self._lock:
+            time_at_level = list(self._time_at_level)
+            time_at_level[self._index] += now - self._last_change
+            return {
+                "level": self.levels[self._index].as_dict(),
+                "levels": [level.name for level in self.levels],
+                "degrade_wait_ms": self.degrade_ms,
+                "recover_wait_ms": self.recover_ms,
+                "queue_wait_ms": round(self.latency_source(), 2),
+                "level_changes": self._level_changes,
+                "time_at_level_s": {
+                    level.name: round(seconds, 1) for level, seconds in zip(self.levels, time_at_level)
+                },
+                "skipped_frames": self._skipped_frames
+            }
+
+
+_controller: Optional[QoSController] = None
+_controller_lock = Lock()
+
+def get_qos_controller() -> Optional[QoSController]:
+    """Get the process-wide QoS controller, or None if QoS is disabled"""
+    global _controller
+    if not settings.QOS_ENABLED:
+        return None
+
+    with _controller_lock:
+        if _controller is None:
+            from app.core.pose.executor import get_inference_executor
+
+            executor = get_inference_executor()
+            levels = build_levels(
+                settings.QOS_POLICY,
+                max_side=settings.QOS_MAX_SIDE,
+                pose_mode=settings.QOS_POSE_MODE,
+                det_frequency=settings.QOS_DET_FREQUENCY,
+                max_fps=settings.QOS_MAX_FPS
+            )
+            _controller = QoSController(
+                levels=levels,
+                latency_source=lambda: executor.wait_time_ewma_ms,
+                degrade_ms=settings.QOS_DEGRADE_WAIT_MS,
+                recover_ms=settings.QOS_RECOVER_WAIT_MS,
+                hold_s=settings.QOS_HOLD_S
+            )
+            logger.info(f"QoS enabled with levels: {', '.join(level.name for level in levels)}")
+        return _controller
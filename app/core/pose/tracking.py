@@ -0,0 +1,157 @@
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from physiotrack_core.pose_detection import PoseDetector
+
+logger = logging.getLogger(__name__)
+
+class SessionPoseTrack:
+    """
+    Temporal tracking state for one session's stream
+
+    Keeps the person box derived from the previous frame's keypoints so the
+    next pose estimate can reuse it as its crop, and decides when the full
+    person detector has to run again.
+    """
+
+    def __init__(self, det_frequency: int, min_confidence: float, keypoint_threshold: float):
+        self.det_frequency = max(1, det_frequency)
+        self.min_confidence = min_confidence
+        self.keypoint_threshold = keypoint_threshold
+
+        self.bbox: Optional[np.ndarray] = None
+        self.frames_since_detection = 0
+        self.last_used = time.monotonic()
+        self._lock = Lock()
+
+    def bbox_hint(self, det_frequency: Optional[int] = None) -> Optional[List[np.ndarray]]:
+        """
+        Boxes to estimate the next frame in, or None if the detector must run
+
+        Args:
+            det_frequency: Temporarily skip the detector more often (QoS under load)
+
+        Returns:
+            [bbox] when the previous box can be reused, otherwise None
+        """
+        frequency = max(self.det_frequency, det_frequency or 1)
+        with self._lock:
+            self.last_used = time.monotonic()
+            if self.bbox is None or self.frames_since_detection >= frequency:
+                return None
+            return [self.bbox]
+
+    def is_confident(self, scores: np.ndarray) -> bool:
+        """Check if a pose estimate is good enough to keep tracking from"""
+        return len(scores) > 0 and float(np.mean(scores[0])) >= self.min_confidence
+
+    def update(self, keypoints: np.ndarray, scores: np.ndarray, detected: bool):
+        """
+        Update the tracked box from a new pose estimate
+
+        Args:
+            keypoints: Detector output of shape (n_persons, n_keypoints, 2)
+            scores: Detector output of shape (n_persons, n_keypoints)
+            detected: True if the person detector ran for this frame
+        """
+        with self._lock:
+            self.frames_since_detection = 1 if detected else self.frames_since_detection + 1
+
+            if not self.is_confident(scores):
+                # Lost the person - force a full detection on the next frame
+                self.bbox = None
+                return
+
+            self.bbox = PoseDetector.bbox_from_keypoints(
+                keypoints[0], scores[0], confidence_threshold=self.keypoint_threshold
+            )
+
+    def reset(self):
+        """Forget the tracked box"""
+        with self._lock:
+            self.bbox = None
+            self.frames_since_detection = 0
+
+
+class PoseTrackingRegistry:
+    """Per-session pose tracking states with LRU and idle-time eviction"""
+
+    def __init__(
+        self,
+        det_frequency: int = 1,
+        min_confidence: float = 0.5,
+        keypoint_threshold: float = 0.3,
+        max_sessions: int = 1024,
+        ttl: float = 300
+    ):
+        self.det_frequency = det_frequency
+        self.min_confidence = min_confidence
+        self.keypoint_threshold = keypoint_threshold
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+
+        self._tracks: "OrderedDict[str, SessionPoseTrack]" = OrderedDict()
+        self._lock = Lock()
+
+        # Statistics
+        self._detector_runs = 0
+        self._tracked_frames = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Tracking only matters if the detector is allowed to skip frames"""
+        return self.det_frequency > 1
+
+    def get(self, session_id: str) -> SessionPoseTrack:
+        """Get or create the tracking state for a session"""
+        with self._lock:
+            track = self._tracks.get(session_id)
+            if track is None:
+                track = SessionPoseTrack(
+                    self.det_frequency, self.min_confidence, self.keypoint_threshold
+                )
+                self._tracks[session_id] = track
+                self._evict()
+            else:
+                self._tracks.move_to_end(session_id)
+            return track
+
+    def remove(self, session_id: str):
+        """Drop the tracking state for a session"""
+        with self._lock:
+            self._tracks.pop(session_id, None)
+
+    def record(self, detected: bool):
+        """Count a processed frame for the statistics"""
+        with self._lock:
+            if detected:
+                self._detector_runs += 1
+            else:
+                self._tracked_frames += 1
+
+    def _evict(self):
+        """Remove idle sessions and keep at most max_sessions (lock must be held)"""
+        now = time.monotonic()
+        expired = [sid for sid, track in self._tracks.items() if now - track.last_used > self.ttl]
+        for session_id in expired:
+            del self._tracks[session_id]
+
+        while len(self._tracks) > self.max_sessions:
+            self._tracks.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracking statistics"""
+        with self._lock:
+            total = self._detector_runs + self._tracked_frames
+            return {
+                "det_frequency": self.det_frequency,
+                "active_sessions": len(self._tracks),
+                "detector_runs": self._detector_runs,
+                "tracked_frames": self._tracked_frames,
+                "detector_skip_ratio": round(self._tracked_frames / total, 3) if total else 0.0
+            }
@@ -0,0 +1,477 @@
+import atexit
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.config import settings
+from app.core.pose.model_registry import ModelKey, PoseModelRegistry, load_detector
+from app.utils.exceptions import InferenceQueueFullError
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on persons returned per frame through the result slots
+MAX_PERSONS = 8
+# Generous upper bound on keypoints per person (HALPE_26 needs 26)
+MAX_KEYPOINTS = 133
+# How often the result thread checks for worker processes that died
+WORKER_CHECK_INTERVAL_S = 0.5
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects container/affinity limits)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def autosize_workers(threads_per_worker: int, cpus: Optional[int] = None) -> int:
+    """
+    Worker-count autosizing policy
+
+    Leaves one core for the API process (event loop, decode, JSON) and gives
+    each worker process threads_per_worker ONNX Runtime intra-op threads.
+    """
+    cpus = cpus if cpus is not None else available_cpus()
+    threads_per_worker = max(1, threads_per_worker)
+    return max(1, (cpus - 1) // threads_per_worker)
+
+def resolve_process_count() -> int:
+    """Number of inference worker processes from INFERENCE_PROCESSES (0 = in-process)"""
+    if settings.INFERENCE_PROCESSES < 0:
+        return autosize_workers(settings.INFERENCE_PROCESS_THREADS)
+    return settings.INFERENCE_PROCESSES
+
+def _worker_main(
+    worker_id: int,
+    frame_slot_names: List[str],
+    result_slot_names: List[str],
+    requests: mp.Queue,
+    results: mp.Queue,
+    default_key: ModelKey,
+    max_loaded_models: int,
+    intra_op_threads: Optional[int]
+):
+    """Inference worker process: owns a model registry and serves frames from shared memory"""
+    frame_slots = [shared_memory.SharedMemory(name=name) for name in frame_slot_names]
+    result_slots = [shared_memory.SharedMemory(name=name) for name in result_slot_names]
+
+    registry = PoseModelRegistry(
+        loader=partial(load_detector, intra_op_threads=intra_op_threads),
+        default_key=default_key,
+        max_loaded=max_loaded_models
+    )
+    try:
+        registry.get()
+    except Exception as e:
+        results.put(("failed", worker_id, str(e)))
+        return
+
+    results.put(("ready", worker_id, registry.get_stats()))
+
+    while True:
+        item = requests.get()
+        if item is None:
+            break
+
+        request_id, slot, shape, bboxes, model_key = item
+        try:
+            model_key = ModelKey(*model_key) if model_key is not None else None
+            newly_loaded = not registry.is_loaded(model_key)
+            detector = registry.get(model_key)
+            if newly_loaded:
+                results.put(("models", worker_id, registry.get_stats()))
+
+            # View the frame in place - no copy, no pickling
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=frame_slots[slot].buf)
+            keypoints, scores = detector.detect(frame, bboxes=bboxes)
+
+            n_persons = min(len(keypoints), MAX_PERSONS)
+            n_keypoints = keypoints.shape[1] if n_persons else 0
+            if n_persons:
+                out = np.ndarray(
+                    (n_persons, n_keypoints, 3), dtype=np.float32, buffer=result_slots[slot].buf
+                )
+                out[..., :2] = keypoints[:n_persons]
+                out[..., 2] = scores[:n_persons]
+            results.put(("result", request_id, slot, n_persons, n_keypoints, None))
+        except Exception as e:
+            results.put(("result", request_id, slot, 0, 0, str(e)))
+
+    for shm in frame_slots + result_slots:
+        shm.close()
+
+
+class InferenceWorkerPool:
+    """
+    Pool of inference worker processes, each owning its own pose model registry
+
+    Decoded frames are copied into shared-memory ring slots and keypoints come
+    back through per-slot result buffers, so no image is ever pickled. The pool
+    offers the same detect/detect_batch interface as PoseDetector and can stand
+    in for the in-process models inside PoseProcessor.
+
+    Each worker has its own request queue, so the pool knows which frames (and
+    slots) a worker holds: if the process dies, those frames fail, their slots
+    are freed and a replacement worker is started.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        default_key: ModelKey,
+        max_loaded_models: int = 2,
+        intra_op_threads: Optional[int] = None,
+        slots_per_worker: int = 2,
+        max_frame_pixels: int = 1920 * 1080,
+        timeout: float = 30.0
+    ):
+        self.num_workers = num_workers
+        self.default_key = default_key
+        self.max_loaded_models = max_loaded_models
+        self.intra_op_threads = intra_op_threads
+        self.num_slots = num_workers * slots_per_worker
+        self.max_frame_pixels = max_frame_pixels
+        self.frame_slot_bytes = max_frame_pixels * 3
+        self.timeout = timeout
+        self._worker_models: Dict[int, Dict[str, Any]] = {}
+
+        self._frame_slots: List[shared_memory.SharedMemory] = []
+        self._result_slots: List[shared_memory.SharedMemory] = []
+        self._free_slots: "queue.Queue[int]" = queue.Queue()
+        # request_id -> (future, slot, worker_id) for frames queued on or being processed by a worker
+        self._pending: Dict[int, Tuple[Future, int, int]] = {}
+        # request_id -> (slot, worker_id) for frames whose caller timed out; the slot
+        # stays taken until the worker is done with the frame
+        self._abandoned: Dict[int, Tuple[int, int]] = {}
+        # Frames queued on or being processed by each worker
+        self._outstanding: List[int] = [0] * num_workers
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self._processes: List[mp.Process] = []
+        self._requests: List[mp.Queue] = []
+        self._respawns = 0
+        self._result_thread: Optional[threading.Thread] = None
+        self._started = False
+
+    def start(self, startup_timeout: float = 300.0):
+        """Allocate shared memory, spawn the workers and wait for their models to load"""
+        result_slot_bytes = MAX_PERSONS * MAX_KEYPOINTS * 3 * np.dtype(np.float32).itemsize
+        for slot in range(self.num_slots):
+            self._frame_slots.append(
+                shared_memory.SharedMemory(create=True, size=self.frame_slot_bytes)
+            )
+            self._result_slots.append(
+                shared_memory.SharedMemory(create=True, size=result_slot_bytes)
+            )
+            self._free_slots.put(slot)
+        atexit.register(self.shutdown)
+
+        # Spawn so workers never inherit ONNX Runtime threads or sessions from the parent
+        self._ctx = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+
+        for worker_id in range(self.num_workers):
+            process, requests = self._spawn_worker(worker_id)
+            self._processes.append(process)
+            self._requests.append(requests)
+
+        # Handshake: every worker reports once its default model is loaded
+        for _ in range(self.num_workers):
+            message = self._results.get(timeout=startup_timeout)
+            if message[0] == "failed":
+                self.shutdown()
+                raise RuntimeError(f"Inference worker {message[1]} failed to start: {message[2]}")
+            self._worker_models[message[1]] = message[2]
+
+        self._result_thread = threading.Thread(
+            target=self._collect_results, name="inference-results", daemon=True
+        )
+        self._result_thread.start()
+        self._started = True
+        logger.info(
+            f"Inference worker pool started: {self.num_workers} processes, "
+            f"{self.num_slots} shared-memory slots of {self.frame_slot_bytes / 1e6:.1f} MB"
+        )
+
+    def _spawn_worker(self, worker_id: int) -> Tuple[mp.Process, mp.Queue]:
+        """Start one worker process with its own request queue"""
+        requests = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                [shm.name for shm in self._frame_slots],
+                [shm.name for shm in self._result_slots],
+                requests,
+                self._results,
+                self.default_key,
+                self.max_loaded_models,
+                self.intra_op_threads
+            ),
+            name=f"inference-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        return process, requests
+
+    def _collect_results(self):
+        """Read keypoints back from result slots, resolve the waiting futures and replace dead workers"""
+        last_check = time.monotonic()
+        while True:
+            try:
+                message = self._results.get(timeout=WORKER_CHECK_INTERVAL_S)
+            except queue.Empty:
+                message = ()
+            if message is None:
+                break
+            if message:
+                self._handle_message(message)
+            if time.monotonic() - last_check >= WORKER_CHECK_INTERVAL_S:
+                self._check_workers()
+                last_check = time.monotonic()
+
+    def _handle_message(self, message: Tuple):
+        """Process one message from a worker"""
+        if message[0] in ("ready", "models"):
+            # A worker (re)started, or loaded or unloaded models - keep its memory accounting
+            self._worker_models[message[1]] = message[2]
+            return
+        if message[0] == "failed":
+            # A replacement worker could not load its model; its frames fail once it has exited
+            logger.error(f"Inference worker {message[1]} failed to restart: {message[2]}")
+            return
+
+        _, request_id, slot, n_persons, n_keypoints, error = message
+        with self._pending_lock:
+            entry = self._pending.pop(request_id, None)
+            if entry is not None:
+                worker_id = entry[2]
+            elif request_id in self._abandoned:
+                worker_id = self._abandoned.pop(request_id)[1]
+            else:
+                # Already failed (and its slot freed) when its worker was found dead
+                return
+            self._outstanding[worker_id] -= 1
+
+        if n_persons and entry is not None:
+            out = np.ndarray(
+                (n_persons, n_keypoints, 3), dtype=np.float32, buffer=self._result_slots[slot].buf
+            )
+            keypoints = out[..., :2].astype(np.float64)
+            scores = out[..., 2].astype(np.float64)
+        else:
+            keypoints, scores = np.array([]), np.array([])
+
+        # The slot is reusable once its result has been copied out
+        self._free_slots.put(slot)
+
+        if entry is None:
+            return
+        future = entry[0]
+        if error is not None:
+            future.set_exception(RuntimeError(error))
+        else:
+            future.set_result((keypoints, scores))
+
+    def _check_workers(self):
+        """Fail the frames of every worker that died, free their slots and start a replacement"""
+        for worker_id, process in enumerate(self._processes):
+            if process.is_alive() or not self._started:
+                continue
+
+            with self._pending_lock:
+                lost = [
+                    (request_id, entry[0], entry[1])
+                    for request_id, entry in self._pending.items() if entry[2] == worker_id
+                ]
+                lost += [
+                    (request_id, None, slot)
+                    for request_id, (slot, owner) in self._abandoned.items() if owner == worker_id
+                ]
+                for request_id, _, _ in lost:
+                    self._pending.pop(request_id, None)
+                    self._abandoned.pop(request_id, None)
+                self._outstanding[worker_id] = 0
+
+            error = RuntimeError(f"Inference worker {worker_id} died (exit code {process.exitcode})")
+            for _, future, slot in lost:
+                if future is not None:
+                    future.set_exception(error)
+                self._free_slots.put(slot)
+
+            logger.error(f"{error}, failed {len(lost)} frames, starting a replacement")
+            self._requests[worker_id].close()
+            self._processes[worker_id], self._requests[worker_id] = self._spawn_worker(worker_id)
+            self._respawns += 1
+
+    def _abandon(self, request_id: int):
+        """Forget the caller of a timed-out frame; its slot is freed once the worker is done with it"""
+        with self._pending_lock:
+            entry = self._pending.pop(request_id, None)
+            if entry is not None:
+                self._abandoned[request_id] = (entry[1], entry[2])
+
+    def submit(
+        self,
+        frame: np.ndarray,
+        bboxes: Optional[List[np.ndarray]] = None,
+        model_key: Optional[ModelKey] = None
+    ) -> Future:
+        """Copy a frame into a free slot and queue it for the workers"""
+        return self._submit(frame, bboxes, model_key)[1]
+
+    def _submit(
+        self,
+        frame: np.ndarray,
+        bboxes: Optional[List[np.ndarray]] = None,
+        model_key: Optional[ModelKey] = None
+    ) -> Tuple[int, Future]:
+        """Queue a frame on the least busy worker and get its request id with the future for its detections"""
+        if not self._started:
+            raise RuntimeError("Inference worker pool is not running")
+
+        # Frames larger than a slot are downscaled and the keypoints scaled back
+        scale = 1.0
+        if frame.shape[0] * frame.shape[1] > self.max_frame_pixels:
+            scale = float(np.sqrt(self.max_frame_pixels / (frame.shape[0] * frame.shape[1])))
+            frame = cv2.resize(
+                frame,
+                (int(frame.shape[1] * scale), int(frame.shape[0] * scale)),
+                interpolation=cv2.INTER_AREA
+            )
+            if bboxes is not None:
+                bboxes = [np.asarray(bbox) * scale for bbox in bboxes]
+
+        try:
+            slot = self._free_slots.get(timeout=self.timeout)
+        except queue.Empty:
+            raise InferenceQueueFullError(
+                f"No free inference slot within {self.timeout:.0f} s ({self.num_slots} slots busy)"
+            )
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._frame_slots[slot].buf)
+        np.copyto(view, frame)
+
+        request_id = next(self._request_ids)
+        future: Future = Future()
+        with self._pending_lock:
+            worker_id = min(range(self.num_workers), key=self._outstanding.__getitem__)
+            self._outstanding[worker_id] += 1
+            self._pending[request_id] = (future, slot, worker_id)
+            requests = self._requests[worker_id]
+
+        bbox_lists = [list(map(float, bbox)) for bbox in bboxes] if bboxes is not None else None
+        requests.put((
+            request_id, slot, frame.shape, bbox_lists,
+            tuple(model_key) if model_key is not None else None
+        ))
+
+        if scale == 1.0:
+            return request_id, future
+
+        scaled: Future = Future()
+
+        def _rescale(done: Future):
+            if done.exception() is not None:
+                scaled.set_exception(done.exception())
+                return
+            keypoints, scores = done.result()
+            scaled.set_result((keypoints / scale if len(keypoints) else keypoints, scores))
+
+        future.add_done_callback(_rescale)
+        return request_id, scaled
+
+    def _wait(self, request_id: int, future: Future) -> Tuple[np.ndarray, np.ndarray]:
+        """Wait for a frame's detections, abandoning it on timeout"""
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._abandon(request_id)
+            raise
+
+    def detect(
+        self,
+        frame: np.ndarray,
+        bboxes: Optional[List[np.ndarray]] = None,
+        model_key: Optional[ModelKey] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Detect poses in a frame on a worker process (blocks the calling thread)"""
+        return self._wait(*self._submit(frame, bboxes, model_key))
+
+    def detect_batch(
+        self,
+        frames: List[np.ndarray],
+        bboxes_list: Optional[List[Optional[List[np.ndarray]]]] = None,
+        model_key: Optional[ModelKey] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Spread several frames over the worker processes and wait for all of them"""
+        if bboxes_list is None:
+            bboxes_list = [None] * len(frames)
+
+        requests = [
+            self._submit(frame, bboxes, model_key) for frame, bboxes in zip(frames, bboxes_list)
+        ]
+        results = []
+        for index, (request_id, future) in enumerate(requests):
+            try:
+                results.append(self._wait(request_id, future))
+            except FutureTimeoutError:
+                for later_id, _ in requests[index + 1:]:
+                    self._abandon(later_id)
+                raise
+        return results
+
+    @property
+    def is_initialized(self) -> bool:
+        """Check if the pool is running with all workers alive"""
+        return self._started and all(process.is_alive() for process in self._processes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker pool statistics"""
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {
+            "workers": self.num_workers,
+            "alive_workers": sum(process.is_alive() for process in self._processes),
+            "slots": self.num_slots,
+            "free_slots": self._free_slots.qsize(),
+            "pending": pending,
+            "respawns": self._respawns,
+            "slot_mb": round(self.frame_slot_bytes / 1e6, 1),
+            "worker_models": dict(self._worker_models)
+        }
+
+    def shutdown(self):
+        """Stop the workers and release shared memory"""
+        if not self._frame_slots:
+            return
+
+        # Stops the result thread from replacing workers that exit below
+        self._started = False
+        if self._processes:
+            for requests in self._requests:
+                requests.put(None)
+            for process in self._processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            self._results.put(None)
+            self._processes = []
+            self._requests = []
+
+        for shm in self._frame_slots + self._result_slots:
+            shm.close()
+            shm.unlink()
+        self._frame_slots = []
+        self._result_slots = []
+        self._started = False
+        logger.info("Inference worker pool stopped")
@@ -5,10 +5,12 @@ from collections import deque
 class ROMTracker:
     """Track ROM data for a session"""
     
-    def __init__(self, body_part: str, movement_type: str, window_size: int = 5):
+    def __init__(self, body_part: str, movement_type: str, window_size: int = 5, side: Optional[str] = None):
         self.body_part = body_part
         self.movement_type = movement_type
         self.window_size = window_size
+        # One of a bilateral pair ("left"/"right"), None for single-side tracking
+        self.side = side
         
         # ROM tracking
         self.min_angle: Optional[float] = None
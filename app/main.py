@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 from app.api.v1.api import api_router
 from app.config import settings
@@ -18,10 +19,13 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting ROM Analysis API...")
     
+    from app.core.pose.model_manager import ModelManager
+    warmup_task = None
     try:
-        from app.core.pose.model_manager import ModelManager
         ModelManager.initialize()
         logger.info("✓ Model manager initialized successfully")
+        # Warm up in the background; /health/ready reports not_ready until it finishes
+        warmup_task = asyncio.create_task(ModelManager.warmup())
     except Exception as e:
         logger.error(f"✗ Failed to initialize model manager: {e}")
         # Don't fail startup, let the health check report the issue
@@ -30,6 +34,19 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down ROM Analysis API...")
+    
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    
+    # Batches still in flight need the executor, so they finish first
+    from app.core.pose.batcher import shutdown_pose_batcher
+    await shutdown_pose_batcher()
+    
+    from app.core.pose.executor import shutdown_inference_executor
+    shutdown_inference_executor()
+    
+    from app.core.pose.processor import PoseProcessor
+    PoseProcessor.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
@@ -1,9 +1,28 @@
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
+class MovementSelection(BaseModel):
+    body_part: str = Field(..., description="Body part to analyze")
+    movement_type: str = Field(..., description="Type of movement")
+
 class FrameAnalysisRequest(BaseModel):
     frame_base64: str = Field(..., description="Base64 encoded image")
     session_id: str = Field(..., description="Unique session identifier")
-    body_part: str = Field(..., description="Body part to analyze")
-    movement_type: str = Field(..., description="Type of movement")
+    body_part: Optional[str] = Field(None, description="Body part to analyze (or use movements)")
+    movement_type: Optional[str] = Field(None, description="Type of movement (or use movements)")
+    movements: Optional[List[MovementSelection]] = Field(None, description="Several movements analyzed on one pose detection; returns a combined result")
+    include_keypoints: bool = Field(False, description="Include keypoints in response")
+    bilateral: bool = Field(False, description="Measure limb movements on both sides, with a symmetry index")
+    include_visualization: bool = Field(False, description="Include visual feedback")
+    pose_model: Optional[str] = Field(None, description="Pose model (body_with_feet, body, whole_body); server default if omitted")
+    pose_mode: Optional[str] = Field(None, description="Model size (lightweight, balanced, performance); server default if omitted")
+
+class KeypointAnalysisRequest(BaseModel):
+    keypoints: List[List[float]] = Field(..., description="HALPE_26 keypoints as 26 [x, y] pixel pairs, in model output order")
+    scores: List[float] = Field(..., description="Confidence score of each keypoint (26 values)")
+    session_id: str = Field(..., description="Unique session identifier")
+    body_part: Optional[str] = Field(None, description="Body part to analyze (or use movements)")
+    movement_type: Optional[str] = Field(None, description="Type of movement (or use movements)")
+    movements: Optional[List[MovementSelection]] = Field(None, description="Several movements analyzed on the same keypoints; returns a combined result")
     include_keypoints: bool = Field(False, description="Include keypoints in response")
-    include_visualization: bool = Field(False, description="Include visual feedback")
\ No newline at end of file
+    bilateral: bool = Field(False, description="Measure limb movements on both sides, with a symmetry index")
\ No newline at end of file
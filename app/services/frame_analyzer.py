@@ -2,22 +2,61 @@ import base64
 import cv2
 import numpy as np
 import uuid
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Sequence, Tuple, Union
 from datetime import datetime
 import logging
 import time
 
-from app.core.pose.processor import PoseProcessor
+from app.core.pose.processor import PoseProcessor, scale_boxes
+from app.core.pose.executor import get_inference_executor
+from app.core.pose.batcher import get_pose_batcher
+from app.core.pose.model_registry import ModelKey
+from app.core.pose.qos import FULL_QUALITY, QoSLevel, downscale, get_qos_controller
+from app.core.body_parts.plan import MovementPlan
 from app.core.body_parts.registry import MovementRegistry
 from app.core.rom.tracker import ROMTracker
 from app.services.session_manager import SessionManager
 from app.services.image_processor import ImageProcessor
 from app.models.responses import AnalysisResponse, ROMData
-from app.utils.exceptions import AnalysisError
-from physiotrack_core.rom_calculations import ROMCalculator
+from app.utils.exceptions import AnalysisError, InferenceQueueFullError, InvalidFrameError
+from app.utils.frame_protocol import is_raw_frame, parse_raw_frame
+from app.config import settings
+from physiotrack_core.keypoint_set import KeypointSet
+from physiotrack_core.pose_detection import keypoint_names_for
+from physiotrack_core.rom_calculations import ROMCalculator, symmetry_index
 
 logger = logging.getLogger(__name__)
 
+# Keypoint pairs drawn by frontends (sent with results that include keypoints)
+SKELETON_CONNECTIONS = [
+    ["LShoulder", "RShoulder"],
+    ["LShoulder", "LElbow"],
+    ["LElbow", "LWrist"],
+    ["RShoulder", "RElbow"],
+    ["RElbow", "RWrist"],
+    ["LShoulder", "LHip"],
+    ["RShoulder", "RHip"],
+    ["LHip", "RHip"],
+    ["LHip", "LKnee"],
+    ["LKnee", "LAnkle"],
+    ["RHip", "RKnee"],
+    ["RKnee", "RAnkle"],
+    ["Neck", "Hip"],
+    ["Neck", "Head"],
+    ["LAnkle", "LBigToe"],
+    ["RAnkle", "RBigToe"]
+]
+
+# Fields of a movement's result that a combined result holds once for the frame
+FRAME_FIELDS = ("timestamp", "frame_id", "pose_confidence", "frame_metrics", "keypoints", "skeleton_connections")
+
+def movement_key(body_part: str, movement_type: str) -> str:
+    """Key of a movement in combined results (as in the session's tracker keys)"""
+    return f"{body_part}:{movement_type}"
+
+# A decoded BGR image, encoded image bytes (JPEG/PNG), a raw pixel frame or a base64 string
+FrameInput = Union[np.ndarray, bytes, bytearray, memoryview, str]
+
 class FrameAnalyzer:
     """Main service for analyzing frames - returns only JSON data"""
     
@@ -25,6 +64,9 @@ class FrameAnalyzer:
         self.pose_processor = PoseProcessor()
         self.session_manager = session_manager
         self.image_processor = ImageProcessor()
+        self.executor = get_inference_executor()
+        self.batcher = get_pose_batcher()
+        self.qos = get_qos_controller()
         
         # Check if pose processor is initialized
         if not self.pose_processor.is_initialized:
@@ -37,77 +79,324 @@ class FrameAnalyzer:
         body_part: str,
         movement_type: str,
         include_keypoints: bool = False,
-        include_visualization: bool = False  # Ignored - no visualization
+        include_visualization: bool = False,  # Ignored - no visualization
+        pose_model: Optional[str] = None,
+        pose_mode: Optional[str] = None,
+        bilateral: bool = False
     ) -> Dict:
-        """Analyze a single frame and return JSON data only"""
+        """Analyze a base64 frame and return JSON data only (pose_model/pose_mode select the model)"""
+        return await self.analyze_frame(
+            frame_base64, session_id, body_part, movement_type,
+            include_keypoints=include_keypoints,
+            pose_model=pose_model,
+            pose_mode=pose_mode,
+            bilateral=bilateral
+        )
+    
+    async def analyze_frame(
+        self,
+        frame: FrameInput,
+        session_id: str,
+        body_part: str,
+        movement_type: str,
+        include_keypoints: bool = False,
+        pose_model: Optional[str] = None,
+        pose_mode: Optional[str] = None,
+        apply_qos: bool = True,
+        bilateral: bool = False
+    ) -> Dict:
+        """
+        Analyze a single frame in whatever form the transport delivered it
         
-        logger.info(f"Starting analysis for {body_part} - {movement_type}")
-        start_time = time.time()
+        Args:
+            frame: Decoded BGR ndarray (used as is), encoded JPEG/PNG bytes
+                (decoded once on the inference executor), a raw pixel frame
+                (see app/utils/frame_protocol.py) or a base64 string
+            session_id: Session the frame belongs to
+            body_part: Body part to analyze
+            movement_type: Movement to analyze
+            include_keypoints: Add keypoints and skeleton connections to the result
+            pose_model: Pose model for this frame (default model if None)
+            pose_mode: Pose mode for this frame (default mode if None)
+            apply_qos: False for offline work (e.g. video files) that must analyze
+                every frame at full quality whatever the load
+            bilateral: Measure a limb movement on both sides with paired trackers
+                (see _build_bilateral_result); ignored for movements without sides
         
-        # Validate movement is supported
-        if not MovementRegistry.is_registered(body_part, movement_type):
-            # Fall back to ROMCalculator if not in registry
-            if body_part not in ROMCalculator.MOVEMENT_ANGLES:
-                raise AnalysisError(f"Unsupported body part: {body_part}")
-            if movement_type not in ROMCalculator.MOVEMENT_ANGLES[body_part]:
-                raise AnalysisError(f"Unsupported movement for {body_part}: {movement_type}")
+        Returns:
+            JSON-serializable analysis result
+        """
+        plans = [self._movement_plan(body_part, movement_type)]
+        return await self._analyze_with_qos(
+            frame, session_id, plans, False, include_keypoints, pose_model, pose_mode, apply_qos, bilateral
+        )
+    
+    async def analyze_movements(
+        self,
+        frame: FrameInput,
+        session_id: str,
+        movements: Sequence[Tuple[str, str]],
+        include_keypoints: bool = False,
+        pose_model: Optional[str] = None,
+        pose_mode: Optional[str] = None,
+        apply_qos: bool = True,
+        bilateral: bool = False
+    ) -> Dict:
+        """
+        Analyze several movements on one frame, decoding it and detecting pose once
+        
+        Every movement is evaluated on the same keypoints and updates its own
+        ROM tracker of the session.
+        
+        Args:
+            frame: Frame in any form analyze_frame accepts
+            session_id: Session the frame belongs to
+            movements: (body_part, movement_type) pairs; repeated pairs are analyzed once
+            include_keypoints: Add keypoints and skeleton connections to the result
+            pose_model: Pose model for this frame (default model if None)
+            pose_mode: Pose mode for this frame (default mode if None)
+            apply_qos: As for analyze_frame
+            bilateral: As for analyze_frame, for every limb movement
+        
+        Returns:
+            Combined result with one entry per movement (see _build_combined_result)
+        """
+        plans = self._movement_plans(movements)
+        return await self._analyze_with_qos(
+            frame, session_id, plans, True, include_keypoints, pose_model, pose_mode, apply_qos, bilateral
+        )
+    
+    async def _analyze_with_qos(
+        self,
+        frame: FrameInput,
+        session_id: str,
+        plans: List[MovementPlan],
+        combined: bool,
+        include_keypoints: bool,
+        pose_model: Optional[str],
+        pose_mode: Optional[str],
+        apply_qos: bool,
+        bilateral: bool
+    ) -> Dict:
+        """Analyze a frame at the session's QoS level, or replay its last result if the frame is dropped"""
+        qos = self.qos if apply_qos else None
+        
+        # Fidelity for this frame; stays at full quality unless QoS is enabled and the server is behind
+        qos_level = qos.current_level() if qos is not None else FULL_QUALITY
+        
+        if qos is not None:
+            # A dropped frame may only reuse a response computed for the same request
+            signature = (
+                tuple(movement_key(plan.body_part, plan.movement_type) for plan in plans),
+                combined, bilateral, include_keypoints
+            )
+            previous = qos.throttled_response(session_id, qos_level, signature)
+            if previous is not None:
+                return self._create_skipped_response(previous, session_id, qos_level)
+        
+        response_data = await self._analyze_at_level(
+            frame, session_id, plans, combined,
+            include_keypoints, pose_model, pose_mode, qos_level, bilateral
+        )
+        
+        if "frame_metrics" in response_data:
+            response_data["frame_metrics"]["qos"] = qos_level.as_dict()
+        if qos is not None:
+            qos.record_response(session_id, response_data, signature)
+        
+        return response_data
+    
+    async def _analyze_at_level(
+        self,
+        frame: FrameInput,
+        session_id: str,
+        plans: List[MovementPlan],
+        combined: bool,
+        include_keypoints: bool,
+        pose_model: Optional[str],
+        pose_mode: Optional[str],
+        qos_level: QoSLevel,
+        bilateral: bool
+    ) -> Dict:
+        """Run detection, angle calculation and ROM tracking for one frame at a QoS level"""
+        
+        logger.info(f"Starting analysis for {', '.join(f'{p.body_part} - {p.movement_type}' for p in plans)}")
+        start_time = time.time()
         
-        # Decode frame
         try:
-            frame = self.image_processor.decode_base64(frame_base64)
-            logger.info(f"Frame decoded successfully: shape={frame.shape}")
-        except Exception as e:
-            logger.error(f"Failed to decode frame: {e}")
-            raise AnalysisError(f"Failed to decode frame: {str(e)}")
+            model_key = self.pose_processor.model_key(pose_model, qos_level.pose_mode or pose_mode)
+        except ValueError as e:
+            raise AnalysisError(str(e))
+        
+        # Decode frame and detect pose off the event loop
+        keypoints, confidence = await self._decode_and_detect(
+            frame, session_id, model_key, qos_level
+        )
+        
+        if combined:
+            return await self._build_combined_result(
+                keypoints, confidence, session_id, plans, include_keypoints, start_time, bilateral
+            )
+        return await self._build_result(
+            keypoints, confidence, session_id, plans[0], include_keypoints, start_time,
+            bilateral=bilateral
+        )
+    
+    async def analyze_keypoints(
+        self,
+        keypoints: List[List[float]],
+        scores: List[float],
+        session_id: str,
+        body_part: str,
+        movement_type: str,
+        include_keypoints: bool = False,
+        bilateral: bool = False
+    ) -> Dict:
+        """
+        Analyze keypoints estimated on the client, skipping decode and inference
+        
+        Args:
+            keypoints: HALPE_26 keypoints as 26 [x, y] pairs, in model output order
+            scores: Confidence of each keypoint
+            session_id: Session the frame belongs to
+            body_part: Body part to analyze
+            movement_type: Movement to analyze
+            include_keypoints: Echo the filtered keypoints and skeleton connections
+            bilateral: Measure a limb movement on both sides (as for analyze_frame)
+        
+        Raises:
+            InvalidFrameError: if the arrays don't have HALPE_26 shapes
+        """
+        start_time = time.time()
+        plan = self._movement_plan(body_part, movement_type)
+        keypoint_set, confidence = self._client_keypoints(keypoints, scores)
+        
+        response_data = await self._build_result(
+            keypoint_set, confidence, session_id, plan, include_keypoints, start_time,
+            bilateral=bilateral
+        )
+        if "frame_metrics" in response_data:
+            response_data["frame_metrics"]["keypoint_source"] = "client"
+        return response_data
+    
+    async def analyze_keypoint_movements(
+        self,
+        keypoints: List[List[float]],
+        scores: List[float],
+        session_id: str,
+        movements: Sequence[Tuple[str, str]],
+        include_keypoints: bool = False,
+        bilateral: bool = False
+    ) -> Dict:
+        """
+        Analyze several movements on keypoints estimated on the client
+        
+        Same as analyze_movements without decode and inference; arguments as
+        for analyze_keypoints.
+        """
+        start_time = time.time()
+        plans = self._movement_plans(movements)
+        keypoint_set, confidence = self._client_keypoints(keypoints, scores)
         
-        # Detect pose
+        response_data = await self._build_combined_result(
+            keypoint_set, confidence, session_id, plans, include_keypoints, start_time, bilateral
+        )
+        response_data["frame_metrics"]["keypoint_source"] = "client"
+        return response_data
+    
+    def _client_keypoints(self, keypoints: List[List[float]], scores: List[float]) -> Tuple[KeypointSet, float]:
+        """Confidence-filtered keypoints of client HALPE_26 arrays (raises InvalidFrameError for other shapes)"""
+        model_key = self.pose_processor.model_key(model="body_with_feet")
+        expected = len(keypoint_names_for(model_key.model))
         try:
-            keypoints, confidence = self.pose_processor.process_frame(frame)
-            logger.info(f"Pose detection complete: {len(keypoints)} keypoints, confidence={confidence}")
-        except Exception as e:
-            logger.error(f"Pose detection failed: {e}")
-            keypoints, confidence = {}, 0.0
+            keypoints_array = np.asarray(keypoints, dtype=np.float64)
+            scores_array = np.asarray(scores, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise InvalidFrameError(f"Keypoints and scores must be numeric arrays: {e}")
+        if keypoints_array.shape != (expected, 2) or scores_array.shape != (expected,):
+            raise InvalidFrameError(
+                f"Expected {expected} HALPE_26 keypoints as [x, y] pairs and {expected} scores, "
+                f"got shapes {keypoints_array.shape} and {scores_array.shape}"
+            )
+        
+        # Same confidence filtering as detector output
+        return self.pose_processor.extract_keypoints(
+            keypoints_array[None], scores_array[None], model_key
+        )
+    
+    def _movement_plan(self, body_part: str, movement_type: str) -> MovementPlan:
+        """Compiled plan of a movement; raises AnalysisError if the movement is not supported"""
+        plan = MovementRegistry.get_plan(body_part, movement_type)
+        if plan is None:
+            if body_part not in ROMCalculator.MOVEMENT_ANGLES:
+                raise AnalysisError(f"Unsupported body part: {body_part}")
+            raise AnalysisError(f"Unsupported movement for {body_part}: {movement_type}")
+        return plan
+    
+    def _movement_plans(self, movements: Sequence[Tuple[str, str]]) -> List[MovementPlan]:
+        """Plans of distinct (body_part, movement_type) pairs in request order"""
+        pairs = list(dict.fromkeys((body_part, movement_type) for body_part, movement_type in movements))
+        if not pairs:
+            raise AnalysisError("At least one movement is required")
+        return [self._movement_plan(body_part, movement_type) for body_part, movement_type in pairs]
+    
+    def primary_angle_key(self, body_part: str, movement_type: str) -> str:
+        """Angle a movement's ROM is tracked on"""
+        return self._movement_plan(body_part, movement_type).primary_angle
+    
+    def result_context(self, body_part: str, movement_type: str, bilateral: bool = False) -> Dict:
+        """Fields every result of a movement shares (sent once to delta-encoded streams)"""
+        plan = MovementRegistry.get_plan(body_part, movement_type)
+        if plan is None:
+            return {"body_part": body_part, "movement_type": movement_type}
+        return plan.context(bilateral)
+    
+    def movements_context(self, movements: Sequence[Tuple[str, str]], bilateral: bool = False) -> Dict:
+        """Static fields of combined results (raises AnalysisError for unsupported movements)"""
+        return {
+            "movements": {
+                movement_key(plan.body_part, plan.movement_type): plan.context(bilateral)
+                for plan in self._movement_plans(movements)
+            }
+        }
+    
+    async def _build_result(
+        self,
+        keypoints: KeypointSet,
+        confidence: float,
+        session_id: str,
+        plan: MovementPlan,
+        include_keypoints: bool,
+        start_time: float,
+        frame_id: Optional[str] = None,
+        bilateral: bool = False
+    ) -> Dict:
+        """Calculate angles, update the session's ROM and build the response for detected keypoints"""
+        body_part, movement_type = plan.body_part, plan.movement_type
         
         # Generate frame ID
-        frame_id = f"{session_id}_{uuid.uuid4().hex[:8]}"
+        frame_id = frame_id or f"{session_id}_{uuid.uuid4().hex[:8]}"
         
         if not keypoints:
             return self._create_no_pose_response(
                 frame_id, session_id, body_part, movement_type
             )
         
-        # Try to use MovementRegistry first
+        if bilateral and plan.sided:
+            return await self._build_bilateral_result(
+                keypoints, confidence, session_id, plan, include_keypoints, start_time, frame_id
+            )
+        
         try:
-            if MovementRegistry.is_registered(body_part, movement_type):
-                # Use registered movement class
-                movement_class = MovementRegistry.get_movement(body_part, movement_type)
-                movement = movement_class()
-                
-                # Validate position
-                valid, message = movement.validate_position(keypoints)
-                if not valid:
-                    return self._create_invalid_position_response(
-                        frame_id, session_id, body_part, movement_type, message, confidence
-                    )
-                
-                # Calculate angles
-                angles = movement.calculate_angles(keypoints)
-                primary_angle_key = movement.primary_angle
-                normal_range = movement.normal_range
-                
-                # Get max range from ROMCalculator
-                movement_config = ROMCalculator.MOVEMENT_ANGLES.get(body_part, {}).get(movement_type, {})
-                max_range = movement_config.get('max_range', normal_range)
-            else:
-                # Fallback to ROMCalculator
-                angles = ROMCalculator.calculate_movement_angles(
-                    keypoints, body_part, movement_type
+            # Validate position
+            valid, message = plan.validate_position(keypoints)
+            if not valid:
+                return self._create_invalid_position_response(
+                    frame_id, session_id, body_part, movement_type, message, confidence
                 )
-                movement_config = ROMCalculator.MOVEMENT_ANGLES[body_part][movement_type]
-                primary_angle_key = movement_config.get('primary', 'trunk')
-                normal_range = movement_config['normal_range']
-                max_range = movement_config['max_range']
-                
+            
+            # Calculate angles
+            angles = plan.angles(keypoints)
         except ValueError as e:
             raise AnalysisError(str(e))
         
@@ -117,13 +406,12 @@ class FrameAnalyzer:
         )
         
         # Update ROM with primary angle
+        primary_angle_key = plan.primary_angle
         primary_angle_value = angles.get(primary_angle_key, 0)
         rom_data = tracker.update(angles, primary_angle_key)
         
         # Validate ROM
-        validation = ROMCalculator.validate_rom(
-            primary_angle_value, body_part, movement_type
-        )
+        validation = plan.validate_rom(primary_angle_value)
         
         # Calculate processing time
         processing_time_ms = (time.time() - start_time) * 1000
@@ -152,12 +440,10 @@ class FrameAnalyzer:
             }
         }
         
-        # Add keypoints if requested (for visualization in frontend)
+        # Add keypoints if requested (for visualization in frontend);
+        # serializers write the set's arrays directly
         if include_keypoints:
-            response_data["keypoints"] = {
-                k: {"x": float(v[0]), "y": float(v[1])} 
-                for k, v in keypoints.items()
-            }
+            response_data["keypoints"] = keypoints
             
             # Add skeleton connections for frontend visualization
             response_data["skeleton_connections"] = self._get_skeleton_connections()
@@ -179,6 +465,301 @@ class FrameAnalyzer:
         
         return response_data
     
+    async def _build_combined_result(
+        self,
+        keypoints: KeypointSet,
+        confidence: float,
+        session_id: str,
+        plans: List[MovementPlan],
+        include_keypoints: bool,
+        start_time: float,
+        bilateral: bool = False
+    ) -> Dict:
+        """
+        Evaluate several movements on one frame's keypoints
+        
+        "movements" maps movement_key to each movement's result as _build_result
+        returns it, without the FRAME_FIELDS the combined result holds once.
+        """
+        frame_id = f"{session_id}_{uuid.uuid4().hex[:8]}"
+        
+        movements = {}
+        angles_calculated = 0
+        for plan in plans:
+            result = await self._build_result(
+                keypoints, confidence, session_id, plan, False, start_time, frame_id, bilateral
+            )
+            angles_calculated += result["frame_metrics"]["angles_calculated"]
+            for field in FRAME_FIELDS:
+                result.pop(field, None)
+            movements[movement_key(plan.body_part, plan.movement_type)] = result
+        
+        processing_time_ms = (time.time() - start_time) * 1000
+        
+        response_data = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "frame_id": frame_id,
+            "pose_detected": bool(keypoints),
+            "pose_confidence": round(confidence, 3),
+            "movements": movements,
+            "frame_metrics": {
+                "keypoints_detected": len(keypoints),
+                "movements_analyzed": len(plans),
+                "angles_calculated": angles_calculated,
+                "processing_time_ms": round(processing_time_ms, 2)
+            }
+        }
+        
+        if include_keypoints and keypoints:
+            response_data["keypoints"] = keypoints
+            response_data["skeleton_connections"] = self._get_skeleton_connections()
+        
+        return response_data
+    
+    async def _build_bilateral_result(
+        self,
+        keypoints: KeypointSet,
+        confidence: float,
+        session_id: str,
+        plan: MovementPlan,
+        include_keypoints: bool,
+        start_time: float,
+        frame_id: str
+    ) -> Dict:
+        """
+        Measure a limb movement on both sides of one frame's keypoints
+        
+        Both sides come from one vectorized angle evaluation and update a pair
+        of trackers of the session. "sides" holds each side's angles, ROM and
+        validation; "symmetry" the symmetry index of the sides' current angles
+        (when both are detected in the frame) and of their ROM ranges so far.
+        """
+        body_part, movement_type = plan.body_part, plan.movement_type
+        
+        side_angles = plan.bilateral_angles(keypoints)
+        
+        sides = {}
+        trackers = {}
+        angles_calculated = 0
+        for side, angles in side_angles.items():
+            angle_key = plan.side_angle(side)
+            tracker = await self.session_manager.get_or_create_tracker(
+                session_id, body_part, movement_type, side
+            )
+            trackers[side] = tracker
+            rom_data = tracker.update(angles, angle_key)
+            
+            if angle_key in angles:
+                validation = plan.validate_rom(angles[angle_key])
+            else:
+                validation = {
+                    'in_normal_range': False,
+                    'in_max_range': False,
+                    'message': f"Cannot measure the {angle_key}",
+                    'normal_range': plan.normal_range,
+                    'max_range': plan.max_range
+                }
+            angles_calculated += len(angles)
+            
+            sides[side] = {
+                "detected": angle_key in angles,
+                "angles": {k: round(v, 1) for k, v in angles.items()},
+                "rom": rom_data,
+                "validation": {
+                    "in_normal_range": validation['in_normal_range'],
+                    "in_max_range": validation['in_max_range'],
+                    "message": validation['message'],
+                    "normal_range": list(validation['normal_range']),
+                    "max_range": list(validation['max_range'])
+                }
+            }
+        
+        symmetry = {}
+        left, right = sides["left"], sides["right"]
+        if left["detected"] and right["detected"]:
+            symmetry["current"] = round(symmetry_index(left["rom"]["current"], right["rom"]["current"]), 1)
+        if all(tracker.min_angle is not None for tracker in trackers.values()):
+            symmetry["range"] = round(symmetry_index(left["rom"]["range"], right["rom"]["range"]), 1)
+        
+        processing_time_ms = (time.time() - start_time) * 1000
+        
+        response_data = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "frame_id": frame_id,
+            "body_part": body_part,
+            "movement_type": movement_type,
+            "bilateral": True,
+            "pose_detected": True,
+            "sides": sides,
+            "symmetry": symmetry,
+            "pose_confidence": round(confidence, 3),
+            "frame_metrics": {
+                "keypoints_detected": len(keypoints),
+                "angles_calculated": angles_calculated,
+                "processing_time_ms": round(processing_time_ms, 2)
+            }
+        }
+        
+        if include_keypoints:
+            response_data["keypoints"] = keypoints
+            response_data["skeleton_connections"] = self._get_skeleton_connections()
+        
+        for tracker in trackers.values():
+            await self.session_manager.save_tracker(session_id, tracker)
+        
+        return response_data
+    
+    async def _decode_and_detect(
+        self,
+        frame: FrameInput,
+        session_id: str,
+        model_key: Optional[ModelKey] = None,
+        qos_level: QoSLevel = FULL_QUALITY
+    ) -> Tuple[KeypointSet, float]:
+        """Decode a frame and detect pose, either directly on the executor or via the batcher"""
+        if self.batcher is None:
+            return await self.executor.run(
+                self._decode_and_detect_sync, frame, session_id, model_key, qos_level
+            )
+        
+        min_side = self._decode_min_side(model_key)
+        cache_key = None
+        if isinstance(frame, np.ndarray):
+            # Already decoded - only validated, no executor round trip
+            frame, decode_scale = self._decode_frame(frame)
+        else:
+            cache_key, cached, frame, decode_scale = await self.executor.run(
+                self._lookup_or_decode, frame, model_key, qos_level, min_side
+            )
+            if cached is not None:
+                return cached
+        frame, scale = downscale(frame, qos_level.max_side)
+        scale *= decode_scale
+        try:
+            track = self.pose_processor.get_track(session_id, qos_level.det_frequency)
+            bbox_hint = track.bbox_hint(qos_level.det_frequency) if track is not None else None
+            keypoints, scores = await self.batcher.detect(frame, scale_boxes(bbox_hint, scale), model_key)
+            if scale != 1.0 and len(keypoints) > 0:
+                keypoints = keypoints / scale
+            if track is not None:
+                # A confidence drop is picked up by the detector on the session's next frame
+                self.pose_processor.update_track(track, keypoints, scores, detected=bbox_hint is None)
+            keypoints, confidence = self.pose_processor.extract_keypoints(
+                keypoints, scores, model_key, cache_key
+            )
+            logger.info(f"Pose detection complete: {len(keypoints)} keypoints, confidence={confidence}")
+        except (InferenceQueueFullError, InvalidFrameError):
+            # Overload and bad input are surfaced to the caller, not reported as "no person"
+            raise
+        except Exception as e:
+            logger.error(f"Pose detection failed: {e}")
+            keypoints, confidence = self.pose_processor.empty_keypoints(model_key), 0.0
+        
+        return keypoints, confidence
+    
+    def _decode_and_detect_sync(
+        self,
+        frame: FrameInput,
+        session_id: str,
+        model_key: Optional[ModelKey] = None,
+        qos_level: QoSLevel = FULL_QUALITY
+    ) -> Tuple[KeypointSet, float]:
+        """Decode a frame and run pose detection (runs on an inference worker thread)"""
+        min_side = self._decode_min_side(model_key)
+        cache_key = self.pose_processor.frame_cache_key(frame, model_key, qos_level.max_side, min_side)
+        cached = self.pose_processor.cached_pose(cache_key)
+        if cached is not None:
+            logger.info(f"Pose cache hit: {len(cached[0])} keypoints, confidence={cached[1]}")
+            return cached
+        
+        frame, decode_scale = self._decode_frame(frame, min_side)
+        
+        try:
+            keypoints, confidence = self.pose_processor.process_frame(
+                frame, session_id, model_key,
+                max_side=qos_level.max_side,
+                det_frequency=qos_level.det_frequency,
+                input_scale=decode_scale,
+                cache_key=cache_key
+            )
+            logger.info(f"Pose detection complete: {len(keypoints)} keypoints, confidence={confidence}")
+        except InferenceQueueFullError:
+            raise
+        except Exception as e:
+            logger.error(f"Pose detection failed: {e}")
+            keypoints, confidence = self.pose_processor.empty_keypoints(model_key), 0.0
+        
+        return keypoints, confidence
+    
+    def _lookup_or_decode(
+        self,
+        frame: FrameInput,
+        model_key: Optional[ModelKey],
+        qos_level: QoSLevel,
+        min_side: Optional[int]
+    ) -> Tuple[Optional[Tuple], Optional[Tuple[KeypointSet, float]], Optional[np.ndarray], float]:
+        """
+        Look an encoded frame up in the pose cache, decoding it on a miss (runs on an inference worker thread)
+        
+        Returns:
+            Tuple of (cache key, cached keypoints and confidence or None, decoded image or None, decode scale)
+        """
+        cache_key = self.pose_processor.frame_cache_key(frame, model_key, qos_level.max_side, min_side)
+        cached = self.pose_processor.cached_pose(cache_key)
+        if cached is not None:
+            logger.info(f"Pose cache hit: {len(cached[0])} keypoints, confidence={cached[1]}")
+            return cache_key, cached, None, 1.0
+        decoded, decode_scale = self._decode_frame(frame, min_side)
+        return cache_key, None, decoded, decode_scale
+    
+    def _decode_min_side(self, model_key: Optional[ModelKey]) -> Optional[int]:
+        """Long side JPEGs may be reduced to while decoding, or None to decode at full size"""
+        if not settings.DECODE_REDUCED:
+            return None
+        return self.pose_processor.decode_min_side(model_key)
+    
+    def _decode_frame(self, frame: FrameInput, min_side: Optional[int] = None) -> Tuple[np.ndarray, float]:
+        """
+        Decode a frame to a BGR ndarray (runs on an inference worker thread)
+        
+        Args:
+            frame: Decoded ndarray, encoded bytes or base64 string
+            min_side: Allow a reduced-size JPEG decode down to this long side
+        
+        Returns:
+            Tuple of (image, scale relative to the original image)
+        
+        Raises:
+            InvalidFrameError: if the frame can't be decoded
+        """
+        if isinstance(frame, np.ndarray):
+            if frame.ndim != 3 or frame.shape[2] != 3 or frame.dtype != np.uint8:
+                raise InvalidFrameError(f"Expected a uint8 BGR image, got {frame.dtype} array of shape {frame.shape}")
+            return frame, 1.0
+        
+        if not isinstance(frame, str) and is_raw_frame(frame):
+            # Raw pixels: a view of the payload, converted only if not already BGR
+            return parse_raw_frame(frame), 1.0
+        
+        try:
+            data = self.image_processor.base64_to_bytes(frame) if isinstance(frame, str) else frame
+            if min_side:
+                decoded, scale = self.image_processor.decode_bytes_reduced(data, min_side)
+            else:
+                decoded, scale = self.image_processor.decode_bytes(data), 1.0
+            logger.info(f"Frame decoded successfully: shape={decoded.shape}, scale={scale}")
+        except Exception as e:
+            logger.error(f"Failed to decode frame: {e}")
+            raise InvalidFrameError(f"Failed to decode frame: {str(e)}")
+        
+        return decoded, scale
+    
+    def release_session(self, session_id: str):
+        """Release per-session inference state once a stream has ended"""
+        self.pose_processor.release_track(session_id)
+        if self.qos is not None:
+            self.qos.release_session(session_id)
+    
     def _create_no_pose_response(
         self, 
         frame_id: str, 
@@ -216,6 +797,24 @@ class FrameAnalyzer:
             }
         }
     
+    def _create_skipped_response(
+        self,
+        previous: Dict,
+        session_id: str,
+        qos_level: QoSLevel
+    ) -> Dict:
+        """Reuse the session's last result for a frame dropped by the QoS frame rate limit"""
+        return {
+            **previous,
+            "timestamp": datetime.utcnow().isoformat(),
+            "frame_id": f"{session_id}_{uuid.uuid4().hex[:8]}",
+            "frame_metrics": {
+                **previous.get("frame_metrics", {}),
+                "processing_time_ms": 0,
+                "qos": {**qos_level.as_dict(), "frame_skipped": True}
+            }
+        }
+    
     def _create_invalid_position_response(
         self,
         frame_id: str,
@@ -257,24 +856,7 @@ class FrameAnalyzer:
     
     def _get_skeleton_connections(self) -> List[List[str]]:
         """Get skeleton connections for frontend visualization"""
-        return [
-            ["LShoulder", "RShoulder"],
-            ["LShoulder", "LElbow"],
-            ["LElbow", "LWrist"],
-            ["RShoulder", "RElbow"],
-            ["RElbow", "RWrist"],
-            ["LShoulder", "LHip"],
-            ["RShoulder", "RHip"],
-            ["LHip", "RHip"],
-            ["LHip", "LKnee"],
-            ["LKnee", "LAnkle"],
-            ["RHip", "RKnee"],
-            ["RKnee", "RAnkle"],
-            ["Neck", "Hip"],
-            ["Neck", "Head"],
-            ["LAnkle", "LBigToe"],
-            ["RAnkle", "RBigToe"]
-        ]
+        return SKELETON_CONNECTIONS
     
     def _get_movement_guidance(
         self,
@@ -1,24 +1,102 @@
 import base64
 import cv2
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple, Union
 from io import BytesIO
 
+from physiotrack_core.keypoint_set import KeypointSet
+
+# Scaled JPEG decoding (libjpeg DCT scaling) by reduction factor
+REDUCED_DECODE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8
+}
+
+# JPEG start-of-frame markers (baseline, progressive, ...) that carry the image size
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
 class ImageProcessor:
     """Handle image encoding/decoding and visualization"""
     
     @staticmethod
     def decode_base64(base64_string: str) -> np.ndarray:
         """Decode base64 string to numpy array"""
+        return ImageProcessor.decode_bytes(ImageProcessor.base64_to_bytes(base64_string))
+    
+    @staticmethod
+    def base64_to_bytes(base64_string: str) -> bytes:
+        """Decode a base64 string (optionally a data URL) to the encoded image bytes"""
         # Remove data URL prefix if present
         if "," in base64_string:
             base64_string = base64_string.split(",")[1]
         
-        # Decode base64
-        img_bytes = base64.b64decode(base64_string)
+        return base64.b64decode(base64_string)
+    
+    @staticmethod
+    def decode_bytes_reduced(
+        data: Union[bytes, bytearray, memoryview],
+        min_side: int
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Decode a JPEG at 1/2, 1/4 or 1/8 size while its long side stays at least min_side
+        
+        The pose pipeline resizes frames to its model input size anyway, so
+        decoding phone-sized JPEGs at full resolution is wasted work. Other
+        formats, and JPEGs that are already small, decode at full size.
         
-        # Convert to numpy array
-        nparr = np.frombuffer(img_bytes, np.uint8)
+        Returns:
+            Tuple of (image, scale); divide coordinates by scale to map them
+            back to the original image
+        """
+        size = ImageProcessor.jpeg_size(data)
+        factor = ImageProcessor.reduced_decode_factor(*size, min_side) if size else 1
+        if factor == 1:
+            return ImageProcessor.decode_bytes(data), 1.0
+        
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), REDUCED_DECODE_FLAGS[factor])
+        if img is None:
+            raise ValueError("Failed to decode image")
+        
+        return img, 1.0 / factor
+    
+    @staticmethod
+    def reduced_decode_factor(width: int, height: int, min_side: int) -> int:
+        """Largest reduction factor (1, 2, 4 or 8) that keeps the long side at least min_side"""
+        long_side = max(width, height)
+        for factor in (8, 4, 2):
+            if long_side // factor >= min_side:
+                return factor
+        return 1
+    
+    @staticmethod
+    def jpeg_size(data: Union[bytes, bytearray, memoryview]) -> Optional[Tuple[int, int]]:
+        """Read (width, height) from a JPEG header without decoding, or None if not a JPEG"""
+        view = memoryview(data)
+        if len(view) < 4 or view[0] != 0xFF or view[1] != 0xD8:
+            return None
+        
+        i = 2
+        while i + 9 < len(view):
+            if view[i] != 0xFF:
+                return None
+            marker = view[i + 1]
+            if marker == 0xFF:
+                # Fill byte before a marker
+                i += 1
+                continue
+            if marker in JPEG_SOF_MARKERS:
+                height = int.from_bytes(view[i + 5:i + 7], "big")
+                width = int.from_bytes(view[i + 7:i + 9], "big")
+                return width, height
+            # Skip this segment (length includes its own two bytes)
+            i += 2 + int.from_bytes(view[i + 2:i + 4], "big")
+        return None
+    
+    @staticmethod
+    def decode_bytes(data: Union[bytes, bytearray, memoryview]) -> np.ndarray:
+        """Decode encoded image bytes (JPEG/PNG) to numpy array without copying the input"""
+        nparr = np.frombuffer(data, np.uint8)
         img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
         
         if img is None:
@@ -41,7 +119,7 @@ class ImageProcessor:
     def draw_visualization(
         self,
         frame: np.ndarray,
-        keypoints: Dict[str, np.ndarray],
+        keypoints: KeypointSet,
         angles: Dict[str, float],
         rom_data: Dict[str, float]
     ) -> np.ndarray:
@@ -56,7 +134,7 @@ class ImageProcessor:
         
         return viz_frame
     
-    def _draw_skeleton(self, frame: np.ndarray, keypoints: Dict[str, np.ndarray]):
+    def _draw_skeleton(self, frame: np.ndarray, keypoints: KeypointSet):
         """Draw skeleton connections"""
         # Define connections
         connections = [
@@ -13,14 +13,22 @@ class SessionManager:
         self.storage = storage
         self.trackers_cache = {}  # In-memory cache for active trackers
     
+    @staticmethod
+    def tracker_key(session_id: str, body_part: str, movement_type: str, side: Optional[str] = None) -> str:
+        """Storage key of a tracker; the sides of a bilateral pair get a side suffix"""
+        if side:
+            return f"{session_id}:{body_part}:{movement_type}:{side}"
+        return f"{session_id}:{body_part}:{movement_type}"
+    
     async def get_or_create_tracker(
         self, 
         session_id: str, 
         body_part: str, 
-        movement_type: str
+        movement_type: str,
+        side: Optional[str] = None
     ) -> ROMTracker:
-        """Get existing tracker or create new one"""
-        tracker_key = f"{session_id}:{body_part}:{movement_type}"
+        """Get existing tracker or create new one (side selects one of a bilateral pair)"""
+        tracker_key = self.tracker_key(session_id, body_part, movement_type, side)
         
         # Check in-memory cache first
         if tracker_key in self.trackers_cache:
@@ -31,7 +39,7 @@ class SessionManager:
         
         if tracker_data:
             # Reconstruct tracker from stored data
-            tracker = ROMTracker(body_part, movement_type)
+            tracker = ROMTracker(body_part, movement_type, side=side)
             if isinstance(tracker_data, str):
                 tracker_data = json.loads(tracker_data)
             
@@ -46,7 +54,7 @@ class SessionManager:
                     tracker.angle_history.append(angle)
         else:
             # Create new tracker
-            tracker = ROMTracker(body_part, movement_type)
+            tracker = ROMTracker(body_part, movement_type, side=side)
         
         # Cache the tracker
         self.trackers_cache[tracker_key] = tracker
@@ -55,7 +63,7 @@ class SessionManager:
     
     async def save_tracker(self, session_id: str, tracker: ROMTracker):
         """Save tracker state"""
-        tracker_key = f"{session_id}:{tracker.body_part}:{tracker.movement_type}"
+        tracker_key = self.tracker_key(session_id, tracker.body_part, tracker.movement_type, tracker.side)
         
         tracker_data = {
             "min_angle": tracker.min_angle,
@@ -64,6 +72,7 @@ class SessionManager:
             "valid_frame_count": tracker.valid_frame_count,
             "body_part": tracker.body_part,
             "movement_type": tracker.movement_type,
+            "side": tracker.side,
             "angle_history": list(tracker.angle_history)  # Convert deque to list
         }
         
@@ -92,11 +101,11 @@ class SessionManager:
                     logger.error(f"Failed to parse JSON for key {key}")
                     continue
             
-            # Extract body_part and movement_type from key
+            # Extract body_part and movement_type (and side of bilateral trackers) from key
             parts = key.split(":")
             if len(parts) >= 3:
                 body_part = parts[1]
-                movement_type = parts[2]
+                movement_type = parts[2] if len(parts) == 3 else f"{parts[2]}:{parts[3]}"
                 
                 if body_part not in session_data["trackers"]:
                     session_data["trackers"][body_part] = {}
@@ -0,0 +1,317 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.services.frame_analyzer import FrameAnalyzer
+from app.services.video_processor import VideoFrame, VideoInfo, open_video, probe_video, read_frames
+
+logger = logging.getLogger(__name__)
+
+# exhaustive: analyze every sampled frame
+# coarse_to_fine: analyze every coarse_step-th sampled frame, then densely
+#   analyze only the windows around candidate extremes of the primary angle
+ANALYSIS_MODES = ("exhaustive", "coarse_to_fine")
+
+class FrameTimeline:
+    """Columnar per-frame results (angles are None where they couldn't be calculated)"""
+
+    def __init__(self):
+        self.frame_index: List[int] = []
+        self.timestamp_s: List[float] = []
+        self.pose_detected: List[bool] = []
+        self.rom_current: List[Optional[float]] = []
+        self.angles: Dict[str, List[Optional[float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.frame_index)
+
+    def append(self, frame: VideoFrame, result: Dict, rom_current: Optional[float]):
+        position = len(self.frame_index)
+        self.frame_index.append(frame.index)
+        self.timestamp_s.append(round(frame.timestamp_s, 3))
+        self.pose_detected.append(result.get("pose_detected", False))
+        self.rom_current.append(rom_current)
+
+        angles = result.get("angles", {})
+        for name in angles.keys() - self.angles.keys():
+            self.angles[name] = [None] * position
+        for name, values in self.angles.items():
+            values.append(angles.get(name))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "frame_index": self.frame_index,
+            "timestamp_s": self.timestamp_s,
+            "pose_detected": self.pose_detected,
+            "rom_current": self.rom_current,
+            "angles": self.angles
+        }
+
+def find_extremum_windows(
+    values: Sequence[Optional[float]],
+    step: int,
+    margin: float,
+    size: int
+) -> List[Tuple[int, int]]:
+    """
+    Windows around candidate extremes of a coarsely sampled signal
+
+    Candidates are local maxima within margin of the global maximum and local
+    minima within margin of the global minimum. The true extreme lies within
+    one coarse step of such a sample, so each window spans step - 1 positions
+    of the dense grid on either side of it.
+
+    Args:
+        values: Signal at every step-th position of the dense grid (None = no measurement)
+        step: Dense grid positions between coarse samples
+        margin: How far (in signal units) below the maximum / above the minimum a
+            local extreme may be and still be refined
+        size: Length of the dense grid
+
+    Returns:
+        Merged, inclusive (start, end) ranges of dense grid positions
+    """
+    valid = [(i, v) for i, v in enumerate(values) if v is not None]
+    if not valid:
+        return []
+    highest = max(v for _, v in valid)
+    lowest = min(v for _, v in valid)
+
+    centers = []
+    for k, (i, v) in enumerate(valid):
+        before = valid[k - 1][1] if k > 0 else v
+        after = valid[k + 1][1] if k + 1 < len(valid) else v
+        if (v >= before and v >= after and v >= highest - margin) or \
+                (v <= before and v <= after and v <= lowest + margin):
+            centers.append(i * step)
+
+    windows: List[Tuple[int, int]] = []
+    for center in centers:
+        start, end = max(0, center - step + 1), min(size - 1, center + step - 1)
+        if windows and start <= windows[-1][1] + 1:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+class VideoAnalyzer:
+    """Analyze a recorded video frame by frame into an angle timeline"""
+
+    def __init__(self, frame_analyzer: FrameAnalyzer):
+        self.frame_analyzer = frame_analyzer
+
+    async def analyze(
+        self,
+        path: str,
+        session_id: str,
+        body_part: str,
+        movement_type: str,
+        sample_fps: float = 0.0,
+        max_frames: Optional[int] = None,
+        pose_model: Optional[str] = None,
+        pose_mode: Optional[str] = None,
+        mode: str = "exhaustive",
+        coarse_step: int = 8,
+        refine_margin: float = 5.0
+    ) -> Dict[str, Any]:
+        """
+        Run the analysis pipeline over the sampled frames of a video file
+
+        Frames are decoded one at a time off the event loop. In exhaustive mode
+        they are analyzed in order within session_id, so ROM accumulates over
+        the whole video and the person box is tracked from frame to frame. In
+        coarse_to_fine mode only the frames needed to find the extremes of the
+        primary angle are analyzed; their angles are then replayed in frame
+        order into the session's ROM tracker.
+
+        Returns:
+            Video info, a columnar per-frame timeline of the analyzed frames,
+            the final ROM and (coarse_to_fine) the refined windows
+
+        Raises:
+            ValueError: for an unknown mode
+            InvalidFrameError: if the video can't be decoded
+        """
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unsupported analysis mode: {mode} (available: {', '.join(ANALYSIS_MODES)})")
+
+        start_time = time.time()
+        search = None
+        if mode == "coarse_to_fine":
+            info = await asyncio.to_thread(probe_video, path)
+            if info.frame_count > 0 and info.fps > 0:
+                timeline, rom, search = await self._analyze_coarse_to_fine(
+                    path, info, session_id, body_part, movement_type,
+                    sample_fps, max_frames, pose_model, pose_mode, max(1, coarse_step), refine_margin
+                )
+            else:
+                # Without a frame count there is no grid to seek on
+                logger.warning("Video has no frame count; falling back to exhaustive analysis")
+                mode = "exhaustive"
+        if mode == "exhaustive":
+            info, timeline, rom = await self._analyze_exhaustive(
+                path, session_id, body_part, movement_type,
+                sample_fps, max_frames, pose_model, pose_mode
+            )
+
+        processing_time_s = time.time() - start_time
+        logger.info(f"Video analysis ({mode}) complete: {len(timeline)} frames in {processing_time_s:.1f}s")
+
+        response = {
+            "session_id": session_id,
+            "body_part": body_part,
+            "movement_type": movement_type,
+            "video": info.as_dict(),
+            "sampling": {
+                "mode": mode,
+                "sample_fps": sample_fps,
+                "max_frames": max_frames,
+                "frames_analyzed": len(timeline),
+                "frames_with_pose": sum(value is not None for value in timeline.rom_current)
+            },
+            "rom": rom,
+            "timeline": timeline.as_dict(),
+            "processing_time_s": round(processing_time_s, 2)
+        }
+        if search is not None:
+            response["search"] = search
+        return response
+
+    async def _analyze_exhaustive(
+        self,
+        path: str,
+        session_id: str,
+        body_part: str,
+        movement_type: str,
+        sample_fps: float,
+        max_frames: Optional[int],
+        pose_model: Optional[str],
+        pose_mode: Optional[str]
+    ) -> Tuple[VideoInfo, FrameTimeline, Dict[str, Any]]:
+        """Analyze every sampled frame in order within the session"""
+        info, frames = await asyncio.to_thread(open_video, path, sample_fps, max_frames)
+        logger.info(
+            f"Analyzing video {info.width}x{info.height} @ {info.fps:.1f} fps "
+            f"({info.decoder}) for session {session_id}"
+        )
+
+        timeline = FrameTimeline()
+        rom: Dict[str, Any] = {"current": 0, "min": 0, "max": 0, "range": 0}
+        try:
+            async for frame, result in self._analyze_frames(
+                frames, session_id, body_part, movement_type, pose_model, pose_mode
+            ):
+                if result.get("angles"):
+                    rom = result["rom"]
+                    timeline.append(frame, result, rom.get("current"))
+                else:
+                    timeline.append(frame, result, None)
+        finally:
+            self.frame_analyzer.release_session(session_id)
+        return info, timeline, rom
+
+    async def _analyze_coarse_to_fine(
+        self,
+        path: str,
+        info: VideoInfo,
+        session_id: str,
+        body_part: str,
+        movement_type: str,
+        sample_fps: float,
+        max_frames: Optional[int],
+        pose_model: Optional[str],
+        pose_mode: Optional[str],
+        coarse_step: int,
+        refine_margin: float
+    ) -> Tuple[FrameTimeline, Dict[str, Any], Dict[str, Any]]:
+        """Find the extremes of the primary angle on a coarse grid, then refine around them"""
+        primary = self.frame_analyzer.primary_angle_key(body_part, movement_type)
+
+        # The frames an exhaustive pass at sample_fps would analyze
+        dense_step = max(1, round(info.fps / sample_fps)) if sample_fps > 0 else 1
+        grid = list(range(0, info.frame_count, dense_step))[:max_frames]
+        logger.info(
+            f"Coarse-to-fine search over {len(grid)} frames of {info.width}x{info.height} video "
+            f"(every {coarse_step}th first) for session {session_id}"
+        )
+
+        # Frames are analyzed out of order, so they go through a scratch session
+        # whose ROM is discarded
+        scratch_id = f"{session_id}_search"
+        results: Dict[int, Tuple[VideoFrame, Dict]] = {}
+
+        async def analyze_indices(indices: List[int]):
+            self.frame_analyzer.release_session(scratch_id)
+            _, frames = await asyncio.to_thread(read_frames, path, indices)
+            async for frame, result in self._analyze_frames(
+                frames, scratch_id, body_part, movement_type, pose_model, pose_mode
+            ):
+                results[frame.index] = (frame, result)
+
+        try:
+            await analyze_indices(grid[::coarse_step])
+            coarse_frames = len(results)
+
+            coarse_values = [
+                results[index][1].get("angles", {}).get(primary) if index in results else None
+                for index in grid[::coarse_step]
+            ]
+            windows = find_extremum_windows(coarse_values, coarse_step, refine_margin, len(grid))
+            for start, end in windows:
+                await analyze_indices([index for index in grid[start:end + 1] if index not in results])
+        finally:
+            self.frame_analyzer.release_session(scratch_id)
+            await self.frame_analyzer.session_manager.clear_session(scratch_id)
+
+        # Replay in frame order so smoothing matches an exhaustive pass
+        session_manager = self.frame_analyzer.session_manager
+        tracker = await session_manager.get_or_create_tracker(session_id, body_part, movement_type)
+        timeline = FrameTimeline()
+        for index in sorted(results):
+            frame, result = results[index]
+            angles = result.get("angles")
+            rom_current = tracker.update(angles, primary)["current"] if angles else None
+            timeline.append(frame, result, rom_current)
+        await session_manager.save_tracker(session_id, tracker)
+
+        search = {
+            "primary_angle": primary,
+            "coarse_step": coarse_step,
+            "refine_margin_deg": refine_margin,
+            "windows": [[grid[start], grid[end]] for start, end in windows],
+            "coarse_frames": coarse_frames,
+            "refined_frames": len(results) - coarse_frames,
+            "frames_inferred": len(results),
+            "frames_skipped": len(grid) - len(results)
+        }
+        return timeline, tracker.get_current_rom(), search
+
+    async def _analyze_frames(
+        self,
+        frames: Iterator[VideoFrame],
+        session_id: str,
+        body_part: str,
+        movement_type: str,
+        pose_model: Optional[str],
+        pose_mode: Optional[str]
+    ):
+        """Decode frames off the event loop and analyze them at full quality"""
+        try:
+            while True:
+                frame = await asyncio.to_thread(next, frames, None)
+                if frame is None:
+                    break
+                result = await self.frame_analyzer.analyze_frame(
+                    frame.image,
+                    session_id=session_id,
+                    body_part=body_part,
+                    movement_type=movement_type,
+                    pose_model=pose_model,
+                    pose_mode=pose_mode,
+                    apply_qos=False
+                )
+                yield frame, result
+        finally:
+            frames.close()
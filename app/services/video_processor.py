@@ -0,0 +1,241 @@
+import logging
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from app.utils.exceptions import InvalidFrameError
+
+logger = logging.getLogger(__name__)
+
+VIDEO_SUFFIXES = (".mp4", ".mov", ".m4v", ".avi", ".mkv", ".webm")
+
+# read_frames seeks instead of grabbing through gaps longer than this many frames
+SEEK_MIN_GAP = 30
+
+class VideoInfo(NamedTuple):
+    """Properties of an opened video"""
+    width: int
+    height: int
+    fps: float
+    frame_count: int  # 0 if the container doesn't say
+    decoder: str  # "opencv" or "ffmpeg"
+
+    @property
+    def duration_s(self) -> float:
+        return self.frame_count / self.fps if self.fps > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "height": self.height,
+            "fps": round(self.fps, 3),
+            "frame_count": self.frame_count,
+            "duration_s": round(self.duration_s, 3),
+            "decoder": self.decoder
+        }
+
+class VideoFrame(NamedTuple):
+    """A sampled frame with its position in the source video"""
+    index: int
+    timestamp_s: float
+    image: np.ndarray
+
+def open_video(
+    path: str,
+    sample_fps: float = 0.0,
+    max_frames: Optional[int] = None
+) -> Tuple[VideoInfo, Iterator[VideoFrame]]:
+    """
+    Open a video for incremental decoding
+
+    Frames are decoded one at a time, so only the current frame is held in
+    memory. OpenCV is tried first; files it can't open are read through the
+    ffmpeg binary from imageio_ffmpeg.
+
+    Args:
+        path: Video file path
+        sample_fps: Frames per second of video to yield (0 = every frame)
+        max_frames: Stop after this many yielded frames
+
+    Returns:
+        Tuple of (video info, iterator of sampled BGR frames)
+
+    Raises:
+        InvalidFrameError: if neither decoder can read the file
+    """
+    opened = _open_opencv(path)
+    if opened is not None:
+        capture, info = opened
+        return info, _read_opencv(capture, info, sample_fps, max_frames)
+
+    return _open_ffmpeg(path, sample_fps, max_frames)
+
+def probe_video(path: str) -> VideoInfo:
+    """
+    Read a video's properties without decoding it
+
+    Raises:
+        InvalidFrameError: if neither decoder can read the file
+    """
+    opened = _open_opencv(path)
+    if opened is not None:
+        capture, info = opened
+        capture.release()
+        return info
+
+    info, frames = _open_ffmpeg(path, 0.0, 1)
+    # Run the reader to its end so the ffmpeg process is closed
+    for _ in frames:
+        pass
+    return info
+
+def read_frames(path: str, indices: Sequence[int]) -> Tuple[VideoInfo, Iterator[VideoFrame]]:
+    """
+    Decode only the frames at the given ascending indices
+
+    With OpenCV, gaps longer than SEEK_MIN_GAP frames are skipped by seeking;
+    shorter ones are grabbed through. The ffmpeg fallback can't seek by frame
+    number and decodes its way through the gaps.
+
+    Raises:
+        InvalidFrameError: if neither decoder can read the file
+    """
+    opened = _open_opencv(path)
+    if opened is not None:
+        capture, info = opened
+        return info, _read_opencv_indices(capture, info, indices)
+
+    info, frames = _open_ffmpeg(path, 0.0, None)
+    return info, _select_indices(frames, indices)
+
+def _open_opencv(path: str) -> Optional[Tuple[cv2.VideoCapture, VideoInfo]]:
+    """Open a video with OpenCV, or None if it can't read it"""
+    capture = cv2.VideoCapture(path)
+    if capture.isOpened():
+        info = VideoInfo(
+            width=int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(capture.get(cv2.CAP_PROP_FPS) or 0.0),
+            frame_count=max(0, int(capture.get(cv2.CAP_PROP_FRAME_COUNT))),
+            decoder="opencv"
+        )
+        if info.width > 0 and info.height > 0:
+            return capture, info
+    capture.release()
+    return None
+
+def _read_opencv(
+    capture: cv2.VideoCapture,
+    info: VideoInfo,
+    sample_fps: float,
+    max_frames: Optional[int]
+) -> Iterator[VideoFrame]:
+    """Yield sampled frames; skipped frames are only grabbed, not converted"""
+    interval = 1.0 / sample_fps if sample_fps > 0 else 0.0
+    next_time = 0.0
+    yielded = 0
+    index = 0
+    try:
+        while max_frames is None or yielded < max_frames:
+            if not capture.grab():
+                break
+            if info.fps > 0:
+                timestamp = index / info.fps
+            else:
+                timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+            # Small tolerance so 30 fps sampled at 10 fps keeps every third frame
+            if timestamp + 1e-6 >= next_time:
+                ok, image = capture.retrieve()
+                if not ok:
+                    break
+                yield VideoFrame(index, timestamp, image)
+                yielded += 1
+                next_time += interval
+            index += 1
+    finally:
+        capture.release()
+
+def _read_opencv_indices(
+    capture: cv2.VideoCapture,
+    info: VideoInfo,
+    indices: Sequence[int]
+) -> Iterator[VideoFrame]:
+    """Yield the frames at ascending indices, seeking over long gaps"""
+    position = 0
+    try:
+        for index in indices:
+            if index < position:
+                continue
+            if index - position > SEEK_MIN_GAP:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+                position = index
+            while position < index:
+                if not capture.grab():
+                    return
+                position += 1
+            ok, image = capture.read()
+            if not ok:
+                return
+            position += 1
+            yield VideoFrame(index, index / info.fps if info.fps > 0 else 0.0, image)
+    finally:
+        capture.release()
+
+def _select_indices(frames: Iterator[VideoFrame], indices: Sequence[int]) -> Iterator[VideoFrame]:
+    """Keep the frames at the given indices from a sequential reader"""
+    wanted = set(indices)
+    last = max(wanted, default=-1)
+    try:
+        for frame in frames:
+            if frame.index > last:
+                break
+            if frame.index in wanted:
+                yield frame
+    finally:
+        frames.close()
+
+def _open_ffmpeg(
+    path: str,
+    sample_fps: float,
+    max_frames: Optional[int]
+) -> Tuple[VideoInfo, Iterator[VideoFrame]]:
+    """Open a video through the ffmpeg binary bundled with imageio_ffmpeg"""
+    try:
+        import imageio_ffmpeg
+    except ImportError:
+        raise InvalidFrameError("Could not open video with OpenCV and imageio_ffmpeg is not installed")
+
+    # ffmpeg does the sampling itself, so dropped frames never reach Python
+    output_params = ["-vf", f"fps={sample_fps}"] if sample_fps > 0 else None
+    reader = imageio_ffmpeg.read_frames(path, pix_fmt="bgr24", output_params=output_params)
+    try:
+        meta = next(reader)
+    except Exception as e:
+        reader.close()
+        raise InvalidFrameError(f"Could not decode video: {e}")
+
+    width, height = meta["size"]
+    fps = float(meta.get("fps") or 0.0)
+    duration = float(meta.get("duration") or 0.0)
+    info = VideoInfo(width, height, fps, int(round(duration * fps)), "ffmpeg")
+    return info, _read_ffmpeg(reader, info, sample_fps, max_frames)
+
+def _read_ffmpeg(
+    reader: Iterator[bytes],
+    info: VideoInfo,
+    sample_fps: float,
+    max_frames: Optional[int]
+) -> Iterator[VideoFrame]:
+    """Yield frames from an imageio_ffmpeg reader as BGR arrays"""
+    frame_rate = sample_fps if sample_fps > 0 else info.fps
+    try:
+        for i, data in enumerate(reader):
+            if max_frames is not None and i >= max_frames:
+                break
+            timestamp = i / frame_rate if frame_rate > 0 else 0.0
+            image = np.frombuffer(data, dtype=np.uint8).reshape(info.height, info.width, 3)
+            yield VideoFrame(int(round(timestamp * info.fps)), timestamp, image)
+    finally:
+        reader.close()
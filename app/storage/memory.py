@@ -48,6 +48,6 @@ class InMemoryStorage(StorageInterface):
     
     async def delete_pattern(self, pattern: str):
         """Delete all keys matching pattern"""
-        keys_to_delete = list(self.get_pattern(pattern).keys())
+        keys_to_delete = list((await self.get_pattern(pattern)).keys())
         for key in keys_to_delete:
             await self.delete(key)
\ No newline at end of file
@@ -14,6 +14,10 @@ class AnalysisError(ROMAnalysisError):
     """General analysis error"""
     pass
 
+class InferenceQueueFullError(ROMAnalysisError):
+    """Inference executor has no room for more frames"""
+    pass
+
 class InvalidFrameError(ROMAnalysisError):
     """Invalid frame data"""
     pass
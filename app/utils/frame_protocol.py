@@ -0,0 +1,157 @@
+import struct
+from typing import Any, Dict, NamedTuple, Tuple, Union
+
+import cv2
+import numpy as np
+
+from app.utils.exceptions import InvalidFrameError
+
+# Binary WebSocket frame: a fixed little-endian header followed by the encoded image (JPEG/PNG)
+#   uint32   seq        client sequence number, echoed in the result
+#   float64  client_ts  client timestamp (e.g. performance.now() in ms), echoed in the result
+#   uint16   flags      FLAG_* bits
+#   uint16   reserved   must be 0
+FRAME_HEADER = struct.Struct("<IdHH")
+
+FLAG_INCLUDE_KEYPOINTS = 0x1  # Include keypoints for this frame even if the stream config doesn't
+
+FRAME_FORMATS = ("base64", "binary")
+
+# Raw pixel frame, usable wherever encoded image bytes are accepted (binary
+# WebSocket payload, multipart upload): a fixed little-endian header followed
+# by the pixel rows
+#   char[4]  magic         b"RAWF"
+#   uint32   width
+#   uint32   height
+#   uint32   stride        bytes per row (of the Y plane for NV12)
+#   uint8    pixel_format  PIXEL_FORMATS value
+#   uint8[3] reserved
+RAW_FRAME_MAGIC = b"RAWF"
+RAW_FRAME_HEADER = struct.Struct("<4sIIIB3x")
+
+# Pixel format -> (name, bytes per pixel of the first plane, conversion to BGR or None)
+PIXEL_FORMATS = {
+    0: ("bgr", 3, None),
+    1: ("rgb", 3, cv2.COLOR_RGB2BGR),
+    2: ("bgra", 4, cv2.COLOR_BGRA2BGR),
+    3: ("rgba", 4, cv2.COLOR_RGBA2BGR),
+    4: ("gray", 1, cv2.COLOR_GRAY2BGR),
+    5: ("nv12", 1, cv2.COLOR_YUV2BGR_NV12),
+}
+
+class BinaryFrameHeader(NamedTuple):
+    """Header fields of a binary WebSocket frame"""
+    seq: int
+    client_ts: float
+    flags: int
+
+def parse_binary_frame(message: bytes) -> Tuple[BinaryFrameHeader, memoryview]:
+    """
+    Split a binary WebSocket message into its header and image payload
+
+    Returns:
+        Tuple of (header, payload); the payload is a view into message, not a copy
+
+    Raises:
+        InvalidFrameError: if the message is too short to hold a header and an image
+    """
+    if len(message) <= FRAME_HEADER.size:
+        raise InvalidFrameError(
+            f"Binary frame must be a {FRAME_HEADER.size} byte header followed by image data "
+            f"(got {len(message)} bytes)"
+        )
+    seq, client_ts, flags, _ = FRAME_HEADER.unpack_from(message)
+    return BinaryFrameHeader(seq, client_ts, flags), memoryview(message)[FRAME_HEADER.size:]
+
+def pack_binary_frame(seq: int, client_ts: float, payload: bytes, flags: int = 0) -> bytes:
+    """Build a binary WebSocket message (client side, benchmarks and tests)"""
+    return FRAME_HEADER.pack(seq, client_ts, flags, 0) + payload
+
+def is_raw_frame(data: Union[bytes, bytearray, memoryview]) -> bool:
+    """Check if a payload is a raw pixel frame rather than an encoded image"""
+    return bytes(data[:len(RAW_FRAME_MAGIC)]) == RAW_FRAME_MAGIC
+
+def parse_raw_frame(data: Union[bytes, bytearray, memoryview]) -> np.ndarray:
+    """
+    Wrap a raw pixel frame as a BGR image
+
+    BGR frames are returned as a (possibly strided) view of the payload, without
+    copying. Other pixel formats are converted to BGR with OpenCV.
+
+    Raises:
+        InvalidFrameError: if the header is invalid or the payload is too short
+    """
+    if len(data) < RAW_FRAME_HEADER.size:
+        raise InvalidFrameError(f"Raw frame header must be {RAW_FRAME_HEADER.size} bytes")
+    _, width, height, stride, pixel_format = RAW_FRAME_HEADER.unpack_from(data)
+    if pixel_format not in PIXEL_FORMATS:
+        raise InvalidFrameError(f"Unknown raw pixel format: {pixel_format}")
+    name, bytes_per_pixel, conversion = PIXEL_FORMATS[pixel_format]
+
+    if width == 0 or height == 0 or stride < width * bytes_per_pixel:
+        raise InvalidFrameError(f"Invalid raw frame geometry: {width}x{height}, stride {stride}")
+    if name == "nv12" and (width % 2 or height % 2):
+        raise InvalidFrameError(f"NV12 frames need even dimensions, got {width}x{height}")
+
+    # NV12 has a half-height interleaved UV plane below the Y plane
+    rows = height * 3 // 2 if name == "nv12" else height
+    # The last row doesn't need its stride padding
+    expected = stride * (rows - 1) + width * bytes_per_pixel
+    payload = memoryview(data)[RAW_FRAME_HEADER.size:]
+    if len(payload) < expected:
+        raise InvalidFrameError(
+            f"Raw {name} frame {width}x{height} needs {expected} payload bytes, got {len(payload)}"
+        )
+
+    channels = (bytes_per_pixel,) if bytes_per_pixel > 1 else ()
+    pixels = np.ndarray(
+        shape=(rows, width) + channels,
+        dtype=np.uint8,
+        buffer=payload,
+        strides=(stride, bytes_per_pixel) + ((1,) if channels else ())
+    )
+    if conversion is None:
+        return pixels
+    return cv2.cvtColor(pixels, conversion)
+
+def pack_raw_frame(image: np.ndarray, pixel_format: str = "bgr") -> bytes:
+    """Build a raw frame from a packed image (client side, benchmarks and tests)"""
+    codes = {name: code for code, (name, _, _) in PIXEL_FORMATS.items()}
+    height, width = image.shape[:2]
+    if pixel_format == "nv12":
+        # The Y plane is the first two thirds of the rows
+        height = height * 2 // 3
+    stride = image.strides[0]
+    return RAW_FRAME_HEADER.pack(RAW_FRAME_MAGIC, width, height, stride, codes[pixel_format]) + image.tobytes()
+
+def describe_raw_frame() -> Dict[str, Any]:
+    """Raw pixel frame layout, sent alongside the binary frame description"""
+    return {
+        "byte_order": "little",
+        "header_size": RAW_FRAME_HEADER.size,
+        "fields": [
+            {"name": "magic", "type": "char[4]", "value": RAW_FRAME_MAGIC.decode()},
+            {"name": "width", "type": "uint32"},
+            {"name": "height", "type": "uint32"},
+            {"name": "stride", "type": "uint32"},
+            {"name": "pixel_format", "type": "uint8"},
+            {"name": "reserved", "type": "uint8[3]"}
+        ],
+        "pixel_formats": {name: code for code, (name, _, _) in PIXEL_FORMATS.items()}
+    }
+
+def describe_binary_frame() -> Dict[str, Any]:
+    """Header layout sent to clients that negotiate the binary frame format"""
+    return {
+        "byte_order": "little",
+        "header_size": FRAME_HEADER.size,
+        "fields": [
+            {"name": "seq", "type": "uint32"},
+            {"name": "client_ts", "type": "float64"},
+            {"name": "flags", "type": "uint16"},
+            {"name": "reserved", "type": "uint16"}
+        ],
+        "flags": {"include_keypoints": FLAG_INCLUDE_KEYPOINTS},
+        "payload": "JPEG or PNG bytes, or a raw pixel frame",
+        "raw_frame": describe_raw_frame()
+    }
@@ -0,0 +1,86 @@
+from typing import Any, Dict
+
+# Stream result modes ("result_mode" in the stream config)
+#   full   every result is the complete analysis response
+#   delta  the static context is sent once in the ready message; each result is a
+#          JSON Merge Patch (RFC 7396) against the previous one
+RESULT_MODES = ("full", "delta")
+
+# Sent with every delta result and never part of the delta state
+DELTA_FRAME_FIELDS = frozenset(("status", "frame_number", "seq", "client_ts", "keypoints"))
+
+# Not sent in delta mode (skeleton_connections is in the ready message)
+DELTA_OMITTED_FIELDS = frozenset(("timestamp", "frame_id", "skeleton_connections"))
+
+_MISSING = object()
+
+def merge_patch(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON Merge Patch that turns previous into current
+
+    Nested dicts are diffed key by key; lists and scalars are replaced when they
+    differ. Removed keys are set to None, so values must never be None themselves:
+    results leave optional fields out instead (frame_metrics.qos, for one, omits
+    the steps its level doesn't degrade).
+    """
+    patch = {}
+    matched = 0
+    for key, value in current.items():
+        old = previous.get(key, _MISSING)
+        if old is _MISSING:
+            patch[key] = value
+            continue
+        matched += 1
+        # Unchanged subtrees are skipped by one comparison
+        if old == value:
+            continue
+        if isinstance(value, dict) and isinstance(old, dict):
+            patch[key] = merge_patch(old, value)
+        else:
+            patch[key] = value
+    if matched < len(previous):
+        for key in previous:
+            if key not in current:
+                patch[key] = None
+    return patch
+
+def apply_merge_patch(target: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a merge patch to a copy of target (what a client does with each delta result)"""
+    result = dict(target)
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict):
+            base = result.get(key)
+            result[key] = apply_merge_patch(base if isinstance(base, dict) else {}, value)
+        else:
+            result[key] = value
+    return result
+
+
+class ResultDelta:
+    """
+    Delta state of one stream connection
+
+    The first result is diffed against the context sent in the ready message,
+    every later one against its predecessor. Clients start from the context and
+    apply each result with apply_merge_patch (after taking out DELTA_FRAME_FIELDS,
+    which only hold for their own frame).
+    """
+
+    def __init__(self, context: Dict[str, Any]):
+        self.context = context
+        self._state = context
+
+    def encode(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Delta result for the next analysis response of the stream"""
+        delta = {}
+        current = {}
+        for key, value in result.items():
+            if key in DELTA_FRAME_FIELDS:
+                delta[key] = value
+            elif key not in DELTA_OMITTED_FIELDS:
+                current[key] = value
+        delta.update(merge_patch(self._state, current))
+        self._state = current
+        return delta
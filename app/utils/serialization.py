@@ -0,0 +1,257 @@
+import json
+import struct
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from fastapi import WebSocket
+from fastapi.responses import Response
+
+from physiotrack_core.keypoint_set import KeypointSet
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# WebSocket frame type JSON results are sent in ("result_frame" in the stream config)
+RESULT_FRAMES = ("text", "binary")
+
+# WebSocket result encodings ("result_encoding"); msgpack and packed are always binary frames
+#   json     UTF-8 JSON
+#   msgpack  MessagePack of the same structure
+#   packed   fixed little-endian header, then (if the result has keypoints) a validity
+#            bitmask and float32 [x, y] for every keypoint in model order, then the
+#            remaining fields as UTF-8 JSON
+RESULT_ENCODINGS = ("json", "msgpack", "packed")
+
+#   char[4]  magic         b"ROMR"
+#   uint8    version
+#   uint8    flags         RESULT_FLAG_* bits
+#   uint16   keypoint_count  (0 without keypoints)
+#   uint32   seq           0 unless RESULT_FLAG_SEQ
+#   float64  client_ts     0 unless RESULT_FLAG_CLIENT_TS
+#   uint32   frame_number  0 unless RESULT_FLAG_FRAME_NUMBER
+PACKED_RESULT_MAGIC = b"ROMR"
+PACKED_RESULT_VERSION = 1
+PACKED_RESULT_HEADER = struct.Struct("<4sBBHIdI")
+
+RESULT_FLAG_KEYPOINTS = 0x1
+RESULT_FLAG_SEQ = 0x2
+RESULT_FLAG_CLIENT_TS = 0x4
+RESULT_FLAG_FRAME_NUMBER = 0x8
+
+# Sent once in the ready message instead of with every packed result
+PACKED_HEADER_FIELDS = ("seq", "client_ts", "frame_number", "keypoints", "skeleton_connections")
+
+# NumPy arrays and scalars (np.float32 angles, keypoint coordinates) are written natively
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+def _default(value: Any) -> Any:
+    """Types neither serializer handles natively"""
+    if isinstance(value, KeypointSet):
+        return value.as_response()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(data: Any) -> bytes:
+    """
+    Serialize an analysis response to UTF-8 JSON in one pass
+
+    Uses orjson when installed (stdlib json otherwise). The response dict is
+    written as is; unlike FastAPI's jsonable_encoder nothing is copied first.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(data, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+class AnalysisJSONResponse(Response):
+    """
+    JSON response that skips FastAPI's jsonable_encoder
+
+    Endpoints return an instance directly (return AnalysisJSONResponse(result))
+    so the dict goes straight to dumps.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+async def send_json_message(websocket: WebSocket, data: Any, binary: bool = False):
+    """
+    Send a JSON message over a WebSocket
+
+    Binary frames carry the serialized bytes as is; text frames (the default,
+    for clients that JSON.parse(event.data)) need one UTF-8 decode.
+    """
+    payload = dumps(data)
+    if binary:
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload.decode("utf-8"))
+
+
+class ResultEncoder:
+    """
+    Encodes the messages of one WebSocket connection in its negotiated result encoding
+
+    Raises:
+        ValueError: for an unknown encoding, or msgpack when it isn't installed
+    """
+
+    def __init__(
+        self,
+        encoding: str = "json",
+        binary_frames: bool = False,
+        keypoint_names: Optional[List[str]] = None
+    ):
+        if encoding not in RESULT_ENCODINGS:
+            raise ValueError(
+                f"Unsupported result_encoding: {encoding} (available: {', '.join(RESULT_ENCODINGS)})"
+            )
+        if encoding == "msgpack" and msgpack is None:
+            raise ValueError("result_encoding msgpack needs the msgpack package")
+        self.encoding = encoding
+        self.binary_frames = binary_frames or encoding != "json"
+        self.keypoint_names = list(keypoint_names or [])
+        self._keypoint_index = {name: i for i, name in enumerate(self.keypoint_names)}
+        self._keypoint_names = tuple(self.keypoint_names)
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        """Serialize one message"""
+        if self.encoding == "msgpack":
+            return msgpack.packb(data, default=_default, use_bin_type=True)
+        if self.encoding == "packed":
+            return self._encode_packed(data)
+        return dumps(data)
+
+    def _encode_packed(self, data: Dict[str, Any]) -> bytes:
+        """Header + keypoint block + JSON of the remaining fields"""
+        keypoints = data.get("keypoints")
+        flags = 0
+        parts = []
+
+        if keypoints and self.keypoint_names:
+            flags |= RESULT_FLAG_KEYPOINTS
+            count = len(self.keypoint_names)
+            if isinstance(keypoints, KeypointSet):
+                if keypoints.layout.names[:count] == self._keypoint_names:
+                    # Same layout: the set's arrays are the keypoint block
+                    valid = keypoints.valid & ((1 << count) - 1)
+                    parts.append(valid.to_bytes((count + 7) // 8, "little"))
+                    parts.append(keypoints.coords[:count].astype("<f4", copy=False).tobytes())
+                    keypoints = None
+                else:
+                    keypoints = keypoints.as_response()
+        else:
+            count = 0
+
+        if keypoints and count:
+            coords = [0.0] * (count * 2)
+            valid = 0
+            for name, point in keypoints.items():
+                i = self._keypoint_index.get(name)
+                if i is not None:
+                    coords[2 * i] = point["x"]
+                    coords[2 * i + 1] = point["y"]
+                    valid |= 1 << i
+            parts.append(valid.to_bytes((count + 7) // 8, "little"))
+            parts.append(np.array(coords, dtype="<f4").tobytes())
+
+        seq = data.get("seq")
+        if seq is not None:
+            flags |= RESULT_FLAG_SEQ
+        client_ts = data.get("client_ts")
+        if client_ts is not None:
+            flags |= RESULT_FLAG_CLIENT_TS
+        frame_number = data.get("frame_number")
+        if frame_number is not None:
+            flags |= RESULT_FLAG_FRAME_NUMBER
+        header = PACKED_RESULT_HEADER.pack(
+            PACKED_RESULT_MAGIC, PACKED_RESULT_VERSION, flags, count,
+            seq or 0, client_ts or 0.0, frame_number or 0
+        )
+        rest = {key: value for key, value in data.items() if key not in PACKED_HEADER_FIELDS}
+        return b"".join([header, *parts, dumps(rest)])
+
+    async def send(self, websocket: WebSocket, data: Dict[str, Any]):
+        """Encode and send one message"""
+        payload = self.encode(data)
+        if self.binary_frames:
+            await websocket.send_bytes(payload)
+        else:
+            await websocket.send_text(payload.decode("utf-8"))
+
+    def describe(self, skeleton_connections: Optional[List[List[str]]] = None) -> Dict[str, Any]:
+        """Encoding description sent in the ready message"""
+        description: Dict[str, Any] = {
+            "encoding": self.encoding,
+            "frame": "binary" if self.binary_frames else "text"
+        }
+        if self.encoding == "packed":
+            description.update({
+                "byte_order": "little",
+                "header_size": PACKED_RESULT_HEADER.size,
+                "fields": [
+                    {"name": "magic", "type": "char[4]", "value": PACKED_RESULT_MAGIC.decode()},
+                    {"name": "version", "type": "uint8", "value": PACKED_RESULT_VERSION},
+                    {"name": "flags", "type": "uint8"},
+                    {"name": "keypoint_count", "type": "uint16"},
+                    {"name": "seq", "type": "uint32"},
+                    {"name": "client_ts", "type": "float64"},
+                    {"name": "frame_number", "type": "uint32"}
+                ],
+                "flags": {
+                    "keypoints": RESULT_FLAG_KEYPOINTS,
+                    "seq": RESULT_FLAG_SEQ,
+                    "client_ts": RESULT_FLAG_CLIENT_TS,
+                    "frame_number": RESULT_FLAG_FRAME_NUMBER
+                },
+                "keypoints": "uint8[ceil(keypoint_count / 8)] validity bitmask (LSB first), "
+                             "then float32[keypoint_count][2] x, y",
+                "keypoint_names": self.keypoint_names,
+                "skeleton_connections": skeleton_connections or [],
+                "tail": "UTF-8 JSON with the remaining fields"
+            })
+        return description
+
+
+def decode_packed_result(payload: bytes, keypoint_names: List[str]) -> Dict[str, Any]:
+    """Decode a packed result back to the JSON structure (clients, benchmarks and tests)"""
+    magic, _, flags, count, seq, client_ts, frame_number = PACKED_RESULT_HEADER.unpack_from(payload)
+    if magic != PACKED_RESULT_MAGIC:
+        raise ValueError("Not a packed result")
+    offset = PACKED_RESULT_HEADER.size
+    keypoints = None
+    if flags & RESULT_FLAG_KEYPOINTS:
+        mask_size = (count + 7) // 8
+        valid = np.unpackbits(np.frombuffer(payload, np.uint8, mask_size, offset), bitorder="little")[:count]
+        offset += mask_size
+        coords = np.frombuffer(payload, "<f4", count * 2, offset).reshape(count, 2)
+        offset += coords.nbytes
+        keypoints = {
+            name: {"x": float(x), "y": float(y)}
+            for name, (x, y), ok in zip(keypoint_names, coords, valid) if ok
+        }
+
+    data = json.loads(payload[offset:])
+    if flags & RESULT_FLAG_FRAME_NUMBER:
+        data["frame_number"] = frame_number
+    if flags & RESULT_FLAG_SEQ:
+        data["seq"] = seq
+    if flags & RESULT_FLAG_CLIENT_TS:
+        data["client_ts"] = client_ts
+    if keypoints is not None:
+        data["keypoints"] = keypoints
+    return data
@@ -3,5 +3,7 @@ Simplified PhysioTrack core for API usage
 """
 from .pose_detection import PoseDetector
 from .angle_computation import calculate_angle_between_points
+from .angle_engine import AngleEngine
+from .keypoint_set import KeypointSet
 
-__all__ = ['PoseDetector', 'calculate_angle_between_points']
\ No newline at end of file
+__all__ = ['PoseDetector', 'calculate_angle_between_points', 'AngleEngine', 'KeypointSet']
\ No newline at end of file
@@ -5,6 +5,8 @@ Includes ALL angle calculation strategies from
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Union
 
+from .keypoint_set import KeypointSet
+
 # Complete angle definitions from 
 ANGLE_DEFINITIONS = {
     # Joint angles
@@ -269,6 +271,14 @@ def fixed_angles(points_list: List[np.ndarray], angle_name: str) -> float:
     
     return float(ang)
 
+def has_keypoints(keypoints: Dict[str, np.ndarray], names: List[str]) -> bool:
+    """
+    Check that all named keypoints are present (one bitmask test for a KeypointSet)
+    """
+    if isinstance(keypoints, KeypointSet):
+        return keypoints.has_all(names)
+    return all(name in keypoints for name in names)
+
 def compute_angle(
     angle_name: str,
     keypoints: Dict[str, np.ndarray],
@@ -284,7 +294,7 @@ def compute_angle(
     required_points = angle_def['points']
     
     # Check if all required keypoints are present
-    if not all(pt in keypoints for pt in required_points):
+    if not has_keypoints(keypoints, required_points):
         return np.nan
     
     # Get points
@@ -305,7 +315,7 @@ def apply_flip_correction(
     Apply left/right flip correction for consistent angle measurement
     """
     # Check foot direction if available
-    if all(k in keypoints for k in ['LBigToe', 'LHeel', 'RBigToe', 'RHeel']):
+    if has_keypoints(keypoints, ['LBigToe', 'LHeel', 'RBigToe', 'RHeel']):
         left_foot_dir = keypoints['LBigToe'][0] - keypoints['LHeel'][0]
         right_foot_dir = keypoints['RBigToe'][0] - keypoints['RHeel'][0]
         
@@ -369,15 +379,19 @@ def mean_angles(angles_list: List[float]) -> float:
 def add_virtual_keypoints(keypoints: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
     """
     Add computed keypoints like Neck and Hip if not present
+    
+    A KeypointSet already holds them and is returned as is.
     """
+    if isinstance(keypoints, KeypointSet):
+        return keypoints
     keypoints = keypoints.copy()
     
     # Add Neck if not present
-    if 'Neck' not in keypoints and all(k in keypoints for k in ['LShoulder', 'RShoulder']):
+    if 'Neck' not in keypoints and has_keypoints(keypoints, ['LShoulder', 'RShoulder']):
         keypoints['Neck'] = (keypoints['LShoulder'] + keypoints['RShoulder']) / 2
     
     # Add Hip if not present
-    if 'Hip' not in keypoints and all(k in keypoints for k in ['LHip', 'RHip']):
+    if 'Hip' not in keypoints and has_keypoints(keypoints, ['LHip', 'RHip']):
         keypoints['Hip'] = (keypoints['LHip'] + keypoints['RHip']) / 2
     
     return keypoints
\ No newline at end of file
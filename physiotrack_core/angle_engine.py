@@ -0,0 +1,227 @@
+"""
+Vectorized angle engine for PhysioTrack
+Compiles ANGLE_DEFINITIONS into index arrays over a keypoint layout so all
+angles of many frames are evaluated in a few NumPy operations
+"""
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+from .angle_computation import ANGLE_DEFINITIONS
+from .keypoint_set import VIRTUAL_POINTS, KeypointSet, keypoint_layout
+from .pose_detection import keypoint_names_for
+
+# Angles normalized to [-90, 90] instead of [-180, 180]
+HALF_RANGE_ANGLES = ('pelvis', 'shoulders')
+
+# Feet decide whether left/right x coordinates are flipped (see apply_flip_correction)
+FOOT_POINTS = ('LBigToe', 'LHeel', 'RBigToe', 'RHeel')
+
+# Point order within a definition for (u_from, u_to, v_from, v_to):
+#   2 points a, b:       u = a - b, v = a - a (zero vector, direction 0 = horizontal)
+#   3 points a, b, c:    u = a - b, v = c - b
+#   4 points a, b, c, d: u = b - a, v = d - c
+SLOT_ORDER = {2: (1, 0, 0, 0), 3: (1, 0, 1, 2), 4: (0, 1, 2, 3)}
+
+class AngleEngine:
+    """
+    ANGLE_DEFINITIONS compiled for one keypoint layout
+    
+    Every angle is the difference between the directions of two vectors
+    u = P[u_to] - P[u_from] and v = P[v_to] - P[v_from], plus the
+    definition's offset and scale and the same normalization as
+    fixed_angles. Missing Neck and Hip are computed from the shoulders and
+    hips as in keypoints_to_dict. Results match calculate_all_angles on the
+    equivalent keypoint dict; missing keypoints are NaN and make every angle
+    that uses them NaN.
+    """
+    
+    def __init__(
+        self,
+        keypoint_names: Optional[Sequence[str]] = None,
+        angle_names: Optional[Sequence[str]] = None,
+        flip_left_right: bool = True
+    ):
+        """
+        Args:
+            keypoint_names: Keypoint layout of the input arrays (HALPE_26 if None)
+            angle_names: Angles to evaluate, in output order (all of ANGLE_DEFINITIONS if None)
+            flip_left_right: Apply the foot-direction flip correction like compute_angle
+        """
+        self.keypoint_names = list(keypoint_names) if keypoint_names is not None else keypoint_names_for("body_with_feet")
+        self.angle_names = list(angle_names) if angle_names is not None else list(ANGLE_DEFINITIONS)
+        unknown = [name for name in self.angle_names if name not in ANGLE_DEFINITIONS]
+        if unknown:
+            raise ValueError(f"Unknown angles: {', '.join(unknown)}")
+        self.flip_left_right = flip_left_right
+        
+        self._layout_names = tuple(self.keypoint_names)
+        index = {name: i for i, name in enumerate(self.keypoint_names)}
+        # Points the layout doesn't have (e.g. RIndex in HALPE_26) read a row of NaN
+        self._missing = len(self.keypoint_names)
+        
+        n_angles = len(self.angle_names)
+        self._slots = np.empty((n_angles, 4), dtype=np.intp)
+        self._sided = np.zeros((n_angles, 4), dtype=bool)
+        for i, angle_name in enumerate(self.angle_names):
+            points = ANGLE_DEFINITIONS[angle_name]['points']
+            for slot, k in enumerate(SLOT_ORDER[len(points)]):
+                self._slots[i, slot] = index.get(points[k], self._missing)
+                self._sided[i, slot] = points[k].startswith(('L', 'R'))
+        
+        definitions = [ANGLE_DEFINITIONS[name] for name in self.angle_names]
+        self._offset = np.array([d['offset'] for d in definitions], dtype=np.float64)
+        self._scale = np.array([d['scale'] for d in definitions], dtype=np.float64)
+        self._limit = np.array(
+            [90.0 if name in HALF_RANGE_ANGLES else 180.0 for name in self.angle_names]
+        )
+        
+        self._virtual = [
+            tuple(index[name] for name in names)
+            for names in VIRTUAL_POINTS if all(name in index for name in names)
+        ]
+        self._feet = (
+            np.array([index[name] for name in FOOT_POINTS])
+            if flip_left_right and all(name in index for name in FOOT_POINTS) else None
+        )
+        
+        # Single-set path: usable angles come from the set's bitmask (missing points
+        # read row 0); one gather yields the u and then the v vector of every angle
+        layout = keypoint_layout(self._layout_names)
+        self._point_masks = [layout.mask(ANGLE_DEFINITIONS[name]['points']) for name in self.angle_names]
+        set_slots = np.where(self._slots == self._missing, 0, self._slots)
+        self._vector_points = np.concatenate(
+            [set_slots[:, 1], set_slots[:, 3], set_slots[:, 0], set_slots[:, 2]]
+        )
+        self._point_flip = np.array(
+            [-1.0 if name.startswith(('L', 'R')) else 1.0 for name in self.keypoint_names]
+        )
+        self._foot_indices = [index[name] for name in FOOT_POINTS] if self._feet is not None else None
+        self._angle_constants = list(zip(self._offset.tolist(), self._scale.tolist(), self._limit.tolist()))
+    
+    def evaluate(
+        self,
+        keypoints: np.ndarray,
+        scores: Optional[np.ndarray] = None,
+        confidence_threshold: float = 0.3
+    ) -> np.ndarray:
+        """
+        Evaluate all angles for one or many frames
+        
+        Args:
+            keypoints: Array of shape (n_frames, n_keypoints, 2) or (n_keypoints, 2)
+                in the engine's layout; NaN marks a missing point
+            scores: Optional confidences of shape (n_frames, n_keypoints) or (n_keypoints,);
+                points below confidence_threshold count as missing
+            confidence_threshold: Minimum confidence of a usable point
+        
+        Returns:
+            Angles in degrees of shape (n_frames, n_angles), or (n_angles,) for
+            a single frame, in angle_names order
+        """
+        keypoints = np.asarray(keypoints, dtype=np.float64)
+        single = keypoints.ndim == 2
+        if single:
+            keypoints = keypoints[None]
+        n_frames, n_keypoints = keypoints.shape[0], len(self.keypoint_names)
+        
+        points = np.full((n_frames, n_keypoints + 1, 2), np.nan)
+        points[:, :n_keypoints] = keypoints[:, :n_keypoints, :2]
+        if scores is not None:
+            scores = np.asarray(scores).reshape(n_frames, -1)[:, :n_keypoints]
+            points[:, :n_keypoints][scores < confidence_threshold] = np.nan
+        
+        for target, first, second in self._virtual:
+            absent = np.isnan(points[:, target, 0])
+            if absent.any():
+                points[absent, target] = (points[absent, first] + points[absent, second]) / 2
+        
+        # (n_frames, n_angles, 4 slots, xy)
+        gathered = points[:, self._slots]
+        
+        if self._feet is not None:
+            feet = points[:, self._feet, 0]
+            flip = ~np.isnan(feet).any(axis=1) & (
+                (feet[:, 0] - feet[:, 1] < 0) | (feet[:, 2] - feet[:, 3] < 0)
+            )
+            if flip.any():
+                gathered[..., 0] *= np.where(flip[:, None, None] & self._sided, -1.0, 1.0)
+        
+        u = gathered[:, :, 1] - gathered[:, :, 0]
+        v = gathered[:, :, 3] - gathered[:, :, 2]
+        angles = np.degrees(np.arctan2(u[..., 1], u[..., 0]) - np.arctan2(v[..., 1], v[..., 0]))
+        angles = (angles + self._offset) * self._scale
+        
+        # Same single wrap as fixed_angles
+        angles = np.where(angles > self._limit, angles - 2 * self._limit, angles)
+        angles = np.where(angles < -self._limit, angles + 2 * self._limit, angles)
+        
+        return angles[0] if single else angles
+    
+    def evaluate_set(self, keypoints: KeypointSet) -> np.ndarray:
+        """
+        Evaluate all angles of one KeypointSet
+        
+        Same angles as evaluate on keypoints.as_array() (NaN where points are
+        missing), with a fixed cost low enough for the few angles of a single
+        frame: the set already holds Neck and Hip, usable angles are read from
+        its validity bitmask instead of propagated NaN, and only the vector
+        directions are computed with NumPy, the per-angle constants and wrap
+        on the resulting floats.
+        """
+        if keypoints.layout.names[:len(self._layout_names)] != self._layout_names:
+            return self.evaluate(self.keypoints_array(keypoints))
+        
+        points = keypoints.coords[:len(self._point_flip)].astype(np.float64)
+        
+        if self._foot_indices is not None and keypoints.has_all(FOOT_POINTS):
+            lbig, lheel, rbig, rheel = (float(points[i, 0]) for i in self._foot_indices)
+            if lbig - lheel < 0 or rbig - rheel < 0:
+                points[:, 0] *= self._point_flip
+        
+        # u vectors of all angles, then their v vectors
+        ends = points[self._vector_points]
+        half = len(ends) // 2
+        vectors = ends[:half] - ends[half:]
+        directions = np.degrees(np.arctan2(vectors[:, 1], vectors[:, 0])).tolist()
+        
+        n_angles = len(self.angle_names)
+        valid = keypoints.valid
+        angles = []
+        for i, (offset, scale, limit) in enumerate(self._angle_constants):
+            mask = self._point_masks[i]
+            if mask < 0 or valid & mask != mask:
+                angles.append(np.nan)
+                continue
+            # Same single wrap as fixed_angles
+            angle = (directions[i] - directions[n_angles + i] + offset) * scale
+            if angle > limit:
+                angle -= 2 * limit
+            elif angle < -limit:
+                angle += 2 * limit
+            angles.append(angle)
+        return np.array(angles)
+    
+    def keypoints_array(self, keypoints: Dict[str, np.ndarray]) -> np.ndarray:
+        """Keypoint dict to an (n_keypoints, 2) array in the engine's layout (NaN where missing)"""
+        if isinstance(keypoints, KeypointSet) and keypoints.layout.names == self._layout_names:
+            return keypoints.as_array()
+        array = np.full((len(self.keypoint_names), 2), np.nan)
+        for i, name in enumerate(self.keypoint_names):
+            point = keypoints.get(name)
+            if point is not None:
+                array[i] = point[:2]
+        return array
+    
+    def angles_dict(self, angles: np.ndarray) -> Dict[str, float]:
+        """One frame's angles as a name -> degrees dict without NaN (like calculate_all_angles)"""
+        return {
+            name: float(value)
+            for name, value in zip(self.angle_names, angles.tolist())
+            if not np.isnan(value)
+        }
+    
+    def calculate_all_angles(self, keypoints: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """Drop-in for calculate_all_angles on a keypoint dict"""
+        if isinstance(keypoints, KeypointSet):
+            return self.angles_dict(self.evaluate_set(keypoints))
+        return self.angles_dict(self.evaluate(self.keypoints_array(keypoints)))
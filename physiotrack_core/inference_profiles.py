@@ -0,0 +1,142 @@
+"""
+Named inference profiles for PoseDetector
+Configure backend, runtime threading/optimization and model precision end to end
+"""
+import os
+import logging
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    """Backend and runtime settings applied to both pose pipeline models"""
+    name: str
+    backend: str = "onnxruntime"
+    # Threads per inference call (None = runtime default, i.e. all cores)
+    intra_op_threads: Optional[int] = None
+    inter_op_threads: Optional[int] = None
+    # ONNX Runtime only
+    execution_mode: str = "sequential"  # "sequential" or "parallel"
+    graph_optimization: str = "all"  # "disable", "basic", "extended" or "all"
+    # OpenVINO only
+    performance_hint: str = "LATENCY"  # "LATENCY" or "THROUGHPUT"
+    num_streams: Optional[int] = None
+    # Load INT8 models (see scripts/quantize_models.py) instead of the fp32 ones
+    int8: bool = False
+
+
+PROFILES: Dict[str, InferenceProfile] = {
+    # One request at a time uses every core
+    "cpu-latency": InferenceProfile(
+        name="cpu-latency",
+        inter_op_threads=1
+    ),
+    # Many concurrent requests (INFERENCE_WORKERS ~ cores), each on one core
+    "cpu-throughput": InferenceProfile(
+        name="cpu-throughput",
+        intra_op_threads=1,
+        inter_op_threads=1
+    ),
+    "openvino-latency": InferenceProfile(
+        name="openvino-latency",
+        backend="openvino"
+    ),
+    "openvino-throughput": InferenceProfile(
+        name="openvino-throughput",
+        backend="openvino",
+        performance_hint="THROUGHPUT"
+    ),
+    "openvino-int8": InferenceProfile(
+        name="openvino-int8",
+        backend="openvino",
+        int8=True
+    ),
+}
+
+def get_profile(name: str, intra_op_threads: Optional[int] = None) -> InferenceProfile:
+    """
+    Look up a named profile
+
+    Args:
+        name: Profile name (see PROFILES)
+        intra_op_threads: Optional override of the profile's thread count
+
+    Returns:
+        InferenceProfile
+    """
+    if name not in PROFILES:
+        raise ValueError(f"Unknown inference profile: {name} (available: {', '.join(PROFILES)})")
+
+    profile = PROFILES[name]
+    if intra_op_threads:
+        profile = replace(profile, intra_op_threads=intra_op_threads)
+    return profile
+
+def list_profiles() -> List[str]:
+    """Names of all available profiles"""
+    return list(PROFILES)
+
+def built_by_rtmlib(profile: InferenceProfile) -> bool:
+    """
+    Whether RTMLib's own model setup on the profile's backend already gives the profile
+
+    RTMLib creates ONNX Runtime sessions with default options and compiles
+    OpenVINO models with the LATENCY hint, so such profiles need no rebuild.
+    """
+    if profile.int8 or profile.intra_op_threads or profile.inter_op_threads:
+        return False
+    if profile.backend == "openvino":
+        return profile.performance_hint == "LATENCY" and not profile.num_streams
+    if profile.backend == "onnxruntime":
+        return profile.execution_mode == "sequential" and profile.graph_optimization == "all"
+    return False
+
+def int8_model_path(fp32_path: str, int8_dir: str) -> str:
+    """Location of the INT8 counterpart of an fp32 model file"""
+    return os.path.join(int8_dir, os.path.basename(fp32_path))
+
+def build_onnxruntime_session(model_path: str, profile: InferenceProfile, providers: List):
+    """Create an ONNX Runtime session with the profile's session options"""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    if profile.intra_op_threads:
+        options.intra_op_num_threads = profile.intra_op_threads
+    if profile.inter_op_threads:
+        options.inter_op_num_threads = profile.inter_op_threads
+    options.execution_mode = (
+        ort.ExecutionMode.ORT_PARALLEL if profile.execution_mode == "parallel"
+        else ort.ExecutionMode.ORT_SEQUENTIAL
+    )
+    options.graph_optimization_level = {
+        "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }[profile.graph_optimization]
+
+    return ort.InferenceSession(model_path, sess_options=options, providers=providers)
+
+def compile_openvino_model(model_path: str, profile: InferenceProfile, device: str = "cpu"):
+    """
+    Compile a model with OpenVINO using the profile's performance hints
+
+    Returns:
+        Tuple of (compiled_model, output_layers)
+    """
+    from openvino import Core
+
+    core = Core()
+    model = core.read_model(model=model_path)
+
+    config = {"PERFORMANCE_HINT": profile.performance_hint}
+    if profile.num_streams:
+        config["NUM_STREAMS"] = str(profile.num_streams)
+    if profile.intra_op_threads:
+        config["INFERENCE_NUM_THREADS"] = profile.intra_op_threads
+
+    compiled_model = core.compile_model(model=model, device_name=device.upper(), config=config)
+    outputs = [compiled_model.output(i) for i in range(len(model.outputs))]
+    return compiled_model, outputs
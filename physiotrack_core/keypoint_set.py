@@ -0,0 +1,196 @@
+"""
+Compact keypoint container for PhysioTrack
+One person's keypoints as a contiguous float32 (K, 2) array, a score array
+and a validity bitmask, looked up by name through a layout shared by every
+frame of a model
+"""
+import numpy as np
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Sequence, Tuple
+
+from .pose_detection import keypoint_names_for
+
+# Computed from a point pair when the detector missed them (as in keypoints_to_dict)
+VIRTUAL_POINTS = (('Neck', 'LShoulder', 'RShoulder'), ('Hip', 'LHip', 'RHip'))
+
+class KeypointLayout:
+    """
+    Keypoint names of a model, followed by the virtual points it doesn't output
+    
+    Layouts are interned by keypoint_layout, so sets of the same model share one
+    and can be compared by identity.
+    """
+    
+    __slots__ = ('names', 'index', 'model_size', 'virtual', '_masks')
+    
+    def __init__(self, keypoint_names: Sequence[str]):
+        model_names = tuple(keypoint_names)
+        extra = tuple(target for target, _, _ in VIRTUAL_POINTS if target not in model_names)
+        self.names = model_names + extra
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.model_size = len(model_names)
+        self.virtual = tuple(
+            (self.index[target], self.index[first], self.index[second])
+            for target, first, second in VIRTUAL_POINTS
+            if first in self.index and second in self.index
+        )
+        self._masks = {}
+    
+    def mask(self, names: Sequence[str]) -> int:
+        """Bitmask of the given points (-1, never satisfied, if the layout lacks one)"""
+        key = tuple(names)
+        mask = self._masks.get(key)
+        if mask is None:
+            if all(name in self.index for name in key):
+                mask = sum(1 << self.index[name] for name in set(key))
+            else:
+                mask = -1
+            self._masks[key] = mask
+        return mask
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __repr__(self) -> str:
+        return f"KeypointLayout({self.model_size} + {len(self.names) - self.model_size} virtual)"
+
+@lru_cache(maxsize=None)
+def keypoint_layout(keypoint_names: Tuple[str, ...]) -> KeypointLayout:
+    """Shared layout for keypoint names in model output order"""
+    return KeypointLayout(keypoint_names)
+
+@lru_cache(maxsize=None)
+def layout_for_model(model: str) -> KeypointLayout:
+    """Shared layout of a model type (see keypoint_names_for)"""
+    return keypoint_layout(tuple(keypoint_names_for(model)))
+
+
+class KeypointSet(Mapping):
+    """
+    Confidence-filtered keypoints of one person
+    
+    Reads like the name -> coordinates dicts of keypoints_to_dict (`in`, `[]`,
+    get, items, len) and holds the same points, including computed Neck and
+    Hip, but is built with a few array operations per frame instead of one dict
+    entry per point. Values are float32 views into coords; a set is never
+    modified after construction, so it can be shared between results and cached.
+    """
+    
+    __slots__ = ('layout', 'coords', 'scores', 'valid')
+    
+    def __init__(self, layout: KeypointLayout, coords: np.ndarray, scores: np.ndarray, valid: int):
+        """
+        Args:
+            layout: Names of the rows of coords and scores
+            coords: float32 array of shape (len(layout), 2)
+            scores: float32 array of shape (len(layout),); virtual points score 0
+            valid: Bitmask of usable points, bit i for row i
+        """
+        self.layout = layout
+        self.coords = coords
+        self.scores = scores
+        self.valid = valid
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        layout: KeypointLayout,
+        keypoints: np.ndarray,
+        scores: np.ndarray,
+        confidence_threshold: float = 0.3
+    ) -> 'KeypointSet':
+        """
+        Build from one person's detector output
+        
+        Args:
+            layout: Layout of the model that produced the keypoints
+            keypoints: Array of shape (n_keypoints, 2) in model output order
+            scores: Array of shape (n_keypoints,)
+            confidence_threshold: Minimum confidence to include keypoint
+        """
+        size = len(layout.names)
+        n = min(layout.model_size, len(scores), len(keypoints))
+        
+        coords = np.zeros((size, 2), dtype=np.float32)
+        coords[:n] = keypoints[:n, :2]
+        point_scores = np.zeros(size, dtype=np.float32)
+        point_scores[:n] = scores[:n]
+        
+        mask = np.zeros(size, dtype=bool)
+        mask[:n] = scores[:n] >= confidence_threshold
+        for target, first, second in layout.virtual:
+            if not mask[target] and mask[first] and mask[second]:
+                coords[target] = (coords[first] + coords[second]) / 2
+                mask[target] = True
+        
+        valid = int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+        return cls(layout, coords, point_scores, valid)
+    
+    @classmethod
+    def empty(cls, layout: KeypointLayout) -> 'KeypointSet':
+        """Set without usable points"""
+        size = len(layout.names)
+        return cls(layout, np.zeros((size, 2), dtype=np.float32), np.zeros(size, dtype=np.float32), 0)
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        i = self.layout.index.get(name)
+        if i is None or not self.valid >> i & 1:
+            raise KeyError(name)
+        return self.coords[i]
+    
+    def __contains__(self, name: Any) -> bool:
+        i = self.layout.index.get(name)
+        return i is not None and bool(self.valid >> i & 1)
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        i = self.layout.index.get(name)
+        if i is None or not self.valid >> i & 1:
+            return default
+        return self.coords[i]
+    
+    def __iter__(self) -> Iterator[str]:
+        valid = self.valid
+        return (name for i, name in enumerate(self.layout.names) if valid >> i & 1)
+    
+    def __len__(self) -> int:
+        return bin(self.valid).count('1')
+    
+    def __bool__(self) -> bool:
+        return self.valid != 0
+    
+    def __repr__(self) -> str:
+        return f"KeypointSet({len(self)}/{len(self.layout.names)} points)"
+    
+    def has_all(self, names: Sequence[str]) -> bool:
+        """Whether every named point is usable, in one bitmask test"""
+        return self.has_mask(self.layout.mask(names))
+    
+    def has_mask(self, mask: int) -> bool:
+        """Whether every point of a layout.mask bitmask is usable"""
+        return mask >= 0 and self.valid & mask == mask
+    
+    def valid_mask(self) -> np.ndarray:
+        """Validity bitmask as a bool array in layout order"""
+        size = len(self.layout.names)
+        packed = np.frombuffer(self.valid.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, count=size, bitorder='little').astype(bool)
+    
+    def as_array(self) -> np.ndarray:
+        """float64 (len(layout), 2) array with NaN for unusable points (AngleEngine input)"""
+        array = self.coords.astype(np.float64)
+        array[~self.valid_mask()] = np.nan
+        return array
+    
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        """Plain name -> coordinates dict, as keypoints_to_dict returns"""
+        return dict(self.items())
+    
+    def as_response(self) -> Dict[str, Dict[str, float]]:
+        """Name -> {"x", "y"} as sent in analysis responses"""
+        valid = self.valid
+        coords = self.coords.tolist()
+        return {
+            name: {"x": coords[i][0], "y": coords[i][1]}
+            for i, name in enumerate(self.layout.names) if valid >> i & 1
+        }
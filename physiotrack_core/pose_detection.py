@@ -2,10 +2,16 @@
 Complete pose detection wrapper for PhysioTrack
 Properly integrated with RTMLib
 """
+import os
 import numpy as np
 from typing import Dict, Tuple, List, Optional
 import logging
 
+from physiotrack_core.inference_profiles import (
+    InferenceProfile, get_profile, int8_model_path, built_by_rtmlib,
+    build_onnxruntime_session, compile_openvino_model
+)
+
 try:
     from rtmlib import PoseTracker, BodyWithFeet, Body, Wholebody
     RTMLIB_AVAILABLE = True
@@ -16,29 +22,30 @@ except ImportError:
 class PoseDetector:
     """Pose detector wrapper with proper RTMLib integration"""
     
-    _instance = None
-    _initialized = False
-    
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-    
     def __init__(
         self, 
         model: str = "body_with_feet",
         mode: str = "performance",  # Changed default to performance
         device: str = "cpu",
         backend: str = "onnxruntime",
-        det_frequency: int = 1
+        det_frequency: int = 1,
+        profile: Optional[str] = None,
+        intra_op_threads: Optional[int] = None,
+        int8_model_dir: str = "models/int8"
     ):
-        # Avoid re-initialization
-        if PoseDetector._initialized:
-            return
-            
         if not RTMLIB_AVAILABLE:
             raise ImportError("RTMLib is not installed. Please install it with: pip install rtmlib")
         
+        # A named profile decides the backend and runtime options
+        self.profile: Optional[InferenceProfile] = None
+        if profile:
+            self.profile = get_profile(profile, intra_op_threads=intra_op_threads)
+            backend = self.profile.backend
+        elif intra_op_threads:
+            self.profile = InferenceProfile(
+                name="custom", backend=backend, intra_op_threads=intra_op_threads, inter_op_threads=1
+            )
+        
         self.model = model
         self.mode = mode
         self.device = device
@@ -57,7 +64,8 @@ class PoseDetector:
         else:
             raise ValueError(f"Unknown model: {model}")
         
-        # Initialize pose tracker
+        # Initialize pose tracker on the profile's backend and device, so profiles
+        # RTMLib can build itself are compiled once
         try:
             self.tracker = PoseTracker(
                 self.ModelClass,
@@ -65,21 +73,72 @@ class PoseDetector:
                 mode=mode,
                 backend=backend,
                 device=device,
-                tracking=False,  # We'll handle tracking separately
+                tracking=False,  # Tracking and detector skipping are per session, see detect(bboxes=...)
                 to_openpose=False
             )
-            PoseDetector._initialized = True
-            logging.info(f"Pose detector initialized with {model} model in {mode} mode on {device}")
+            if self.profile is not None and not built_by_rtmlib(self.profile):
+                self.apply_profile(self.profile, int8_model_dir)
+            logging.info(
+                f"Pose detector initialized with {model} model in {mode} mode on {device}"
+                + (f" (profile {self.profile.name})" if self.profile is not None else "")
+            )
         except Exception as e:
             logging.error(f"Failed to initialize pose tracker: {e}")
             raise
     
-    def detect(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def apply_profile(self, profile: InferenceProfile, int8_model_dir: str = "models/int8"):
+        """
+        Rebuild both model sessions with an inference profile
+        
+        Args:
+            profile: Backend, threading and precision settings
+            int8_model_dir: Directory holding INT8 models named like their fp32 originals
+        """
+        for tool in (self.tracker.det_model, self.tracker.pose_model):
+            # Remember the fp32 file so profiles can be switched back and forth
+            fp32_model = getattr(tool, "fp32_onnx_model", tool.onnx_model)
+            tool.fp32_onnx_model = fp32_model
+            
+            model_path = fp32_model
+            if profile.int8:
+                model_path = int8_model_path(fp32_model, int8_model_dir)
+                if not os.path.exists(model_path):
+                    raise FileNotFoundError(
+                        f"INT8 model not found: {model_path} (create it with scripts/quantize_models.py)"
+                    )
+            
+            if profile.backend == "onnxruntime":
+                providers = (
+                    tool.session.get_providers() if tool.backend == "onnxruntime"
+                    else ["CPUExecutionProvider"]
+                )
+                tool.session = build_onnxruntime_session(model_path, profile, providers)
+            elif profile.backend == "openvino":
+                tool.compiled_model, tool._ov_outputs = compile_openvino_model(
+                    model_path, profile, device=self.device
+                )
+                tool.input_layer = tool.compiled_model.input(0)
+            else:
+                raise ValueError(f"Profiles are not supported for backend: {profile.backend}")
+            
+            tool.onnx_model = model_path
+            tool.backend = profile.backend
+        
+        self.profile = profile
+        self.backend = profile.backend
+    
+    def detect(
+        self,
+        frame: np.ndarray,
+        bboxes: Optional[List[np.ndarray]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Detect poses in frame
         
         Args:
             frame: Input image (BGR format from cv2)
+            bboxes: Optional person boxes (x1, y1, x2, y2) to estimate poses in.
+                When given, the person detector is skipped.
             
         Returns:
             Tuple of (keypoints, scores) arrays
@@ -90,8 +149,11 @@ class PoseDetector:
             return np.array([]), np.array([])
         
         try:
-            # RTMLib returns keypoints and scores
-            keypoints, scores = self.tracker(frame)
+            # Run the stages directly rather than through PoseTracker.__call__,
+            # whose frame counter and last-frame boxes would be shared by every stream
+            if bboxes is None:
+                bboxes = self.tracker.det_model(frame)
+            keypoints, scores = self.tracker.pose_model(frame, bboxes=bboxes)
             
             # Ensure proper output format
             if len(keypoints) == 0:
@@ -102,6 +164,107 @@ class PoseDetector:
             logging.error(f"Pose detection failed: {e}")
             return np.array([]), np.array([])
     
+    def detect_batch(
+        self,
+        frames: List[np.ndarray],
+        bboxes_list: Optional[List[Optional[List[np.ndarray]]]] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Detect poses in several frames, running each model stage as one batched call
+        
+        Args:
+            frames: List of input images (BGR format from cv2)
+            bboxes_list: Optional per-frame person boxes; frames with boxes skip the detector
+            
+        Returns:
+            List of (keypoints, scores) tuples, one per frame, in the same format as detect()
+        """
+        if not RTMLIB_AVAILABLE or len(frames) == 0:
+            return [(np.array([]), np.array([])) for _ in frames]
+        
+        det_model = self.tracker.det_model
+        pose_model = self.tracker.pose_model
+        
+        if bboxes_list is None:
+            bboxes_list = [None] * len(frames)
+        bboxes_list = list(bboxes_list)
+        
+        # Stage 1: person detection on the frames without known boxes
+        det_indices = [i for i, bboxes in enumerate(bboxes_list) if bboxes is None]
+        det_inputs, ratios = [], []
+        for frame_idx in det_indices:
+            det_input, ratio = det_model.preprocess(frames[frame_idx])
+            det_inputs.append(det_input)
+            ratios.append(ratio)
+        
+        det_outputs = self._run_batched(det_model, det_inputs)
+        for frame_idx, outputs, ratio in zip(det_indices, det_outputs, ratios):
+            bboxes_list[frame_idx] = det_model.postprocess(outputs[0], ratio)
+        
+        # Stage 2: pose estimation on every person crop from every frame
+        crops, crop_meta = [], []
+        for frame_idx, (frame, bboxes) in enumerate(zip(frames, bboxes_list)):
+            if len(bboxes) == 0:
+                # Same fallback as RTMPose: use the whole image
+                bboxes = [[0, 0, frame.shape[1], frame.shape[0]]]
+            for bbox in bboxes:
+                crop, center, scale = pose_model.preprocess(frame, bbox)
+                crops.append(crop)
+                crop_meta.append((frame_idx, center, scale))
+        
+        pose_outputs = self._run_batched(pose_model, crops)
+        
+        # Scatter keypoints back to their frames
+        per_frame = [([], []) for _ in frames]
+        for outputs, (frame_idx, center, scale) in zip(pose_outputs, crop_meta):
+            kpts, kpt_scores = pose_model.postprocess(outputs, center, scale)
+            per_frame[frame_idx][0].append(kpts)
+            per_frame[frame_idx][1].append(kpt_scores)
+        
+        return [
+            (np.concatenate(kpts, axis=0), np.concatenate(kpt_scores, axis=0))
+            for kpts, kpt_scores in per_frame
+        ]
+    
+    def _run_batched(self, model, images: List[np.ndarray]) -> List[List[np.ndarray]]:
+        """
+        Run one RTMLib model stage over preprocessed images
+        
+        Uses a single (N, 3, H, W) session call when the ONNX model has a dynamic
+        batch dimension, otherwise falls back to one call per image.
+        
+        Returns:
+            Per-image model outputs, each with a leading batch dimension of 1
+        """
+        if len(images) == 0:
+            return []
+        
+        if len(images) == 1 or not self._supports_batching(model):
+            return [model.inference(img) for img in images]
+        
+        # Same layout conversion as BaseTool.inference, stacked along the batch axis
+        batch = np.ascontiguousarray(
+            np.stack([img.transpose(2, 0, 1) for img in images]),
+            dtype=np.float32
+        )
+        session = model.session
+        outputs = session.run(
+            [out.name for out in session.get_outputs()],
+            {session.get_inputs()[0].name: batch}
+        )
+        
+        return [[out[i:i + 1] for out in outputs] for i in range(len(images))]
+    
+    @staticmethod
+    def _supports_batching(model) -> bool:
+        """Check if a model stage accepts more than one image per call"""
+        if getattr(model, 'backend', None) != 'onnxruntime':
+            return False
+        
+        batch_dim = model.session.get_inputs()[0].shape[0]
+        # Dynamic axes are reported as a symbolic name or None
+        return not isinstance(batch_dim, int)
+    
     def keypoints_to_dict(
         self, 
         keypoints: np.ndarray, 
@@ -119,22 +282,43 @@ class PoseDetector:
         Returns:
             Dictionary mapping keypoint names to coordinates
         """
-        result = {}
-        
-        for i, name in enumerate(self.keypoint_names):
-            if i < len(scores) and scores[i] >= confidence_threshold:
-                result[name] = keypoints[i]
+        return keypoints_to_dict(self.keypoint_names, keypoints, scores, confidence_threshold)
+    
+    @staticmethod
+    def bbox_from_keypoints(
+        keypoints: np.ndarray,
+        scores: np.ndarray,
+        confidence_threshold: float = 0.3,
+        expansion: float = 1.25
+    ) -> Optional[np.ndarray]:
+        """
+        Person box around the confident keypoints of one person, as used by
+        RTMLib's PoseTracker to skip detection on the following frame
         
-        # Add computed keypoints (Neck and Hip)
-        if "Neck" not in result and all(k in result for k in ["LShoulder", "RShoulder"]):
-            result["Neck"] = (result["LShoulder"] + result["RShoulder"]) / 2
+        Args:
+            keypoints: Array of shape (n_keypoints, 2)
+            scores: Array of shape (n_keypoints,)
+            confidence_threshold: Minimum confidence for a keypoint to count
+            expansion: Box expansion ratio around the keypoints
+            
+        Returns:
+            Box as (x1, y1, x2, y2), or None if too few keypoints are confident
+        """
+        points = keypoints[scores >= confidence_threshold]
+        if len(points) < 2:
+            return None
         
-        if "Hip" not in result and all(k in result for k in ["LHip", "RHip"]):
-            result["Hip"] = (result["LHip"] + result["RHip"]) / 2
+        x1, y1 = points.min(axis=0)
+        x2, y2 = points.max(axis=0)
+        if x2 <= x1 or y2 <= y1:
+            return None
         
-        return result
+        center = np.array([x1 + x2, y1 + y2]) / 2
+        half_size = np.array([x2 - x1, y2 - y1]) / 2 * expansion
+        return np.concatenate([center - half_size, center + half_size])
     
-    def _get_halpe26_keypoints(self) -> List[str]:
+    @staticmethod
+    def _get_halpe26_keypoints() -> List[str]:
         """HALPE_26 keypoint names"""
         return [
             "Nose", "LEye", "REye", "LEar", "REar",
@@ -145,7 +329,8 @@ class PoseDetector:
             "LSmallToe", "RSmallToe", "LHeel", "RHeel"
         ]
     
-    def _get_coco17_keypoints(self) -> List[str]:
+    @staticmethod
+    def _get_coco17_keypoints() -> List[str]:
         """COCO_17 keypoint names"""
         return [
             "Nose", "LEye", "REye", "LEar", "REar",
@@ -154,11 +339,76 @@ class PoseDetector:
             "LKnee", "RKnee", "LAnkle", "RAnkle"
         ]
     
-    def _get_coco133_keypoints(self) -> List[str]:
+    @staticmethod
+    def _get_coco133_keypoints() -> List[str]:
         """COCO_133 keypoint names (simplified - main body only)"""
-        return self._get_halpe26_keypoints()
+        return PoseDetector._get_halpe26_keypoints()
     
     @property
     def is_initialized(self) -> bool:
         """Check if detector is properly initialized"""
-        return PoseDetector._initialized and hasattr(self, 'tracker')
\ No newline at end of file
+        return hasattr(self, 'tracker')
+
+
+def keypoint_names_for(model: str) -> List[str]:
+    """Keypoint names produced by a model type, in output order"""
+    names = {
+        "body_with_feet": PoseDetector._get_halpe26_keypoints,
+        "whole_body": PoseDetector._get_coco133_keypoints,
+        "body": PoseDetector._get_coco17_keypoints,
+    }
+    if model.lower() not in names:
+        raise ValueError(f"Unknown model: {model}")
+    return names[model.lower()]()
+
+def model_input_sizes(model: str, mode: str) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """
+    Input sizes (width, height) of the detector and pose model RTMLib uses for a model and mode
+    
+    Returns:
+        Tuple of (det_input_size, pose_input_size)
+    """
+    model_classes = {
+        "body_with_feet": BodyWithFeet,
+        "whole_body": Wholebody,
+        "body": Body,
+    } if RTMLIB_AVAILABLE else {}
+    if model.lower() not in ("body_with_feet", "whole_body", "body"):
+        raise ValueError(f"Unknown model: {model}")
+    
+    # RTMLib's own defaults if the solution class doesn't list the mode
+    sizes = getattr(model_classes.get(model.lower()), "MODE", {}).get(mode, {})
+    return (
+        tuple(sizes.get("det_input_size", (640, 640))),
+        tuple(sizes.get("pose_input_size", (192, 256)))
+    )
+
+def keypoints_to_dict(
+    keypoint_names: List[str],
+    keypoints: np.ndarray,
+    scores: np.ndarray,
+    confidence_threshold: float = 0.3
+) -> Dict[str, np.ndarray]:
+    """
+    Convert one person's keypoint array to a name -> coordinates dict
+    
+    Args:
+        keypoint_names: Names in model output order (see keypoint_names_for)
+        keypoints: Array of shape (n_keypoints, 2)
+        scores: Array of shape (n_keypoints,)
+        confidence_threshold: Minimum confidence to include keypoint
+    """
+    result = {}
+    
+    for i, name in enumerate(keypoint_names):
+        if i < len(scores) and scores[i] >= confidence_threshold:
+            result[name] = keypoints[i]
+    
+    # Add computed keypoints (Neck and Hip)
+    if "Neck" not in result and all(k in result for k in ["LShoulder", "RShoulder"]):
+        result["Neck"] = (result["LShoulder"] + result["RShoulder"]) / 2
+    
+    if "Hip" not in result and all(k in result for k in ["LHip", "RHip"]):
+        result["Hip"] = (result["LHip"] + result["RHip"]) / 2
+    
+    return result
@@ -2,14 +2,33 @@
 ROM-specific calculations and movement analysis
 Complete implementation with all body parts support
 """
+import operator
 import numpy as np
 from typing import Dict, List, Tuple, Optional
-from .angle_computation import calculate_all_angles, ANGLE_DEFINITIONS, calculate_angle_between_points, add_virtual_keypoints
+from .angle_computation import calculate_all_angles, ANGLE_DEFINITIONS, calculate_angle_between_points, add_virtual_keypoints, has_keypoints
+
+# Sides of limb movements (MOVEMENT_ANGLES primary angles are the right side's)
+SIDES = ('left', 'right')
+
+def elbow_flexion_angle(angle: float) -> float:
+    """Elbow flexion from the elbow joint angle"""
+    return 180 - angle
+
+def ankle_dorsiflexion_angle(angle: float) -> float:
+    """Ankle dorsiflexion from the ankle joint angle"""
+    return angle - 90
+
+def ankle_plantarflexion_angle(angle: float) -> float:
+    """Ankle plantarflexion from the ankle joint angle"""
+    return 90 - angle
 
 class ROMCalculator:
     """Calculate ROM for different body parts and movements"""
     
     # Movement-specific angle mappings with complete implementation
+    # Limb movements also name the 'joint' of ANGLE_DEFINITIONS they measure on
+    # each side ('{side} {joint}') and the 'transform' from that joint angle to
+    # the movement's angle (identity if absent); their calculate takes a side.
     MOVEMENT_ANGLES = {
         'lower_back': {
             'flexion': {
@@ -45,28 +64,33 @@ class ROMCalculator:
             'flexion': {
                 'primary': 'right shoulder',
                 'secondary': ['trunk'],
-                'calculate': lambda kpts: calculate_shoulder_flexion(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_shoulder_flexion(kpts, side),
+                'joint': 'shoulder',
                 'normal_range': (0, 180),
                 'max_range': (0, 190)
             },
             'extension': {
                 'primary': 'right shoulder',
                 'secondary': ['trunk'],
-                'calculate': lambda kpts: calculate_shoulder_extension(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_shoulder_extension(kpts, side),
+                'joint': 'shoulder',
+                'transform': operator.neg,
                 'normal_range': (0, 60),
                 'max_range': (0, 80)
             },
             'abduction': {
                 'primary': 'right shoulder',
                 'secondary': ['trunk'],
-                'calculate': lambda kpts: calculate_shoulder_abduction(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_shoulder_abduction(kpts, side),
+                'joint': 'shoulder',
                 'normal_range': (0, 180),
                 'max_range': (0, 190)
             },
             'adduction': {
                 'primary': 'right shoulder',
                 'secondary': ['trunk'],
-                'calculate': lambda kpts: calculate_shoulder_adduction(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_shoulder_adduction(kpts, side),
+                'joint': 'shoulder',
                 'normal_range': (0, 45),
                 'max_range': (0, 60)
             }
@@ -75,14 +99,17 @@ class ROMCalculator:
             'flexion': {
                 'primary': 'right elbow',
                 'secondary': [],
-                'calculate': lambda kpts: calculate_elbow_flexion(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_elbow_flexion(kpts, side),
+                'joint': 'elbow',
+                'transform': elbow_flexion_angle,
                 'normal_range': (0, 145),
                 'max_range': (0, 160)
             },
             'extension': {
                 'primary': 'right elbow',
                 'secondary': [],
-                'calculate': lambda kpts: calculate_elbow_extension(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_elbow_extension(kpts, side),
+                'joint': 'elbow',
                 'normal_range': (0, 10),
                 'max_range': (-10, 10)
             }
@@ -91,21 +118,25 @@ class ROMCalculator:
             'flexion': {
                 'primary': 'right hip',
                 'secondary': ['pelvis', 'trunk'],
-                'calculate': lambda kpts: calculate_hip_flexion(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_hip_flexion(kpts, side),
+                'joint': 'hip',
                 'normal_range': (0, 120),
                 'max_range': (0, 140)
             },
             'extension': {
                 'primary': 'right hip',
                 'secondary': ['pelvis'],
-                'calculate': lambda kpts: calculate_hip_extension(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_hip_extension(kpts, side),
+                'joint': 'hip',
+                'transform': operator.neg,
                 'normal_range': (0, 30),
                 'max_range': (0, 40)
             },
             'abduction': {
                 'primary': 'right hip',
                 'secondary': ['pelvis'],
-                'calculate': lambda kpts: calculate_hip_abduction(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_hip_abduction(kpts, side),
+                'joint': 'hip',
                 'normal_range': (0, 45),
                 'max_range': (0, 60)
             }
@@ -114,14 +145,17 @@ class ROMCalculator:
             'flexion': {
                 'primary': 'right knee',
                 'secondary': [],
-                'calculate': lambda kpts: calculate_knee_flexion(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_knee_flexion(kpts, side),
+                'joint': 'knee',
+                'transform': operator.neg,
                 'normal_range': (0, 135),
                 'max_range': (0, 160)
             },
             'extension': {
                 'primary': 'right knee',
                 'secondary': [],
-                'calculate': lambda kpts: calculate_knee_extension(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_knee_extension(kpts, side),
+                'joint': 'knee',
                 'normal_range': (0, 10),
                 'max_range': (-10, 10)
             }
@@ -130,14 +164,18 @@ class ROMCalculator:
             'dorsiflexion': {
                 'primary': 'right ankle',
                 'secondary': [],
-                'calculate': lambda kpts: calculate_ankle_dorsiflexion(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_ankle_dorsiflexion(kpts, side),
+                'joint': 'ankle',
+                'transform': ankle_dorsiflexion_angle,
                 'normal_range': (0, 20),
                 'max_range': (0, 30)
             },
             'plantarflexion': {
                 'primary': 'right ankle',
                 'secondary': [],
-                'calculate': lambda kpts: calculate_ankle_plantarflexion(kpts, 'right'),
+                'calculate': lambda kpts, side='right': calculate_ankle_plantarflexion(kpts, side),
+                'joint': 'ankle',
+                'transform': ankle_plantarflexion_angle,
                 'normal_range': (0, 50),
                 'max_range': (0, 60)
             }
@@ -168,6 +206,8 @@ class ROMCalculator:
         
         # Use custom calculation function if available
         if 'calculate' in movement_config:
+            if 'joint' in movement_config:
+                return movement_config['calculate'](keypoints, side)
             return movement_config['calculate'](keypoints)
         
         # Default calculation using angle definitions
@@ -184,6 +224,11 @@ class ROMCalculator:
         
         return calculated_angles
     
+    @classmethod
+    def is_sided(cls, body_part: str, movement_type: str) -> bool:
+        """Whether a movement is measured separately on the left and right side"""
+        return 'joint' in cls.MOVEMENT_ANGLES.get(body_part, {}).get(movement_type, {})
+    
     @classmethod
     def get_movement_requirements(cls, body_part: str, movement_type: str) -> List[str]:
         """
@@ -229,29 +274,55 @@ class ROMCalculator:
             return {'valid': False, 'message': 'Unknown movement'}
         
         movement_config = cls.MOVEMENT_ANGLES[body_part][movement_type]
-        normal_min, normal_max = movement_config['normal_range']
-        max_min, max_max = movement_config['max_range']
-        
-        result = {
-            'valid': True,
-            'in_normal_range': normal_min <= angle_value <= normal_max,
-            'in_max_range': max_min <= angle_value <= max_max,
-            'normal_range': movement_config['normal_range'],
-            'max_range': movement_config['max_range']
-        }
-        
-        if angle_value < max_min:
-            result['message'] = f"Angle {angle_value:.1f}° is below minimum safe range"
-            result['valid'] = False
-        elif angle_value > max_max:
-            result['message'] = f"Angle {angle_value:.1f}° exceeds maximum safe range"
-            result['valid'] = False
-        elif not result['in_normal_range']:
-            result['message'] = f"Angle {angle_value:.1f}° is outside normal range"
-        else:
-            result['message'] = "Angle is within normal range"
-        
-        return result
+        return validate_angle_range(
+            angle_value, movement_config['normal_range'], movement_config['max_range']
+        )
+
+
+def validate_angle_range(
+    angle_value: float,
+    normal_range: Tuple[float, float],
+    max_range: Tuple[float, float]
+) -> Dict[str, any]:
+    """
+    Validate an angle against a movement's normal and maximum safe ranges
+    """
+    normal_min, normal_max = normal_range
+    max_min, max_max = max_range
+    
+    result = {
+        'valid': True,
+        'in_normal_range': normal_min <= angle_value <= normal_max,
+        'in_max_range': max_min <= angle_value <= max_max,
+        'normal_range': normal_range,
+        'max_range': max_range
+    }
+    
+    if angle_value < max_min:
+        result['message'] = f"Angle {angle_value:.1f}° is below minimum safe range"
+        result['valid'] = False
+    elif angle_value > max_max:
+        result['message'] = f"Angle {angle_value:.1f}° exceeds maximum safe range"
+        result['valid'] = False
+    elif not result['in_normal_range']:
+        result['message'] = f"Angle {angle_value:.1f}° is outside normal range"
+    else:
+        result['message'] = "Angle is within normal range"
+    
+    return result
+
+
+def symmetry_index(left: float, right: float) -> float:
+    """
+    Symmetry index of a left and right value in percent
+    
+    |left - right| relative to the mean of their magnitudes: 0 for equal
+    sides, up to 200 when one side is 0.
+    """
+    mean = (abs(left) + abs(right)) / 2
+    if mean == 0:
+        return 0.0
+    return abs(left - right) / mean * 100
 
 
 # Lower back calculation functions
@@ -260,7 +331,7 @@ def calculate_lower_back_flexion(keypoints: Dict[str, np.ndarray]) -> Dict[str,
     angles = {}
     
     # Calculate trunk angle (Neck to Hip)
-    if all(k in keypoints for k in ['Neck', 'Hip']):
+    if has_keypoints(keypoints, ['Neck', 'Hip']):
         trunk_angle = calculate_angle_between_points(
             keypoints['Neck'], 
             keypoints['Hip'],
@@ -270,7 +341,7 @@ def calculate_lower_back_flexion(keypoints: Dict[str, np.ndarray]) -> Dict[str,
         angles['trunk'] = 180 - trunk_angle
     
     # Calculate pelvis angle
-    if all(k in keypoints for k in ['LHip', 'RHip']):
+    if has_keypoints(keypoints, ['LHip', 'RHip']):
         pelvis_angle = calculate_angle_between_points(
             keypoints['LHip'],
             keypoints['RHip'],
@@ -279,10 +350,10 @@ def calculate_lower_back_flexion(keypoints: Dict[str, np.ndarray]) -> Dict[str,
         angles['pelvis'] = pelvis_angle
     
     # Calculate hip angles if available
-    if all(k in keypoints for k in ['RKnee', 'RHip', 'Hip', 'Neck']):
+    if has_keypoints(keypoints, ['RKnee', 'RHip', 'Hip', 'Neck']):
         angles['right hip'] = calculate_all_angles(keypoints, ['right hip']).get('right hip', np.nan)
     
-    if all(k in keypoints for k in ['LKnee', 'LHip', 'Hip', 'Neck']):
+    if has_keypoints(keypoints, ['LKnee', 'LHip', 'Hip', 'Neck']):
         angles['left hip'] = calculate_all_angles(keypoints, ['left hip']).get('left hip', np.nan)
     
     return angles
@@ -292,7 +363,7 @@ def calculate_lower_back_extension(keypoints: Dict[str, np.ndarray]) -> Dict[str
     angles = {}
     
     # Calculate trunk angle
-    if all(k in keypoints for k in ['Neck', 'Hip']):
+    if has_keypoints(keypoints, ['Neck', 'Hip']):
         trunk_angle = calculate_angle_between_points(
             keypoints['Neck'], 
             keypoints['Hip'],
@@ -302,7 +373,7 @@ def calculate_lower_back_extension(keypoints: Dict[str, np.ndarray]) -> Dict[str
         angles['trunk'] = trunk_angle - 180
     
     # Calculate pelvis angle
-    if all(k in keypoints for k in ['LHip', 'RHip']):
+    if has_keypoints(keypoints, ['LHip', 'RHip']):
         pelvis_angle = calculate_angle_between_points(
             keypoints['LHip'],
             keypoints['RHip'],
@@ -317,14 +388,14 @@ def calculate_lower_back_lateral_flexion(keypoints: Dict[str, np.ndarray]) -> Di
     angles = {}
     
     # Calculate trunk lateral angle
-    if all(k in keypoints for k in ['Neck', 'Hip']):
+    if has_keypoints(keypoints, ['Neck', 'Hip']):
         trunk_vector = keypoints['Neck'] - keypoints['Hip']
         # Calculate deviation from vertical
-        lateral_angle = np.degrees(np.arctan2(trunk_vector[0], -trunk_vector[1]))
+        lateral_angle = float(np.degrees(np.arctan2(trunk_vector[0], -trunk_vector[1])))
         angles['trunk'] = lateral_angle
     
     # Calculate shoulder tilt
-    if all(k in keypoints for k in ['LShoulder', 'RShoulder']):
+    if has_keypoints(keypoints, ['LShoulder', 'RShoulder']):
         shoulder_angle = calculate_angle_between_points(
             keypoints['LShoulder'],
             keypoints['RShoulder'],
@@ -333,7 +404,7 @@ def calculate_lower_back_lateral_flexion(keypoints: Dict[str, np.ndarray]) -> Di
         angles['shoulders'] = shoulder_angle
     
     # Calculate pelvis tilt
-    if all(k in keypoints for k in ['LHip', 'RHip']):
+    if has_keypoints(keypoints, ['LHip', 'RHip']):
         pelvis_angle = calculate_angle_between_points(
             keypoints['LHip'],
             keypoints['RHip'],
@@ -348,14 +419,14 @@ def calculate_lower_back_rotation(keypoints: Dict[str, np.ndarray]) -> Dict[str,
     angles = {}
     
     # Calculate rotation based on shoulder-hip alignment
-    if all(k in keypoints for k in ['LShoulder', 'RShoulder', 'LHip', 'RHip']):
+    if has_keypoints(keypoints, ['LShoulder', 'RShoulder', 'LHip', 'RHip']):
         # Shoulder line vector
         shoulder_vector = keypoints['RShoulder'] - keypoints['LShoulder']
-        shoulder_angle = np.degrees(np.arctan2(shoulder_vector[1], shoulder_vector[0]))
+        shoulder_angle = float(np.degrees(np.arctan2(shoulder_vector[1], shoulder_vector[0])))
         
         # Hip line vector
         hip_vector = keypoints['RHip'] - keypoints['LHip']
-        hip_angle = np.degrees(np.arctan2(hip_vector[1], hip_vector[0]))
+        hip_angle = float(np.degrees(np.arctan2(hip_vector[1], hip_vector[0])))
         
         # Rotation is difference between shoulder and hip angles
         rotation_angle = shoulder_angle - hip_angle
@@ -400,7 +471,7 @@ def calculate_elbow_flexion(keypoints: Dict[str, np.ndarray], side: str) -> Dict
     # Transform for flexion
     for key in angles:
         if 'elbow' in key:
-            angles[key] = 180 - angles[key]
+            angles[key] = elbow_flexion_angle(angles[key])
     return angles
 
 def calculate_elbow_extension(keypoints: Dict[str, np.ndarray], side: str) -> Dict[str, float]:
@@ -442,7 +513,7 @@ def calculate_ankle_dorsiflexion(keypoints: Dict[str, np.ndarray], side: str) ->
     # Transform for dorsiflexion
     for key in angles:
         if 'ankle' in key:
-            angles[key] = angles[key] - 90
+            angles[key] = ankle_dorsiflexion_angle(angles[key])
     return angles
 
 def calculate_ankle_plantarflexion(keypoints: Dict[str, np.ndarray], side: str) -> Dict[str, float]:
@@ -451,5 +522,5 @@ def calculate_ankle_plantarflexion(keypoints: Dict[str, np.ndarray], side: str)
     # Transform for plantarflexion
     for key in angles:
         if 'ankle' in key:
-            angles[key] = 90 - angles[key]
+            angles[key] = ankle_plantarflexion_angle(angles[key])
     return angles
\ No newline at end of file
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Benchmark the vectorized angle engine against the per-angle functions
+
+Computes every angle of ANGLE_DEFINITIONS for synthetic HALPE_26 poses (with
+low-confidence points and mirrored feet) with calculate_all_angles, one
+compute_angle call per angle on a keypoint dict, and with AngleEngine, on a
+dict per frame, an array per frame and a whole clip of frames at once.
+Checks that both give the same angles.
+
+Usage:
+    python scripts/benchmark_angle_engine.py [--frames 300] [--rounds 20]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import numpy as np
+
+from physiotrack_core.angle_computation import calculate_all_angles
+from physiotrack_core.angle_engine import AngleEngine
+from physiotrack_core.pose_detection import keypoint_names_for, keypoints_to_dict
+
+CONFIDENCE_THRESHOLD = 0.3
+
+def synthetic_poses(frames: int, seed: int = 0):
+    """Jittered standing poses; some points below threshold, every 4th frame facing left"""
+    rng = np.random.default_rng(seed)
+    names = keypoint_names_for("body_with_feet")
+    base = {
+        "Nose": (320, 80), "LEye": (330, 72), "REye": (310, 72), "LEar": (340, 78), "REar": (300, 78),
+        "LShoulder": (360, 140), "RShoulder": (280, 140), "LElbow": (375, 220), "RElbow": (265, 220),
+        "LWrist": (380, 290), "RWrist": (260, 290), "LHip": (345, 300), "RHip": (295, 300),
+        "LKnee": (350, 400), "RKnee": (290, 400), "LAnkle": (352, 490), "RAnkle": (288, 490),
+        "Head": (320, 50), "Neck": (320, 130), "Hip": (320, 300), "LBigToe": (372, 505),
+        "RBigToe": (308, 505), "LSmallToe": (362, 508), "RSmallToe": (298, 508),
+        "LHeel": (345, 500), "RHeel": (281, 500)
+    }
+    pose = np.array([base[name] for name in names], dtype=np.float64)
+    keypoints = pose + rng.normal(0, 15, (frames, len(names), 2))
+    scores = rng.uniform(0.2, 1.0, (frames, len(names)))
+    # Mirrored feet exercise the left/right flip correction
+    mirrored = np.arange(frames) % 4 == 0
+    for toe, heel in (("LBigToe", "LHeel"), ("RBigToe", "RHeel")):
+        t, h = names.index(toe), names.index(heel)
+        keypoints[mirrored, t, 0] = keypoints[mirrored, h, 0] - 25
+    dicts = [
+        keypoints_to_dict(names, kp, sc, confidence_threshold=CONFIDENCE_THRESHOLD)
+        for kp, sc in zip(keypoints, scores)
+    ]
+    return keypoints, scores, dicts
+
+def time_per_frame(func, frames: int, rounds: int) -> float:
+    """Mean microseconds per frame of func() processing all frames"""
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds / frames * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized angle engine")
+    parser.add_argument("--frames", type=int, default=300, help="Synthetic frames (a 10 s clip at 30 fps)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print("ROM Analysis API - Angle Engine Benchmark")
+    print("=" * 50)
+
+    keypoints, scores, dicts = synthetic_poses(args.frames)
+    engine = AngleEngine()
+
+    # Same angles from both paths
+    batch = engine.evaluate(keypoints, scores, CONFIDENCE_THRESHOLD)
+    worst, compared = 0.0, 0
+    for reference, row in zip((calculate_all_angles(d) for d in dicts), batch):
+        vectorized = engine.angles_dict(row)
+        assert reference.keys() == vectorized.keys(), "angle sets differ"
+        for name, value in reference.items():
+            worst = max(worst, abs(value - vectorized[name]))
+            compared += 1
+    print(f"{compared} angles over {args.frames} frames, max abs difference {worst:.2e}°")
+
+    paths = [
+        ("calculate_all_angles (per angle)", lambda: [calculate_all_angles(d) for d in dicts]),
+        ("engine, dict per frame", lambda: [engine.calculate_all_angles(d) for d in dicts]),
+        ("engine, array per frame", lambda: [
+            engine.evaluate(kp, sc, CONFIDENCE_THRESHOLD) for kp, sc in zip(keypoints, scores)
+        ]),
+        (f"engine, {args.frames} frames at once", lambda: engine.evaluate(keypoints, scores, CONFIDENCE_THRESHOLD)),
+    ]
+
+    print(f"\n{len(engine.angle_names)} angles per frame")
+    print(f"{'path':<36} {'us/frame':>10} {'speedup':>8}")
+    baseline = None
+    for name, func in paths:
+        us = time_per_frame(func, args.frames, args.rounds)
+        baseline = baseline or us
+        print(f"{name:<36} {us:>10.1f} {baseline / us:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
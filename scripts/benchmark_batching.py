@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Benchmark cross-session micro-batching for pose detection
+
+Part 1 measures raw detector throughput against batch size (PoseDetector.detect_batch).
+Part 2 simulates concurrent streaming sessions going through PoseBatcher and reports
+throughput and per-frame latency against the batching window.
+
+Usage:
+    python scripts/benchmark_batching.py [image_path]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+import cv2
+import numpy as np
+
+DEFAULT_IMAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_frame.jpg")
+
+def load_frame(image_path: str) -> np.ndarray:
+    """Load the benchmark frame"""
+    frame = cv2.imread(image_path)
+    if frame is None:
+        print(f"✗ Could not read image: {image_path}")
+        sys.exit(1)
+    return frame
+
+def benchmark_batch_sizes(detector, frame: np.ndarray, batch_sizes, rounds: int):
+    """Throughput of detect_batch for each batch size"""
+    print("\nDetector throughput vs batch size")
+    print(f"{'batch':>6} {'frames/s':>10} {'ms/frame':>10}")
+
+    for batch_size in batch_sizes:
+        frames = [frame.copy() for _ in range(batch_size)]
+
+        # Warm-up so ONNX Runtime has allocated buffers for this shape
+        detector.detect_batch(frames)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            detector.detect_batch(frames)
+        elapsed = time.perf_counter() - start
+
+        total_frames = batch_size * rounds
+        print(f"{batch_size:>6} {total_frames / elapsed:>10.1f} {elapsed / total_frames * 1000:>10.2f}")
+
+async def run_sessions(batcher, frame: np.ndarray, sessions: int, frames_per_session: int):
+    """Simulate concurrent sessions each sending frames back to back"""
+    latencies = []
+
+    async def session():
+        for _ in range(frames_per_session):
+            start = time.perf_counter()
+            await batcher.detect(frame)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[session() for _ in range(sessions)])
+    elapsed = time.perf_counter() - start
+
+    return sessions * frames_per_session / elapsed, latencies
+
+def benchmark_windows(detector, frame: np.ndarray, windows, sessions: int, frames_per_session: int, max_batch: int, workers: int):
+    """Throughput and latency of PoseBatcher for each batching window"""
+    from app.core.pose.batcher import PoseBatcher
+    from app.core.pose.executor import InferenceExecutor
+
+    print(f"\nPoseBatcher with {sessions} concurrent sessions (max batch {max_batch}, {workers} workers)")
+    print(f"{'window':>8} {'frames/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'mean batch':>11}")
+
+    for window_ms in windows:
+        executor = InferenceExecutor(max_workers=workers, max_queue_size=sessions * 2)
+        batcher = PoseBatcher(
+            detect_batch=lambda frames, bboxes_list, model_key=None: detector.detect_batch(frames, bboxes_list),
+            executor=executor,
+            max_batch_size=max_batch,
+            window_ms=window_ms
+        )
+
+        throughput, latencies = asyncio.run(
+            run_sessions(batcher, frame, sessions, frames_per_session)
+        )
+        executor.shutdown()
+
+        latencies_ms = np.array(latencies) * 1000
+        stats = batcher.get_stats()
+        print(
+            f"{window_ms:>8.1f} {throughput:>10.1f} "
+            f"{np.percentile(latencies_ms, 50):>8.1f} {np.percentile(latencies_ms, 95):>8.1f} "
+            f"{stats['mean_batch_size']:>11.2f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pose detection micro-batching")
+    parser.add_argument("image", nargs="?", default=DEFAULT_IMAGE, help="Image used for every frame")
+    parser.add_argument("--mode", default="performance", help="RTMLib mode")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16", help="Comma separated batch sizes")
+    parser.add_argument("--windows", default="0,5,10,15", help="Comma separated batching windows (ms)")
+    parser.add_argument("--sessions", type=int, default=16, help="Concurrent simulated sessions")
+    parser.add_argument("--frames", type=int, default=10, help="Frames per simulated session")
+    parser.add_argument("--rounds", type=int, default=10, help="Rounds per batch size")
+    parser.add_argument("--workers", type=int, default=2, help="Inference executor workers")
+    args = parser.parse_args()
+
+    from physiotrack_core.pose_detection import PoseDetector
+
+    print("ROM Analysis API - Micro-batching Benchmark")
+    print("=" * 50)
+
+    frame = load_frame(args.image)
+    detector = PoseDetector(model="body_with_feet", mode=args.mode, device="cpu", backend="onnxruntime")
+    print(f"Frame shape: {frame.shape}, mode: {args.mode}")
+    print(f"Batched det stage: {detector._supports_batching(detector.tracker.det_model)}")
+    print(f"Batched pose stage: {detector._supports_batching(detector.tracker.pose_model)}")
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    windows = [float(w) for w in args.windows.split(",")]
+
+    benchmark_batch_sizes(detector, frame, batch_sizes, args.rounds)
+    benchmark_windows(detector, frame, windows, args.sessions, args.frames, max(batch_sizes), args.workers)
+
+if __name__ == "__main__":
+    main()
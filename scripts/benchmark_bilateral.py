@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Benchmark bilateral (left and right) limb movement analysis
+
+For a few limb movements on synthetic HALPE_26 poses, measures the angles
+of one side and of both sides with the per-angle functions
+(ROMCalculator.calculate_movement_angles once per side) against the
+movement plan's single vectorized evaluation of both sides, then the whole
+of FrameAnalyzer.analyze_keypoints: two single-side analyses (one session
+per side, as before bilateral mode) against one bilateral analysis.
+Checks that both give the same angles.
+
+Usage:
+    python scripts/benchmark_bilateral.py [--frames 300] [--rounds 20]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import logging
+
+from benchmark_angle_engine import CONFIDENCE_THRESHOLD, synthetic_poses, time_per_frame
+from app.core.body_parts.registry import MovementRegistry
+from app.services.frame_analyzer import FrameAnalyzer
+from app.services.session_manager import SessionManager
+from app.storage.memory import InMemoryStorage
+from physiotrack_core.keypoint_set import KeypointSet, layout_for_model
+from physiotrack_core.rom_calculations import SIDES, ROMCalculator
+
+MOVEMENTS = [
+    ("shoulder", "flexion"),
+    ("elbow", "flexion"),
+    ("knee", "flexion"),
+    ("ankle", "dorsiflexion"),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bilateral limb movement analysis")
+    parser.add_argument("--frames", type=int, default=300, help="Synthetic frames (a 10 s clip at 30 fps)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    print("ROM Analysis API - Bilateral Analysis Benchmark")
+    print("=" * 50)
+
+    keypoints, scores, _ = synthetic_poses(args.frames)
+    layout = layout_for_model("body_with_feet")
+    sets = [KeypointSet.from_arrays(layout, kp, sc, CONFIDENCE_THRESHOLD) for kp, sc in zip(keypoints, scores)]
+    frames = [(kp.tolist(), sc.tolist()) for kp, sc in zip(keypoints, scores)]
+
+    analyzer = FrameAnalyzer(SessionManager(InMemoryStorage()))
+    loop = asyncio.new_event_loop()
+
+    print(f"\n{'movement':<18} {'1 side us':>10} {'2 sides us':>11} {'vectorized us':>14} "
+          f"{'2 analyses us':>14} {'bilateral us':>13}")
+    for body_part, movement_type in MOVEMENTS:
+        plan = MovementRegistry.get_plan(body_part, movement_type)
+
+        def per_side(keypoints, sides=SIDES):
+            return {
+                side: ROMCalculator.calculate_movement_angles(keypoints, body_part, movement_type, side)
+                for side in sides
+            }
+
+        # Same angles from both (float32 keypoints, so within float32 precision)
+        for s in sets:
+            reference, vectorized = per_side(s), plan.bilateral_angles(s)
+            for side in SIDES:
+                assert reference[side].keys() == vectorized[side].keys(), "angle sets differ"
+                for name, value in reference[side].items():
+                    assert abs(value - vectorized[side][name]) < 1e-3, "angles differ"
+
+        one_side_us = time_per_frame(lambda: [per_side(s, ("right",)) for s in sets], args.frames, args.rounds)
+        two_sides_us = time_per_frame(lambda: [per_side(s) for s in sets], args.frames, args.rounds)
+        vectorized_us = time_per_frame(lambda: [plan.bilateral_angles(s) for s in sets], args.frames, args.rounds)
+
+        async def analyze_sides():
+            # Single-side analysis only measures the right side; the left needs its own session
+            for kp, sc in frames:
+                for side in SIDES:
+                    await analyzer.analyze_keypoints(kp, sc, f"benchmark-{side}", body_part, movement_type)
+
+        async def analyze_bilateral():
+            for kp, sc in frames:
+                await analyzer.analyze_keypoints(kp, sc, "benchmark", body_part, movement_type, bilateral=True)
+
+        rounds = max(1, args.rounds // 4)
+        sides_us = time_per_frame(lambda: loop.run_until_complete(analyze_sides()), args.frames, rounds)
+        bilateral_us = time_per_frame(lambda: loop.run_until_complete(analyze_bilateral()), args.frames, rounds)
+
+        label = f"{body_part} {movement_type}"
+        print(f"{label:<18} {one_side_us:>10.1f} {two_sides_us:>11.1f} {vectorized_us:>14.1f} "
+              f"{sides_us:>14.1f} {bilateral_us:>13.1f}")
+
+    loop.close()
+
+if __name__ == "__main__":
+    main()
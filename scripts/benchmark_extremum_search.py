@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Benchmark coarse-to-fine extremum search against exhaustive video analysis
+
+Runs VideoAnalyzer on the same clip in exhaustive and coarse_to_fine mode and
+reports the ROM of each, the number of frames actually inferred and the
+deviation of the coarse-to-fine ROM from the exhaustive one.
+
+Without a video, a synthetic test clip is written whose frame brightness
+encodes a known angle signal (several repetitions with noise) and a stand-in
+analyzer reads the angle back, so the search itself can be checked without
+pose models. With --video the real pose pipeline is used.
+
+Usage:
+    python scripts/benchmark_extremum_search.py [--video clip.mp4 --body-part lower_back --movement flexion]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import tempfile
+import time
+import cv2
+import numpy as np
+
+# Synthetic clip: brightness = angle * ANGLE_TO_BRIGHTNESS
+ANGLE_TO_BRIGHTNESS = 2.5
+
+def write_synthetic_clip(path: str, seconds: float, fps: float, reps: int, seed: int = 0) -> np.ndarray:
+    """Write a clip of flexion repetitions with varying depth; returns the true angle per frame"""
+    rng = np.random.default_rng(seed)
+    frames = int(seconds * fps)
+    t = np.arange(frames) / frames
+    depth = 60 + 25 * rng.random(reps)  # Peak angle of each repetition
+    rep = np.minimum((t * reps).astype(int), reps - 1)
+    angles = depth[rep] * np.sin(np.pi * (t * reps % 1.0)) ** 2 + rng.normal(0, 0.5, frames)
+    angles = np.clip(angles, 0, 255 / ANGLE_TO_BRIGHTNESS)
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (64, 48))
+    for angle in angles:
+        writer.write(np.full((48, 64, 3), int(round(angle * ANGLE_TO_BRIGHTNESS)), np.uint8))
+    writer.release()
+    return angles
+
+class SignalAnalyzer:
+    """Stand-in for FrameAnalyzer that reads the angle from frame brightness"""
+
+    def __init__(self, session_manager):
+        self.session_manager = session_manager
+        self.frames_inferred = 0
+
+    def primary_angle_key(self, body_part: str, movement_type: str) -> str:
+        return "trunk"
+
+    def release_session(self, session_id: str):
+        pass
+
+    async def analyze_frame(self, frame, session_id, body_part, movement_type, **kwargs):
+        self.frames_inferred += 1
+        angles = {"trunk": float(frame.mean()) / ANGLE_TO_BRIGHTNESS}
+        tracker = await self.session_manager.get_or_create_tracker(session_id, body_part, movement_type)
+        rom = tracker.update(angles, "trunk")
+        await self.session_manager.save_tracker(session_id, tracker)
+        return {"pose_detected": True, "angles": {k: round(v, 1) for k, v in angles.items()}, "rom": rom}
+
+async def run_mode(analyzer, path: str, mode: str, args) -> dict:
+    """Analyze the clip in one mode in a fresh session"""
+    from app.services.video_analyzer import VideoAnalyzer
+
+    start = time.perf_counter()
+    result = await VideoAnalyzer(analyzer).analyze(
+        path,
+        session_id=f"bench_{mode}",
+        body_part=args.body_part,
+        movement_type=args.movement,
+        sample_fps=args.sample_fps,
+        mode=mode,
+        coarse_step=args.coarse_step,
+        refine_margin=args.margin
+    )
+    result["elapsed_s"] = time.perf_counter() - start
+    return result
+
+async def benchmark(analyzer, path: str, args):
+    exhaustive = await run_mode(analyzer, path, "exhaustive", args)
+    coarse = await run_mode(analyzer, path, "coarse_to_fine", args)
+    search = coarse["search"]
+
+    print(f"\n{'mode':<16} {'frames':>7} {'min':>7} {'max':>7} {'range':>7} {'time s':>8}")
+    for name, result in (("exhaustive", exhaustive), ("coarse_to_fine", coarse)):
+        rom = result["rom"]
+        print(
+            f"{name:<16} {result['sampling']['frames_analyzed']:>7} {rom['min']:>7.1f} {rom['max']:>7.1f} "
+            f"{rom['range']:>7.1f} {result['elapsed_s']:>8.2f}"
+        )
+
+    deviation = {key: abs(coarse["rom"][key] - exhaustive["rom"][key]) for key in ("min", "max", "range")}
+    inferred = search["frames_inferred"]
+    total = exhaustive["sampling"]["frames_analyzed"]
+    print(
+        f"\nInferred {inferred} of {total} frames ({inferred / max(total, 1):.0%}): "
+        f"{search['coarse_frames']} coarse + {search['refined_frames']} in {len(search['windows'])} windows"
+    )
+    print(
+        f"ROM deviation vs exhaustive: min {deviation['min']:.1f}°, max {deviation['max']:.1f}°, "
+        f"range {deviation['range']:.1f}°"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark coarse-to-fine extremum search")
+    parser.add_argument("--video", help="Clip to analyze with the pose pipeline (synthetic clip if omitted)")
+    parser.add_argument("--body-part", default="lower_back")
+    parser.add_argument("--movement", default="flexion")
+    parser.add_argument("--sample-fps", type=float, default=0.0, help="Dense sampling rate (0 = every frame)")
+    parser.add_argument("--coarse-step", type=int, default=8, help="Sampled frames per coarse step")
+    parser.add_argument("--margin", type=float, default=5.0, help="Refine local extremes within this many degrees")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Synthetic clip length")
+    parser.add_argument("--reps", type=int, default=5, help="Repetitions in the synthetic clip")
+    args = parser.parse_args()
+
+    print("ROM Analysis API - Extremum Search Benchmark")
+    print("=" * 50)
+
+    from app.services.session_manager import SessionManager
+    from app.storage.memory import InMemoryStorage
+
+    if args.video:
+        from app.services.frame_analyzer import FrameAnalyzer
+
+        analyzer = FrameAnalyzer(SessionManager(InMemoryStorage()))
+        asyncio.run(benchmark(analyzer, args.video, args))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.avi")
+        angles = write_synthetic_clip(path, args.seconds, 30.0, args.reps)
+        print(f"Synthetic clip: {len(angles)} frames, true peak {angles.max():.1f}°")
+        asyncio.run(benchmark(SignalAnalyzer(SessionManager(InMemoryStorage())), path, args))
+
+if __name__ == "__main__":
+    main()
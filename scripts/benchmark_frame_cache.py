@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Benchmark the pose result cache for byte-identical frames
+
+Part 1 measures the cost of hashing encoded frames (the price every cached
+lookup pays) with blake2b and, if installed, xxhash.
+Part 2 (--analyze) runs analyze_frame on the same JPEG repeatedly, as a
+retrying client or a UI analyzing one frame for several movements would,
+and compares the first (miss) with the following (hit) latencies. It loads
+the pose model.
+
+Usage:
+    python scripts/benchmark_frame_cache.py [image_path] [--analyze]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import hashlib
+import time
+import numpy as np
+
+from benchmark_frame_input import DEFAULT_IMAGE, load_encoded_frames, time_per_frame
+
+def benchmark_hashing(frames, rounds: int):
+    """Milliseconds per digest of each encoded frame"""
+    from app.core.pose.frame_cache import xxhash
+
+    digests = [("blake2b", lambda data: hashlib.blake2b(data, digest_size=16).digest())]
+    if xxhash is not None:
+        digests.append(("xxh3_128", xxhash.xxh3_128_digest))
+
+    print("\nFrame hashing")
+    print(f"{'frame':<10} {'KB':>7} {'hash':<10} {'ms/frame':>10}")
+    for label, contents in frames.items():
+        for name, digest in digests:
+            print(f"{label:<10} {len(contents) / 1024:>7.0f} {name:<10} {time_per_frame(digest, contents, rounds):>10.3f}")
+    if xxhash is None:
+        print("(pip install xxhash for the faster hash)")
+
+async def benchmark_analysis(frames, rounds: int):
+    """analyze_frame latency of a repeated frame: first call vs cache hits"""
+    from app.core.pose.processor import PoseProcessor
+    from app.services.frame_analyzer import FrameAnalyzer
+    from app.services.session_manager import SessionManager
+    from app.storage.memory import InMemoryStorage
+
+    analyzer = FrameAnalyzer(SessionManager(InMemoryStorage()))
+    if PoseProcessor().get_cache_stats() is None:
+        print("\nPOSE_CACHE_MAX_ENTRIES is 0 - the cache is disabled")
+        return
+
+    print("\nRepeated frame analyze_frame latency")
+    print(f"{'frame':<10} {'miss ms':>8} {'hit p50 ms':>11} {'hit p95 ms':>11}")
+    for label, contents in frames.items():
+        latencies = []
+        for i in range(rounds + 1):
+            start = time.perf_counter()
+            await analyzer.analyze_frame(contents, f"bench_cache_{label}", "lower_back", "flexion")
+            latencies.append((time.perf_counter() - start) * 1000)
+        hits = latencies[1:]
+        print(f"{label:<10} {latencies[0]:>8.1f} {np.percentile(hits, 50):>11.2f} {np.percentile(hits, 95):>11.2f}")
+    print(f"\nCache: {PoseProcessor().get_cache_stats()}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pose result cache")
+    parser.add_argument("image", nargs="?", default=DEFAULT_IMAGE, help="Benchmark image")
+    parser.add_argument("--rounds", type=int, default=200, help="Repetitions per measurement")
+    parser.add_argument("--analyze", action="store_true", help="Also run analyze_frame (loads the pose model)")
+    args = parser.parse_args()
+
+    print("ROM Analysis API - Frame Cache Benchmark")
+    print("=" * 50)
+
+    frames = load_encoded_frames(args.image)
+    benchmark_hashing(frames, args.rounds)
+
+    if args.analyze:
+        asyncio.run(benchmark_analysis(frames, max(1, args.rounds // 10)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Benchmark frame input paths into FrameAnalyzer.analyze_frame
+
+Part 1 measures the per-frame codec work of each input form, including the
+previous multipart path (decode upload, re-encode to JPEG, base64 encode,
+then base64 decode and JPEG decode again in the analyzer), the reduced-size
+JPEG decode used when DECODE_REDUCED is on and raw pixel frames.
+Part 2 (--analyze) runs the full analysis for each input form, with the
+pose model loaded.
+
+Usage:
+    python scripts/benchmark_frame_input.py [image_path] [--analyze]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import base64
+import time
+import cv2
+import numpy as np
+
+DEFAULT_IMAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_frame.jpg")
+
+def load_encoded_frames(image_path: str):
+    """JPEG bytes of the image at its own size and upscaled to 1080p"""
+    frame = cv2.imread(image_path)
+    if frame is None:
+        print(f"✗ Could not read image: {image_path}")
+        sys.exit(1)
+    frames = {f"{frame.shape[1]}x{frame.shape[0]}": cv2.imencode(".jpg", frame)[1].tobytes()}
+    if frame.shape[0] != 1080:
+        full_hd = cv2.resize(frame, (1920, 1080), interpolation=cv2.INTER_LINEAR)
+        frames["1920x1080"] = cv2.imencode(".jpg", full_hd)[1].tobytes()
+    return frames
+
+def reencode_to_base64(contents: bytes) -> str:
+    """What /analyze/frame used to do before handing the upload to the analyzer"""
+    frame = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+    _, buffer = cv2.imencode(".jpg", frame)
+    return base64.b64encode(buffer).decode("utf-8")
+
+def previous_multipart_path(contents: bytes) -> np.ndarray:
+    """Previous multipart path including the analyzer's base64 + JPEG decode"""
+    from app.services.image_processor import ImageProcessor
+
+    return ImageProcessor.decode_base64(reencode_to_base64(contents))
+
+def bgr_to_nv12(frame: np.ndarray) -> np.ndarray:
+    """NV12 buffer (Y plane, then interleaved UV) of an even-sized BGR frame"""
+    height, width = frame.shape[0] // 2 * 2, frame.shape[1] // 2 * 2
+    i420 = cv2.cvtColor(frame[:height, :width], cv2.COLOR_BGR2YUV_I420)
+    u = i420[height:height + height // 4].reshape(height // 2, width // 2)
+    v = i420[height + height // 4:].reshape(height // 2, width // 2)
+    return np.vstack([i420[:height], np.stack([u, v], axis=-1).reshape(height // 2, width)])
+
+def time_per_frame(func, arg, rounds: int) -> float:
+    """Mean milliseconds per call"""
+    func(arg)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(arg)
+    return (time.perf_counter() - start) / rounds * 1000
+
+def benchmark_codec(frames, rounds: int, min_side: int):
+    """Codec cost of each input form"""
+    from app.services.image_processor import ImageProcessor
+    from app.utils.frame_protocol import pack_raw_frame, parse_raw_frame
+
+    print("\nPer-frame codec work before pose inference")
+    print(f"{'frame':<10} {'input':<22} {'ms/frame':>10} {'saved':>10}")
+
+    for label, contents in frames.items():
+        frame_base64 = base64.b64encode(contents).decode("utf-8")
+        decoded = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+        raw_bgr = pack_raw_frame(decoded)
+        raw_nv12 = pack_raw_frame(bgr_to_nv12(decoded), "nv12")
+        baseline = time_per_frame(previous_multipart_path, contents, rounds)
+        rows = [
+            ("multipart (previous)", baseline),
+            ("base64 string", time_per_frame(ImageProcessor.decode_base64, frame_base64, rounds)),
+            ("encoded bytes", time_per_frame(ImageProcessor.decode_bytes, contents, rounds)),
+            (f"reduced bytes (>={min_side})", time_per_frame(
+                lambda data: ImageProcessor.decode_bytes_reduced(data, min_side), contents, rounds
+            )),
+            ("raw bgr frame", time_per_frame(parse_raw_frame, raw_bgr, rounds)),
+            ("raw nv12 frame", time_per_frame(parse_raw_frame, raw_nv12, rounds)),
+            ("decoded ndarray", 0.0),
+        ]
+        for name, ms in rows:
+            print(f"{label:<10} {name:<22} {ms:>10.2f} {baseline - ms:>9.2f}ms")
+
+async def benchmark_analysis(frames, rounds: int):
+    """End-to-end analyze_frame latency for each input form"""
+    from app.services.frame_analyzer import FrameAnalyzer
+    from app.services.session_manager import SessionManager
+    from app.storage.memory import InMemoryStorage
+
+    analyzer = FrameAnalyzer(SessionManager(InMemoryStorage()))
+
+    print("\nEnd-to-end analyze_frame latency")
+    print(f"{'frame':<10} {'input':<22} {'p50 ms':>8} {'p95 ms':>8}")
+
+    for label, contents in frames.items():
+        decoded = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+        inputs = [
+            ("multipart (previous)", lambda: reencode_to_base64(contents)),
+            ("base64 string", lambda: base64.b64encode(contents).decode("utf-8")),
+            ("encoded bytes", lambda: contents),
+            ("decoded ndarray", lambda: decoded),
+        ]
+        for name, make_input in inputs:
+            session_id = f"bench_{label}_{name}"
+            latencies = []
+            for i in range(rounds + 1):
+                start = time.perf_counter()
+                await analyzer.analyze_frame(make_input(), session_id, "lower_back", "flexion")
+                if i > 0:
+                    latencies.append((time.perf_counter() - start) * 1000)
+            analyzer.release_session(session_id)
+            print(f"{label:<10} {name:<22} {np.percentile(latencies, 50):>8.1f} {np.percentile(latencies, 95):>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frame input paths")
+    parser.add_argument("image", nargs="?", default=DEFAULT_IMAGE, help="Benchmark image")
+    parser.add_argument("--rounds", type=int, default=50, help="Frames per measurement")
+    parser.add_argument("--analyze", action="store_true", help="Also run full analysis (loads the pose model)")
+    parser.add_argument("--min-side", type=int, default=640, help="Long side kept by the reduced decode")
+    args = parser.parse_args()
+
+    print("ROM Analysis API - Frame Input Benchmark")
+    print("=" * 50)
+
+    frames = load_encoded_frames(args.image)
+    benchmark_codec(frames, args.rounds, args.min_side)
+
+    if args.analyze:
+        asyncio.run(benchmark_analysis(frames, max(1, args.rounds // 5)))
+
+if __name__ == "__main__":
+    main()
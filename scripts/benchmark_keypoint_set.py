@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Benchmark KeypointSet against name -> array keypoint dicts
+
+Measures the per-frame cost of each pipeline stage that touches keypoints,
+for synthetic HALPE_26 poses: building them from detector output, computing
+all angles, validating and measuring a movement (lower back flexion, which
+added Neck and Hip to a copy of the dict twice), and writing the response
+keypoints as JSON and as a packed result.
+Checks that both give the same keypoints and angles.
+
+Usage:
+    python scripts/benchmark_keypoint_set.py [--frames 300] [--rounds 20]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+
+from benchmark_angle_engine import CONFIDENCE_THRESHOLD, synthetic_poses, time_per_frame
+from app.core.body_parts.registry import MovementRegistry
+from app.utils.serialization import ResultEncoder, dumps
+from physiotrack_core.angle_computation import calculate_all_angles
+from physiotrack_core.keypoint_set import KeypointSet, layout_for_model
+from physiotrack_core.pose_detection import keypoint_names_for, keypoints_to_dict
+
+def response_keypoints(keypoints):
+    """Response keypoints as built from a dict before KeypointSet"""
+    return {k: {"x": float(v[0]), "y": float(v[1])} for k, v in keypoints.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KeypointSet against keypoint dicts")
+    parser.add_argument("--frames", type=int, default=300, help="Synthetic frames (a 10 s clip at 30 fps)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print("ROM Analysis API - KeypointSet Benchmark")
+    print("=" * 50)
+
+    names = keypoint_names_for("body_with_feet")
+    layout = layout_for_model("body_with_feet")
+    keypoints, scores, _ = synthetic_poses(args.frames)
+    frames = list(zip(keypoints, scores))
+
+    def build_dicts():
+        return [keypoints_to_dict(names, kp, sc, CONFIDENCE_THRESHOLD) for kp, sc in frames]
+
+    def build_sets():
+        return [KeypointSet.from_arrays(layout, kp, sc, CONFIDENCE_THRESHOLD) for kp, sc in frames]
+
+    dicts, sets = build_dicts(), build_sets()
+
+    # Same points and angles from both
+    for d, s in zip(dicts, sets):
+        assert d.keys() == s.keys(), "keypoint sets differ"
+        assert calculate_all_angles(d).keys() == calculate_all_angles(s).keys(), "angle sets differ"
+
+    movement = MovementRegistry.get_movement("lower_back", "flexion")()
+
+    def measure(keypoints):
+        movement.validate_position(keypoints)
+        return movement.calculate_angles(keypoints)
+
+    encoder = ResultEncoder("packed", keypoint_names=names)
+    stages = [
+        ("build from detector output", build_dicts, build_sets),
+        ("calculate_all_angles",
+         lambda: [calculate_all_angles(d) for d in dicts],
+         lambda: [calculate_all_angles(s) for s in sets]),
+        ("lower back flexion", lambda: [measure(d) for d in dicts], lambda: [measure(s) for s in sets]),
+        ("response keypoints as JSON",
+         lambda: [dumps({"keypoints": response_keypoints(d)}) for d in dicts],
+         lambda: [dumps({"keypoints": s}) for s in sets]),
+        ("response keypoints packed",
+         lambda: [encoder.encode({"keypoints": response_keypoints(d)}) for d in dicts],
+         lambda: [encoder.encode({"keypoints": s}) for s in sets]),
+    ]
+
+    print(f"\n{'stage':<30} {'dict us':>9} {'set us':>9} {'speedup':>8}")
+    for name, with_dicts, with_sets in stages:
+        dict_us = time_per_frame(with_dicts, args.frames, args.rounds)
+        set_us = time_per_frame(with_sets, args.frames, args.rounds)
+        print(f"{name:<30} {dict_us:>9.1f} {set_us:>9.1f} {dict_us / set_us:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Benchmark inference profiles: latency and keypoint drift against fp32
+
+The default RTMLib session (fp32, ONNX Runtime defaults) is the baseline.
+Every profile is then applied to the same detector and run on the same frame
+set; drift is the distance between its keypoints and the baseline keypoints
+of the first person, over keypoints the baseline is confident about.
+
+Usage:
+    python scripts/benchmark_profiles.py [images ...] [--profiles cpu-latency,openvino-int8]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_IMAGES = [
+    os.path.join(PROJECT_ROOT, "test_frame.jpg"),
+    os.path.join(PROJECT_ROOT, "scripts", "me1.jpg"),
+]
+
+def run_frames(detector, frames, rounds: int):
+    """Detect every frame `rounds` times; return latencies (ms) and last results"""
+    for frame in frames:
+        detector.detect(frame)
+
+    latencies, results = [], []
+    for _ in range(rounds):
+        results = []
+        for frame in frames:
+            start = time.perf_counter()
+            results.append(detector.detect(frame))
+            latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies), results
+
+def keypoint_drift(baseline, results, confidence_threshold: float):
+    """Per-keypoint pixel distance to the baseline, as a fraction of person height too"""
+    distances, relative = [], []
+    for (base_kps, base_scores), (kps, _) in zip(baseline, results):
+        if len(base_kps) == 0 or len(kps) == 0:
+            continue
+        mask = base_scores[0] >= confidence_threshold
+        if not np.any(mask):
+            continue
+        dist = np.linalg.norm(kps[0][mask] - base_kps[0][mask], axis=1)
+        height = np.ptp(base_kps[0][mask][:, 1]) or 1.0
+        distances.extend(dist)
+        relative.extend(dist / height)
+    if not distances:
+        return None
+    return float(np.mean(distances)), float(np.max(distances)), float(np.mean(relative)) * 100
+
+def report(label, latencies, drift):
+    """Print one result row"""
+    drift_cols = (
+        f"{drift[0]:>10.2f} {drift[1]:>10.2f} {drift[2]:>9.2f}%" if drift is not None
+        else f"{'-':>10} {'-':>10} {'-':>10}"
+    )
+    print(
+        f"{label:<22} {np.percentile(latencies, 50):>8.1f} {np.percentile(latencies, 95):>8.1f} {drift_cols}"
+    )
+
+def main():
+    from physiotrack_core.inference_profiles import list_profiles, get_profile
+
+    parser = argparse.ArgumentParser(description="Benchmark inference profiles")
+    parser.add_argument("images", nargs="*", default=DEFAULT_IMAGES, help="Frame set")
+    parser.add_argument("--mode", default="performance", help="RTMLib mode")
+    parser.add_argument("--profiles", default=",".join(list_profiles()), help="Comma separated profiles")
+    parser.add_argument("--int8-dir", default=os.path.join(PROJECT_ROOT, "models", "int8"), help="INT8 model directory")
+    parser.add_argument("--rounds", type=int, default=10, help="Passes over the frame set")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Baseline keypoint confidence for drift")
+    args = parser.parse_args()
+
+    from physiotrack_core.pose_detection import PoseDetector
+
+    print("ROM Analysis API - Inference Profile Benchmark")
+    print("=" * 50)
+
+    frames = [cv2.imread(path) for path in args.images]
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        print("✗ No readable frames")
+        sys.exit(1)
+    print(f"Frames: {len(frames)}, rounds: {args.rounds}, mode: {args.mode}")
+
+    detector = PoseDetector(model="body_with_feet", mode=args.mode, device="cpu", backend="onnxruntime")
+
+    print(f"\n{'profile':<22} {'p50 ms':>8} {'p95 ms':>8} {'drift px':>10} {'max px':>10} {'% height':>10}")
+    baseline_latencies, baseline = run_frames(detector, frames, args.rounds)
+    report("fp32 baseline", baseline_latencies, (0.0, 0.0, 0.0))
+
+    for name in args.profiles.split(","):
+        try:
+            detector.apply_profile(get_profile(name), args.int8_dir)
+        except Exception as e:
+            print(f"{name:<22} skipped: {e}")
+            continue
+        latencies, results = run_frames(detector, frames, args.rounds)
+        report(name, latencies, keypoint_drift(baseline, results, args.threshold))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""
+Benchmark serialization of analysis responses
+
+Part 1 compares the previous paths (FastAPI's jsonable_encoder + JSONResponse
+for REST, websocket.send_json's json.dumps for streams) with the orjson-based
+app.utils.serialization.dumps, for a response with and without keypoints.
+Part 2 compares the WebSocket result encodings (json, msgpack, packed) by
+bytes per frame, server encode time and client decode time.
+Part 3 compares full and delta stream results (result_mode) over a simulated
+stream of frames.
+
+Usage:
+    python scripts/benchmark_serialization.py [--rounds 20000]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+from datetime import datetime
+import numpy as np
+
+def sample_response(include_keypoints: bool) -> dict:
+    """A response shaped like FrameAnalyzer._build_result output"""
+    from physiotrack_core.pose_detection import keypoint_names_for
+
+    rng = np.random.default_rng(0)
+    response = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "frame_id": "bench_0a1b2c3d",
+        "body_part": "lower_back",
+        "movement_type": "flexion",
+        "pose_detected": True,
+        "angles": {"trunk": 42.3, "pelvis": 12.1, "right hip": 95.4, "left hip": 94.8},
+        "rom": {"current": 42.3, "min": 3.2, "max": 61.7, "range": 58.5},
+        "pose_confidence": 0.912,
+        "validation": {
+            "in_normal_range": True,
+            "in_max_range": True,
+            "message": "Angle is within normal range",
+            "normal_range": [0, 60],
+            "max_range": [0, 90]
+        },
+        "frame_metrics": {"keypoints_detected": 26, "angles_calculated": 4, "processing_time_ms": 21.37},
+        "guidance": {
+            "instruction": "Bend forward slowly",
+            "feedback": "Good progress",
+            "improvement": "Try to reach a bit further"
+        },
+        "frame_number": 120,
+        "status": "success"
+    }
+    if include_keypoints:
+        response["keypoints"] = {
+            name: {"x": float(x), "y": float(y)}
+            for name, (x, y) in zip(keypoint_names_for("body_with_feet"), rng.random((26, 2)) * 640)
+        }
+        response["skeleton_connections"] = [["LShoulder", "RShoulder"], ["LHip", "RHip"]] * 8
+    return response
+
+def time_per_call(func, arg, rounds: int) -> float:
+    """Mean microseconds per call"""
+    func(arg)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(arg)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+def benchmark_encodings(rounds: int):
+    """Bytes per frame and encode/decode time of each WebSocket result encoding"""
+    from physiotrack_core.pose_detection import keypoint_names_for
+    from app.utils.serialization import ResultEncoder, decode_packed_result, msgpack
+
+    names = keypoint_names_for("body_with_feet")
+    decoders = {
+        "json": json.loads,
+        "msgpack": (lambda payload: msgpack.unpackb(payload, raw=False)) if msgpack is not None else None,
+        "packed": lambda payload: decode_packed_result(payload, names)
+    }
+
+    for include_keypoints in (False, True):
+        response = sample_response(include_keypoints)
+        response.update({"seq": 120, "client_ts": 123456.789})
+        baseline = None
+        print(f"\nResult encodings {'with' if include_keypoints else 'without'} keypoints")
+        print(f"{'encoding':<10} {'bytes':>7} {'vs json':>8} {'encode us':>10} {'decode us':>10}")
+        for encoding, decode in decoders.items():
+            if decode is None:
+                print(f"{encoding:<10} {'msgpack not installed':>38}")
+                continue
+            encoder = ResultEncoder(encoding, keypoint_names=names)
+            payload = encoder.encode(response)
+            baseline = baseline or len(payload)
+            print(
+                f"{encoding:<10} {len(payload):>7} {len(payload) / baseline:>7.0%} "
+                f"{time_per_call(encoder.encode, response, rounds):>10.1f} "
+                f"{time_per_call(decode, payload, rounds):>10.1f}"
+            )
+
+def simulated_stream(frames: int, include_keypoints: bool) -> list:
+    """Results of a stream: angles, ROM and timing change every frame, guidance now and then"""
+    rng = np.random.default_rng(1)
+    results = []
+    low, high = 0.0, 0.0
+    for i in range(frames):
+        response = sample_response(include_keypoints)
+        trunk = round(float(45 + 40 * np.sin(i / 15) + rng.normal(0, 0.5)), 1)
+        low, high = min(low, trunk), max(high, trunk)
+        response["angles"] = {name: round(value + trunk, 1) for name, value in response["angles"].items()}
+        response["rom"] = {"current": trunk, "min": low, "max": high, "range": round(high - low, 1)}
+        response["validation"]["in_normal_range"] = trunk <= 60
+        response["frame_metrics"]["processing_time_ms"] = round(float(rng.uniform(15, 30)), 2)
+        response["guidance"]["feedback"] = "Good progress" if trunk <= 60 else "Near your limit"
+        response.update({"frame_number": i, "seq": i, "client_ts": 1000.0 + i / 30})
+        results.append(response)
+    return results
+
+def benchmark_delta(frames: int):
+    """Bytes and server time per frame of full vs delta stream results"""
+    from app.utils.result_delta import ResultDelta
+    from app.utils.serialization import dumps
+
+    context = {
+        "body_part": "lower_back",
+        "movement_type": "flexion",
+        "validation": {"normal_range": [0, 60], "max_range": [0, 90]}
+    }
+    for include_keypoints in (False, True):
+        stream = simulated_stream(frames, include_keypoints)
+        print(f"\nStream results {'with' if include_keypoints else 'without'} keypoints ({frames} frames)")
+        print(f"{'result_mode':<12} {'bytes/frame':>12} {'vs full':>8} {'us/frame':>9}")
+
+        start = time.perf_counter()
+        full_bytes = sum(len(dumps(result)) for result in stream)
+        full_us = (time.perf_counter() - start) / frames * 1e6
+        print(f"{'full':<12} {full_bytes / frames:>12.0f} {1:>8.0%} {full_us:>9.1f}")
+
+        delta = ResultDelta(context)
+        start = time.perf_counter()
+        delta_bytes = sum(len(dumps(delta.encode(result))) for result in stream)
+        delta_us = (time.perf_counter() - start) / frames * 1e6
+        print(f"{'delta':<12} {delta_bytes / frames:>12.0f} {delta_bytes / full_bytes:>8.0%} {delta_us:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis response serialization")
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--frames", type=int, default=3000, help="Simulated stream length for part 3")
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from app.utils.serialization import AnalysisJSONResponse, dumps, orjson
+
+    print("ROM Analysis API - Serialization Benchmark")
+    print("=" * 50)
+    print(f"orjson: {orjson.__version__ if orjson is not None else 'not installed (stdlib json fallback)'}")
+
+    paths = [
+        ("REST jsonable_encoder + JSONResponse", lambda r: JSONResponse(jsonable_encoder(r)).body),
+        ("REST AnalysisJSONResponse", lambda r: AnalysisJSONResponse(r).body),
+        ("WS json.dumps (send_json)", lambda r: json.dumps(r, separators=(",", ":"))),
+        ("WS dumps, binary frame", dumps),
+        ("WS dumps + decode, text frame", lambda r: dumps(r).decode("utf-8")),
+    ]
+
+    for include_keypoints in (False, True):
+        response = sample_response(include_keypoints)
+        print(f"\nResponse {'with' if include_keypoints else 'without'} keypoints ({len(dumps(response))} bytes)")
+        print(f"{'path':<38} {'us/response':>12}")
+        for name, func in paths:
+            print(f"{name:<38} {time_per_call(func, response, args.rounds):>12.1f}")
+
+    benchmark_encodings(args.rounds)
+    benchmark_delta(args.frames)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmark the import time of app.main and enforce a startup budget
+
+Each run imports app.main in a fresh interpreter (so nothing is cached in
+sys.modules) and records wall time and RSS. Importing the app must not load
+the pose model or pull in heavy frameworks such as torch; the script exits
+non-zero if the median import time exceeds the budget or a forbidden module
+was imported.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 5] [--budget 2.0]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must never be imported just by importing the app
+FORBIDDEN_MODULES = ["torch", "torchvision", "tensorflow"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "import_s": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": [name for name in %r if name in sys.modules]
+}))
+"""
+
+def run_probe() -> dict:
+    """Import app.main in a fresh interpreter and return its measurements"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE % FORBIDDEN_MODULES],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print(f"✗ Importing app.main failed:\n{result.stderr}")
+        sys.exit(1)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.main import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--budget", type=float, default=2.0, help="Max median import time (seconds)")
+    args = parser.parse_args()
+
+    print("ROM Analysis API - Startup Benchmark")
+    print("=" * 50)
+
+    results = [run_probe() for _ in range(args.runs)]
+    import_times = np.array([r["import_s"] for r in results])
+    rss = np.array([r["max_rss_mb"] for r in results])
+    forbidden = sorted({name for r in results for name in r["modules"]})
+
+    median = float(np.median(import_times))
+    print(f"Runs: {args.runs}")
+    print(f"Import time: median {median:.3f}s, min {import_times.min():.3f}s, max {import_times.max():.3f}s")
+    print(f"Max RSS: {float(np.median(rss)):.0f} MB")
+
+    ok = True
+    if forbidden:
+        print(f"✗ Forbidden modules imported at startup: {', '.join(forbidden)}")
+        ok = False
+    if median > args.budget:
+        print(f"✗ Import time {median:.3f}s exceeds budget of {args.budget:.3f}s")
+        ok = False
+
+    if not ok:
+        sys.exit(1)
+    print(f"✓ Within startup budget of {args.budget:.3f}s")
+
+if __name__ == "__main__":
+    main()
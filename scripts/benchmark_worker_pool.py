@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Benchmark multi-process inference against the in-process detector
+
+Runs the same frame through N concurrent callers, first against a single
+in-process PoseDetector shared by N threads, then against an
+InferenceWorkerPool with N worker processes (frames handed over through
+shared memory). Reports throughput and per-frame latency.
+
+Usage:
+    python scripts/benchmark_worker_pool.py [image_path] [--processes 4]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+DEFAULT_IMAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_frame.jpg")
+
+def load_frame(image_path: str) -> np.ndarray:
+    """Load the benchmark frame"""
+    frame = cv2.imread(image_path)
+    if frame is None:
+        print(f"✗ Could not read image: {image_path}")
+        sys.exit(1)
+    return frame
+
+def run_callers(detect, frame: np.ndarray, callers: int, frames_per_caller: int):
+    """Drive detect() from concurrent threads and collect per-frame latencies"""
+    latencies = []
+
+    def caller():
+        for _ in range(frames_per_caller):
+            start = time.perf_counter()
+            detect(frame)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        for future in [pool.submit(caller) for _ in range(callers)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    return callers * frames_per_caller / elapsed, np.array(latencies) * 1000
+
+def report(label: str, throughput: float, latencies_ms: np.ndarray):
+    """Print one result row"""
+    print(
+        f"{label:<28} {throughput:>10.1f} "
+        f"{np.percentile(latencies_ms, 50):>8.1f} {np.percentile(latencies_ms, 95):>8.1f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the inference worker pool")
+    parser.add_argument("image", nargs="?", default=DEFAULT_IMAGE, help="Image used for every frame")
+    parser.add_argument("--mode", default="performance", help="RTMLib mode")
+    parser.add_argument("--processes", type=int, default=-1, help="Worker processes (-1 = autosize)")
+    parser.add_argument("--threads", type=int, default=2, help="ONNX Runtime threads per worker process")
+    parser.add_argument("--frames", type=int, default=20, help="Frames per concurrent caller")
+    args = parser.parse_args()
+
+    from app.core.pose.model_registry import ModelKey
+    from app.core.pose.worker_pool import InferenceWorkerPool, autosize_workers, available_cpus
+    from physiotrack_core.pose_detection import PoseDetector
+
+    processes = args.processes if args.processes > 0 else autosize_workers(args.threads)
+    detector_kwargs = dict(model="body_with_feet", mode=args.mode, device="cpu", backend="onnxruntime")
+
+    print("ROM Analysis API - Worker Pool Benchmark")
+    print("=" * 50)
+
+    frame = load_frame(args.image)
+    print(f"Frame shape: {frame.shape}, mode: {args.mode}")
+    print(f"CPUs: {available_cpus()}, worker processes: {processes} x {args.threads} threads")
+    print(f"\n{'path':<28} {'frames/s':>10} {'p50 ms':>8} {'p95 ms':>8}")
+
+    # In-process: one detector (default ONNX Runtime threading) shared by all callers
+    detector = PoseDetector(**detector_kwargs)
+    detector.detect(frame)
+    throughput, latencies = run_callers(detector.detect, frame, processes, args.frames)
+    report(f"in-process ({processes} threads)", throughput, latencies)
+
+    # Worker pool: one detector per process, frames through shared memory
+    pool = InferenceWorkerPool(
+        num_workers=processes,
+        default_key=ModelKey("body_with_feet", args.mode, "onnxruntime"),
+        intra_op_threads=args.threads,
+        max_frame_pixels=frame.shape[0] * frame.shape[1]
+    )
+    pool.start()
+    try:
+        pool.detect_batch([frame] * processes)
+        throughput, latencies = run_callers(pool.detect, frame, processes * 2, args.frames)
+        report(f"worker pool ({processes} procs)", throughput, latencies)
+    finally:
+        pool.shutdown()
+
+if __name__ == "__main__":
+    main()
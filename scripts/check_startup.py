@@ -25,10 +25,14 @@ def check_imports():
         return False
     
     try:
-        import torch
-        print(f"✓ PyTorch imported successfully (CUDA available: {torch.cuda.is_available()})")
+        from app.core.pose.device import onnxruntime_providers, openvino_available
+        providers = onnxruntime_providers()
+        if not providers and not openvino_available():
+            print("✗ Neither ONNX Runtime nor OpenVINO is installed")
+            return False
+        print(f"✓ Inference runtimes found (ONNX Runtime providers: {providers}, OpenVINO: {openvino_available()})")
     except ImportError as e:
-        print(f"✗ PyTorch import failed: {e}")
+        print(f"✗ Device detection failed: {e}")
         return False
     
     try:
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Create INT8 versions of the pose pipeline models for the openvino-int8 profile
+
+Runs static post-training quantization (ONNX Runtime, QDQ format) on the
+detector and pose models of the configured mode, calibrated on real frames.
+The QDQ models run as INT8 on OpenVINO and are written to INT8_MODEL_DIR
+under the same file names as the fp32 originals.
+
+Usage:
+    python scripts/quantize_models.py [images ...] [--mode performance] [--output models/int8]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import glob
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_IMAGES = [
+    os.path.join(PROJECT_ROOT, "test_frame.jpg"),
+    os.path.join(PROJECT_ROOT, "scripts", "me1.jpg"),
+]
+
+def load_frames(paths):
+    """Load calibration frames (directories are expanded), plus mirrored copies"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.jpg")) + glob.glob(os.path.join(path, "*.png"))))
+        else:
+            files.append(path)
+
+    frames = []
+    for file in files:
+        frame = cv2.imread(file)
+        if frame is None:
+            print(f"✗ Skipping unreadable image: {file}")
+            continue
+        frames.extend([frame, cv2.flip(frame, 1)])
+    return frames
+
+def to_model_input(img: np.ndarray) -> np.ndarray:
+    """Same layout BaseTool.inference feeds the session"""
+    return np.ascontiguousarray(img.transpose(2, 0, 1), dtype=np.float32)[None]
+
+def quantize(fp32_path: str, output_path: str, inputs):
+    """Static INT8 quantization of one model"""
+    import onnxruntime as ort
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    input_name = ort.InferenceSession(fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class Reader(CalibrationDataReader):
+        def __init__(self):
+            self._inputs = iter([{input_name: x} for x in inputs])
+
+        def get_next(self):
+            return next(self._inputs, None)
+
+    quantize_static(
+        fp32_path,
+        output_path,
+        Reader(),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8
+    )
+    print(f"✓ {os.path.basename(fp32_path)}: {os.path.getsize(fp32_path) / 1e6:.1f} MB -> "
+          f"{os.path.getsize(output_path) / 1e6:.1f} MB ({len(inputs)} calibration inputs)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize pose models to INT8")
+    parser.add_argument("images", nargs="*", default=DEFAULT_IMAGES, help="Calibration images or directories")
+    parser.add_argument("--mode", default="performance", help="RTMLib mode")
+    parser.add_argument("--output", default=os.path.join(PROJECT_ROOT, "models", "int8"), help="Output directory")
+    args = parser.parse_args()
+
+    from physiotrack_core.pose_detection import PoseDetector
+    from physiotrack_core.inference_profiles import int8_model_path
+
+    print("ROM Analysis API - INT8 Quantization")
+    print("=" * 50)
+
+    frames = load_frames(args.images)
+    if not frames:
+        print("✗ No calibration frames")
+        sys.exit(1)
+
+    detector = PoseDetector(model="body_with_feet", mode=args.mode, device="cpu", backend="onnxruntime")
+    det_model = detector.tracker.det_model
+    pose_model = detector.tracker.pose_model
+
+    det_inputs, pose_inputs = [], []
+    for frame in frames:
+        det_inputs.append(to_model_input(det_model.preprocess(frame)[0]))
+
+        bboxes = det_model(frame)
+        if len(bboxes) == 0:
+            bboxes = [[0, 0, frame.shape[1], frame.shape[0]]]
+        for bbox in bboxes:
+            pose_inputs.append(to_model_input(pose_model.preprocess(frame, bbox)[0]))
+
+    os.makedirs(args.output, exist_ok=True)
+    quantize(det_model.onnx_model, int8_model_path(det_model.onnx_model, args.output), det_inputs)
+    quantize(pose_model.onnx_model, int8_model_path(pose_model.onnx_model, args.output), pose_inputs)
+
+    print(f"\nSet INFERENCE_PROFILE=openvino-int8 and INT8_MODEL_DIR={args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import json
 import base64
 import cv2
 import numpy as np
+import struct
 import time
 from datetime import datetime
 
@@ -97,11 +98,12 @@ class ROMWebSocketTester:
             else:
                 print(f"  Message: {result.get('message', 'No message')}")
     
-    async def test_streaming_analysis(self, duration=5, fps=10):
-        """Test streaming WebSocket endpoint"""
-        print(f"\n=== Testing Streaming Analysis ({duration}s at {fps} FPS) ===")
+    async def test_streaming_analysis(self, duration=5, fps=10, binary=False):
+        """Test streaming WebSocket endpoint (binary=True sends header + JPEG binary frames)"""
+        mode = "binary" if binary else "base64"
+        print(f"\n=== Testing Streaming Analysis ({duration}s at {fps} FPS, {mode} frames) ===")
         
-        uri = f"{self.base_url}/ws/stream/{self.session_id}_stream"
+        uri = f"{self.base_url}/ws/stream/{self.session_id}_stream_{mode}"
         
         async with websockets.connect(uri) as websocket:
             print(f"Connected to {uri}")
@@ -110,7 +112,8 @@ class ROMWebSocketTester:
             config = {
                 "body_part": "lower_back",
                 "movement_type": "flexion",
-                "include_keypoints": False
+                "include_keypoints": False,
+                "frame_format": mode
             }
             
             print("Sending configuration...")
@@ -139,10 +142,14 @@ class ROMWebSocketTester:
                     
                     frame = self.create_test_frame(angle)
                     _, buffer = cv2.imencode('.jpg', frame)
-                    frame_base64 = base64.b64encode(buffer).decode('utf-8')
                     
                     # Send frame
-                    await websocket.send(frame_base64)
+                    if binary:
+                        # uint32 seq, float64 client timestamp (ms), uint16 flags, uint16 reserved
+                        header = struct.pack("<IdHH", frame_count, time.time() * 1000, 0, 0)
+                        await websocket.send(header + buffer.tobytes())
+                    else:
+                        await websocket.send(base64.b64encode(buffer).decode('utf-8'))
                     
                     # Receive analysis result
                     try:
@@ -261,6 +268,9 @@ async def main():
         # Test streaming with synthetic data
         await tester.test_streaming_analysis(duration=5, fps=10)
         
+        # Same stream with binary frames
+        await tester.test_streaming_analysis(duration=5, fps=10, binary=True)
+        
         # Optional: Test with webcam
         response = input("\nTest with webcam? (y/n): ")
         if response.lower() == 'y':